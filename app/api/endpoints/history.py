@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import List, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
 from app import schemas
@@ -11,6 +11,8 @@ from app.core.security import verify_token
 from app.db import get_db
 from app.db.models.downloadhistory import DownloadHistory
 from app.db.models.transferhistory import TransferHistory
+from app.db.transferhistory_oper import TransferHistoryOper
+from app.helper.response import ResponseCache
 from app.schemas import MediaType
 from app.schemas.types import EventType
 
@@ -40,7 +42,8 @@ def delete_download_history(history_in: schemas.DownloadHistory,
 
 
 @router.get("/transfer", summary=" Query transfer history", response_model=schemas.Response)
-def transfer_history(title: str = None,
+def transfer_history(request: Request,
+                     title: str = None,
                      page: int = 1,
                      count: int = 30,
                      db: Session = Depends(get_db),
@@ -48,18 +51,21 @@ def transfer_history(title: str = None,
     """
     Query transfer history
     """
-    if title:
-        total = TransferHistory.count_by_title(db, title)
-        result = TransferHistory.list_by_title(db, title, page, count)
-    else:
-        result = TransferHistory.list_by_page(db, page, count)
-        total = TransferHistory.count(db)
 
-    return schemas.Response(success=True,
-                            data={
-                                "list": result,
-                                "total": total,
-                            })
+    def build():
+        if title:
+            total = TransferHistory.count_by_title(db, title)
+            result = TransferHistory.list_by_title(db, title, page, count)
+        else:
+            result = TransferHistory.list_by_page(db, page, count)
+            total = TransferHistory.count(db)
+        return schemas.Response(success=True,
+                                data={
+                                    "list": result,
+                                    "total": total,
+                                })
+
+    return ResponseCache().respond(request, "transfer", build)
 
 
 @router.delete("/transfer", summary=" Delete transfer history", response_model=schemas.Response)
@@ -88,7 +94,7 @@ def delete_transfer_history(history_in: schemas.TransferHistory,
             }
         )
     #  Deletion of records
-    TransferHistory.delete(db, history_in.id)
+    TransferHistoryOper(db).delete(history_in.id)
     return schemas.Response(success=True)
 
 
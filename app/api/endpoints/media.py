@@ -1,6 +1,6 @@
 from typing import List, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app import schemas
@@ -12,6 +12,7 @@ from app.core.metainfo import MetaInfo
 from app.core.security import verify_token
 from app.db import get_db
 from app.db.mediaserver_oper import MediaServerOper
+from app.helper.response import ResponseCache
 from app.schemas import MediaType
 
 router = APIRouter()
@@ -46,6 +47,18 @@ def recognize(path: str,
     return schemas.Context()
 
 
+@router.post("/recognize/batch", summary=" Batch identify media messages", response_model=List[schemas.RecognizeResult])
+def recognize_batch(items: List[schemas.RecognizeItem],
+                    db: Session = Depends(get_db),
+                    _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    Batch identify media messages of titles or file paths， Results are in the order of the items
+    """
+    if len(items) > 1000:
+        raise HTTPException(status_code=400, detail=" Up to 1000 items at a time")
+    return MediaChain(db).recognize_batch([item.dict() for item in items])
+
+
 @router.get("/search", summary=" Search for media information", response_model=List[schemas.MediaInfo])
 def search_by_title(title: str,
                     page: int = 1,
@@ -84,27 +97,32 @@ def exists(title: str = None,
 
 
 @router.get("/{mediaid}", summary=" Enquire about media details", response_model=schemas.MediaInfo)
-def tmdb_info(mediaid: str, type_name: str,
+def tmdb_info(request: Request,
+              mediaid: str, type_name: str,
               db: Session = Depends(get_db),
               _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     According to the mediaID Consult (a document etc)themoviedb Or douban media information，type_name:  Cinematic/ Dramas
     """
-    mtype = MediaType(type_name)
-    if mediaid.startswith("tmdb:"):
-        result = TmdbChain(db).tmdb_info(int(mediaid[5:]), mtype)
-        return MediaInfo(tmdb_info=result).to_dict()
-    elif mediaid.startswith("douban:"):
-        #  Check douban information
-        doubaninfo = DoubanChain(db).douban_info(doubanid=mediaid[7:])
-        if not doubaninfo:
-            return schemas.MediaInfo()
-        result = DoubanChain(db).recognize_by_doubaninfo(doubaninfo)
-        if result:
-            # TMDB
-            return result.media_info.to_dict()
+
+    def build():
+        mtype = MediaType(type_name)
+        if mediaid.startswith("tmdb:"):
+            result = TmdbChain(db).tmdb_info(int(mediaid[5:]), mtype)
+            return MediaInfo(tmdb_info=result).to_dict()
+        elif mediaid.startswith("douban:"):
+            #  Check douban information
+            doubaninfo = DoubanChain(db).douban_info(doubanid=mediaid[7:])
+            if not doubaninfo:
+                return schemas.MediaInfo()
+            result = DoubanChain(db).recognize_by_doubaninfo(doubaninfo)
+            if result:
+                # TMDB
+                return result.media_info.to_dict()
+            else:
+                #  Douban, prc social networking website
+                return MediaInfo(douban_info=doubaninfo).to_dict()
         else:
-            #  Douban, prc social networking website
-            return MediaInfo(douban_info=doubaninfo).to_dict()
-    else:
-        return schemas.MediaInfo()
+            return schemas.MediaInfo()
+
+    return ResponseCache().respond(request, "media", build, schemas.MediaInfo)
@@ -1,22 +1,24 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from app import schemas
 from app.core.plugin import PluginManager
 from app.core.security import verify_token
 from app.db.systemconfig_oper import SystemConfigOper
+from app.helper.response import ResponseCache
 from app.schemas.types import SystemConfigKey
 
 router = APIRouter()
 
 
 @router.get("/", summary=" All plug-ins", response_model=List[schemas.Plugin])
-def all_plugins(_: schemas.TokenPayload = Depends(verify_token)) -> Any:
+def all_plugins(request: Request,
+                _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     Check the list of all plug-ins
     """
-    return PluginManager().get_plugin_apps()
+    return ResponseCache().respond(request, "plugin", PluginManager().get_plugin_apps, List[schemas.Plugin])
 
 
 @router.get("/installed", summary=" Installed plug-ins", response_model=List[str])
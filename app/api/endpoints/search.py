@@ -1,64 +1,203 @@
-from typing import List, Any
+import json
+import threading
+from typing import List, Any, Callable, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.chain.douban import DoubanChain
 from app.chain.search import SearchChain
+from app.core.context import Context, TorrentInfo
 from app.core.security import verify_token
-from app.db import get_db
+from app.db import get_db, SessionFactory
+from app.helper.pubsub import PubSub
+from app.helper.searchjob import SearchJobManager
+from app.helper.searchresult import SearchResultStore
 from app.schemas.types import MediaType
 
 router = APIRouter()
 
 
 @router.get("/last", summary=" Query search results", response_model=List[schemas.Context])
-async def search_latest(db: Session = Depends(get_db),
-                        _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+def search_latest(query: str = None,
+                  page: int = 1,
+                  count: int = 0,
+                  db: Session = Depends(get_db),
+                  token: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
-    Query search results
+    Query search results， The most recent search when no query is given，count Be0 Return all
     """
-    torrents = SearchChain(db).last_search_results()
-    return [torrent.to_dict() for torrent in torrents]
+    _, results = SearchChain(db).last_search_results(userid=token.sub, query=query, page=page, count=count)
+    return results
 
 
-@router.get("/media/{mediaid}", summary=" Precise search of resources", response_model=List[schemas.Context])
-def search_by_tmdbid(mediaid: str,
-                     mtype: str = None,
-                     area: str = "title",
-                     db: Session = Depends(get_db),
-                     _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+@router.get("/queries", summary=" Query saved searches", response_model=schemas.Response)
+def search_queries(token: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
-    According toTMDBID/ Douban, prc social networking websiteID Accurate search of site resources tmdb:/douban:/
+    Query the searches whose results are kept， Most recent first
+    """
+    return schemas.Response(success=True, data=SearchResultStore().list(token.sub))
+
+
+def search_media(db: Session, mediaid: str, mtype: str = None, area: str = "title",
+                 callback: Callable[[str, list], None] = None,
+                 cancel: threading.Event = None,
+                 userid: Union[int, str] = None) -> List[Context]:
+    """
+    According toTMDBID/ Douban, prc social networking websiteID Accurate search of site resources
     """
     if mediaid.startswith("tmdb:"):
         tmdbid = int(mediaid.replace("tmdb:", ""))
         if mtype:
             mtype = MediaType(mtype)
-        torrents = SearchChain(db).search_by_tmdbid(tmdbid=tmdbid, mtype=mtype, area=area)
+        return SearchChain(db).search_by_tmdbid(tmdbid=tmdbid, mtype=mtype, area=area,
+                                                callback=callback, cancel=cancel, userid=userid)
     elif mediaid.startswith("douban:"):
         doubanid = mediaid.replace("douban:", "")
         #  Recognizing doujinshi information
         context = DoubanChain(db).recognize_by_doubanid(doubanid)
         if not context or not context.media_info or not context.media_info.tmdb_id:
             return []
-        torrents = SearchChain(db).search_by_tmdbid(tmdbid=context.media_info.tmdb_id,
-                                                    mtype=context.media_info.type,
-                                                    area=area)
-    else:
-        return []
+        return SearchChain(db).search_by_tmdbid(tmdbid=context.media_info.tmdb_id,
+                                                mtype=context.media_info.type,
+                                                area=area,
+                                                callback=callback, cancel=cancel, userid=userid)
+    return []
+
+
+@router.get("/media/{mediaid}", summary=" Precise search of resources", response_model=List[schemas.Context])
+def search_by_tmdbid(mediaid: str,
+                     mtype: str = None,
+                     area: str = "title",
+                     db: Session = Depends(get_db),
+                     token: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    According toTMDBID/ Douban, prc social networking websiteID Accurate search of site resources tmdb:/douban:/
+    """
+    torrents = search_media(db, mediaid=mediaid, mtype=mtype, area=area, userid=token.sub)
     return [torrent.to_dict() for torrent in torrents]
 
 
 @router.get("/title", summary=" Fuzzy search resources", response_model=List[schemas.TorrentInfo])
-async def search_by_title(keyword: str = None,
-                          page: int = 0,
-                          site: int = None,
-                          db: Session = Depends(get_db),
-                          _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+def search_by_title(keyword: str = None,
+                    page: int = 0,
+                    site: int = None,
+                    db: Session = Depends(get_db),
+                    _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     Fuzzy search for site resources by name， Pagination support， Empty keywords are back to homepage resources
     """
     torrents = SearchChain(db).search_by_title(title=keyword, page=page, site=site)
     return [torrent.to_dict() for torrent in torrents]
+
+
+@router.post("/job/media/{mediaid}", summary=" Submit a precise search job", response_model=schemas.Response)
+def submit_media_job(mediaid: str,
+                     mtype: str = None,
+                     area: str = "title",
+                     token: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    Search site resources byTMDBID/ Douban, prc social networking websiteID In the background， Returns the jobID
+    """
+    if not mediaid.startswith("tmdb:") and not mediaid.startswith("douban:"):
+        return schemas.Response(success=False, message=" Unsupported mediaID")
+
+    def search(callback: Callable[[str, list], None], cancel: threading.Event) -> List[Context]:
+        db = SessionFactory()
+        try:
+            return search_media(db, mediaid=mediaid, mtype=mtype, area=area,
+                                callback=callback, cancel=cancel, userid=token.sub)
+        finally:
+            db.close()
+
+    job = SearchJobManager().submit(kind="media",
+                                    params={"mediaid": mediaid, "mtype": mtype, "area": area},
+                                    search=search)
+    return schemas.Response(success=True, data=job.to_dict())
+
+
+@router.post("/job/title", summary=" Submit a fuzzy search job", response_model=schemas.Response)
+def submit_title_job(keyword: str = None,
+                     page: int = 0,
+                     site: int = None,
+                     _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    Search site resources by name in the background， Returns the jobID
+    """
+
+    def search(callback: Callable[[str, list], None], cancel: threading.Event) -> List[TorrentInfo]:
+        return SearchChain().search_by_title(title=keyword, page=page, site=site,
+                                             callback=callback, cancel=cancel)
+
+    job = SearchJobManager().submit(kind="title",
+                                    params={"keyword": keyword, "page": page, "site": site},
+                                    search=search)
+    return schemas.Response(success=True, data=job.to_dict())
+
+
+@router.get("/job/{job_id}", summary=" Query a search job", response_model=schemas.Response)
+def get_job(job_id: str,
+            _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    Query the state of a search job， Final results are included when it has finished
+    """
+    job = SearchJobManager().get(job_id)
+    if not job:
+        return schemas.Response(success=False, message=" Search job does not exist")
+    return schemas.Response(success=True, data=job.to_dict(results=job.done))
+
+
+@router.delete("/job/{job_id}", summary=" Cancel a search job", response_model=schemas.Response)
+def cancel_job(job_id: str,
+               _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    Cancel a running search job
+    """
+    if not SearchJobManager().cancel(job_id):
+        return schemas.Response(success=False, message=" Search job does not exist or has finished")
+    return schemas.Response(success=True)
+
+
+@router.get("/job/{job_id}/stream", summary=" Search job results in real time")
+async def stream_job(job_id: str, token: str):
+    """
+    Push the results of each site as it finishes， The return format isSSE， The stream ends with the job
+    """
+    if not token or not verify_token(token):
+        raise HTTPException(
+            status_code=403,
+            detail=" Authentication failure！",
+        )
+    manager = SearchJobManager()
+    job = manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=" Search job does not exist",
+        )
+    pubsub = PubSub()
+
+    async def event_generator():
+        subscription = pubsub.subscribe(job.channel, maxsize=1000)
+        try:
+            #  Events published before subscribing
+            seq, finished = -1, False
+            for event in manager.snapshot(job):
+                seq, finished = event["seq"], event["type"] != "site"
+                yield 'data: %s\n\n' % json.dumps(event)
+            while not finished:
+                events = await subscription.get(timeout=30)
+                if not events:
+                    yield ': ping\n\n'
+                    continue
+                for event in events:
+                    if event["seq"] <= seq:
+                        continue
+                    seq, finished = event["seq"], event["type"] != "site"
+                    yield 'data: %s\n\n' % json.dumps(event)
+        finally:
+            pubsub.unsubscribe(subscription)
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
@@ -1,6 +1,6 @@
 from typing import List, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from starlette.background import BackgroundTasks
 
@@ -13,6 +13,7 @@ from app.db import get_db
 from app.db.models.site import Site
 from app.db.models.siteicon import SiteIcon
 from app.db.systemconfig_oper import SystemConfigOper
+from app.helper.response import ResponseCache
 from app.helper.sites import SitesHelper
 from app.scheduler import Scheduler
 from app.schemas.types import SystemConfigKey, EventType
@@ -22,12 +23,13 @@ router = APIRouter()
 
 
 @router.get("/", summary=" All sites", response_model=List[schemas.Site])
-def read_sites(db: Session = Depends(get_db),
-               _: schemas.TokenPayload = Depends(verify_token)) -> List[dict]:
+def read_sites(request: Request,
+               db: Session = Depends(get_db),
+               _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     Get site list
     """
-    return Site.list_order_by_pri(db)
+    return ResponseCache().respond(request, "site", lambda: Site.list_order_by_pri(db), List[schemas.Site])
 
 
 @router.post("/", summary=" New sites", response_model=schemas.Response)
@@ -12,6 +12,7 @@ from app.db import get_db
 from app.db.models.subscribe import Subscribe
 from app.db.models.user import User
 from app.db.userauth import get_current_active_user
+from app.helper.response import ResponseCache
 from app.scheduler import Scheduler
 from app.schemas.types import MediaType
 
@@ -29,16 +30,21 @@ def start_subscribe_add(db: Session, title: str, year: str,
 
 @router.get("/", summary=" All subscriptions", response_model=List[schemas.Subscribe])
 def read_subscribes(
+        request: Request,
         db: Session = Depends(get_db),
         _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     Check all subscriptions
     """
-    subscribes = Subscribe.list(db)
-    for subscribe in subscribes:
-        if subscribe.sites:
-            subscribe.sites = json.loads(subscribe.sites)
-    return subscribes
+
+    def build():
+        subscribes = Subscribe.list(db)
+        for subscribe in subscribes:
+            if subscribe.sites:
+                subscribe.sites = json.loads(subscribe.sites)
+        return subscribes
+
+    return ResponseCache().respond(request, "subscribe", build, List[schemas.Subscribe])
 
 
 @router.post("/", summary=" Add subscription", response_model=schemas.Response)
@@ -1,21 +1,26 @@
+import asyncio
 import json
-import time
 from datetime import datetime
 from typing import Union
 
-import tailer
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.chain.search import SearchChain
 from app.core.config import settings
+from app.core.module import ModuleManager
 from app.core.security import verify_token
 from app.db import get_db
 from app.db.systemconfig_oper import SystemConfigOper
+from app.helper.log import LogHelper
 from app.helper.message import MessageHelper
 from app.helper.progress import ProgressHelper
+from app.helper.pubsub import PubSub
+from app.helper.refresh import RefreshQueue
+from app.log import PubSubHandler
 from app.scheduler import Scheduler
 from app.schemas.types import SystemConfigKey
 from app.utils.http import RequestUtils
@@ -24,6 +29,10 @@ from version import APP_VERSION
 
 router = APIRouter()
 
+# SSE Heartbeat interval when nothing changes， Unit seconds
+_heartbeat_interval = 30
+_heartbeat = ': ping\n\n'
+
 
 @router.get("/env", summary=" Querying system environment variables", response_model=schemas.Response)
 def get_env_setting(_: schemas.TokenPayload = Depends(verify_token)):
@@ -41,9 +50,9 @@ def get_env_setting(_: schemas.TokenPayload = Depends(verify_token)):
 
 
 @router.get("/progress/{process_type}", summary=" Real time progress")
-def get_progress(process_type: str, token: str):
+async def get_progress(process_type: str, token: str):
     """
-    Real-time access to processing progress， The return format isSSE
+    Real-time access to processing progress， The return format isSSE， Pushed only when the progress changes
     """
     if not token or not verify_token(token):
         raise HTTPException(
@@ -52,12 +61,22 @@ def get_progress(process_type: str, token: str):
         )
 
     progress = ProgressHelper()
-
-    def event_generator():
-        while True:
-            detail = progress.get(process_type)
-            yield 'data: %s\n\n' % json.dumps(detail)
-            time.sleep(0.2)
+    pubsub = PubSub()
+
+    async def event_generator():
+        subscription = pubsub.subscribe(progress.channel(process_type), coalesce=True)
+        try:
+            yield 'data: %s\n\n' % json.dumps(progress.get(process_type))
+            while True:
+                details = await subscription.get(timeout=_heartbeat_interval)
+                if not details:
+                    yield _heartbeat
+                    continue
+                yield 'data: %s\n\n' % json.dumps(details[-1])
+                #  Merge rapid updates
+                await asyncio.sleep(0.2)
+        finally:
+            pubsub.unsubscribe(subscription)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -84,7 +103,7 @@ def set_setting(key: str, value: Union[list, dict, str, int] = None,
 
 
 @router.get("/message", summary=" Real-time news")
-def get_message(token: str):
+async def get_message(token: str):
     """
     Get system messages in real time， The return format isSSE
     """
@@ -95,18 +114,31 @@ def get_message(token: str):
         )
 
     message = MessageHelper()
+    pubsub = PubSub()
 
-    def event_generator():
-        while True:
+    async def event_generator():
+        subscription = pubsub.subscribe(message.channel)
+        try:
+            #  Messages put while no one was subscribed
             detail = message.get()
-            yield 'data: %s\n\n' % (detail or '')
-            time.sleep(3)
+            while detail:
+                yield 'data: %s\n\n' % detail
+                detail = message.get()
+            while True:
+                details = await subscription.get(timeout=_heartbeat_interval)
+                if not details:
+                    yield _heartbeat
+                    continue
+                for detail in details:
+                    yield 'data: %s\n\n' % (detail or '')
+        finally:
+            pubsub.unsubscribe(subscription)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
 @router.get("/logging", summary=" Real-time logs")
-def get_logging(token: str):
+async def get_logging(token: str):
     """
     Real-time access to system logs， The return format isSSE
     """
@@ -116,20 +148,43 @@ def get_logging(token: str):
             detail=" Authentication failure！",
         )
 
-    def log_generator():
-        log_path = settings.LOG_PATH / 'moviepilot.log'
-        #  Read the end of the file50 Classifier for objects in rows such as words， Non-usetailer Module (in software)
-        with open(log_path, 'r', encoding='utf-8') as f:
-            for line in f.readlines()[-50:]:
+    pubsub = PubSub()
+
+    async def log_generator():
+        subscription = pubsub.subscribe(PubSubHandler.channel, maxsize=1000)
+        try:
+            #  End of the file50 Classifier for objects in rows such as words
+            for line in await run_in_threadpool(LogHelper().tail, 50):
                 yield 'data: %s\n\n' % line
-        while True:
-            for text in tailer.follow(open(log_path, 'r', encoding='utf-8')):
-                yield 'data: %s\n\n' % (text or '')
-            time.sleep(1)
+            while True:
+                texts = await subscription.get(timeout=_heartbeat_interval)
+                if not texts:
+                    yield _heartbeat
+                    continue
+                for text in texts:
+                    yield 'data: %s\n\n' % (text or '')
+        finally:
+            pubsub.unsubscribe(subscription)
 
     return StreamingResponse(log_generator(), media_type="text/event-stream")
 
 
+@router.get("/logs", summary=" Query logs", response_model=schemas.Response)
+def query_logs(level: str = None,
+               module: str = None,
+               start: datetime = None,
+               end: datetime = None,
+               keyword: str = None,
+               limit: int = 200,
+               _: schemas.TokenPayload = Depends(verify_token)):
+    """
+    Query the current and rotated log files by minimum level、 Module、 Time range and keyword， Return the latest matches
+    """
+    return schemas.Response(success=True, data=LogHelper().query(level=level, module=module,
+                                                                 start=start, end=end,
+                                                                 keyword=keyword, limit=limit))
+
+
 @router.get("/nettest", summary=" Test network connectivity")
 def nettest(url: str,
             proxy: bool,
@@ -202,6 +257,22 @@ def ruletest(title: str,
     })
 
 
+@router.get("/modulestats", summary=" Module method call statistics", response_model=schemas.Response)
+def module_stats(_: schemas.TokenPayload = Depends(verify_token)):
+    """
+    Query the number of calls and time of each module method
+    """
+    return schemas.Response(success=True, data=ModuleManager().get_method_stats())
+
+
+@router.get("/refreshstats", summary=" Media library refresh statistics", response_model=schemas.Response)
+def refresh_stats(_: schemas.TokenPayload = Depends(verify_token)):
+    """
+    Query the number of media library refresh requests、 Actual refreshes and merged requests of each media server
+    """
+    return schemas.Response(success=True, data=RefreshQueue.get_all_stats())
+
+
 @router.get("/restart", summary=" Reboot", response_model=schemas.Response)
 def restart_system(_: schemas.TokenPayload = Depends(verify_token)):
     """
@@ -4,13 +4,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.chain.media import MediaChain
+from app.chain.servarr import ServarrChain
 from app.chain.subscribe import SubscribeChain
 from app.core.config import settings
-from app.core.metainfo import MetaInfo
 from app.db import get_db
 from app.db.models.subscribe import Subscribe
-from app.schemas import RadarrMovie, SonarrSeries
+from app.schemas import RadarrMovie
 from app.schemas.types import MediaType
 from version import APP_VERSION
 
@@ -267,25 +266,7 @@ def arr_movies(apikey: str, db: Session = Depends(get_db)) -> Any:
             status_code=403,
             detail=" Authentication failure！",
         )
-    #  Check all movie subscriptions
-    result = []
-    subscribes = Subscribe.list(db)
-    for subscribe in subscribes:
-        if subscribe.type != MediaType.MOVIE.value:
-            continue
-        result.append(RadarrMovie(
-            id=subscribe.id,
-            title=subscribe.name,
-            year=subscribe.year,
-            isAvailable=True,
-            monitored=True,
-            tmdbId=subscribe.tmdbid,
-            imdbId=subscribe.imdbid,
-            profileId=1,
-            qualityProfileId=1,
-            hasFile=False
-        ))
-    return result
+    return ServarrChain(db).radarr_movies()
 
 
 @arr_router.get("/movie/lookup", summary=" Search for movies", response_model=List[schemas.RadarrMovie])
@@ -299,44 +280,7 @@ def arr_movie_lookup(apikey: str, term: str, db: Session = Depends(get_db)) -> A
             status_code=403,
             detail=" Authentication failure！",
         )
-    tmdbid = term.replace("tmdb:", "")
-    #  Search for media information
-    mediainfo = MediaChain(db).recognize_media(mtype=MediaType.MOVIE, tmdbid=int(tmdbid))
-    if not mediainfo:
-        return [RadarrMovie()]
-    #  Check if it already exists
-    exists = MediaChain(db).media_exists(mediainfo=mediainfo)
-    if not exists:
-        #  File does not exist
-        hasfile = False
-    else:
-        #  Documentation exists
-        hasfile = True
-    #  Check if you are subscribed
-    subscribes = Subscribe.get_by_tmdbid(db, int(tmdbid))
-    if subscribes:
-        #  Subscribe toID
-        subid = subscribes[0].id
-        #  Subscribed
-        monitored = True
-    else:
-        subid = None
-        monitored = False
-
-    return [RadarrMovie(
-        id=subid,
-        title=mediainfo.title,
-        year=mediainfo.year,
-        isAvailable=True,
-        monitored=monitored,
-        tmdbId=mediainfo.tmdb_id,
-        imdbId=mediainfo.imdb_id,
-        titleSlug=mediainfo.original_title,
-        folderName=mediainfo.title_year,
-        profileId=1,
-        qualityProfileId=1,
-        hasFile=hasfile
-    )]
+    return ServarrChain(db).radarr_lookup(int(term.replace("tmdb:", "")))
 
 
 @arr_router.get("/movie/{mid}", summary=" Movie subscription details", response_model=schemas.RadarrMovie)
@@ -349,20 +293,9 @@ def arr_movie(apikey: str, mid: int, db: Session = Depends(get_db)) -> Any:
             status_code=403,
             detail=" Authentication failure！",
         )
-    subscribe = Subscribe.get(db, mid)
-    if subscribe:
-        return RadarrMovie(
-            id=subscribe.id,
-            title=subscribe.name,
-            year=subscribe.year,
-            isAvailable=True,
-            monitored=True,
-            tmdbId=subscribe.tmdbid,
-            imdbId=subscribe.imdbid,
-            profileId=1,
-            qualityProfileId=1,
-            hasFile=False
-        )
+    movie = ServarrChain(db).radarr_movie(mid)
+    if movie:
+        return movie
     else:
         raise HTTPException(
             status_code=404,
@@ -539,33 +472,7 @@ def arr_series(apikey: str, db: Session = Depends(get_db)) -> Any:
             status_code=403,
             detail=" Authentication failure！",
         )
-    #  Check all tv series subscriptions
-    result = []
-    subscribes = Subscribe.list(db)
-    for subscribe in subscribes:
-        if subscribe.type != MediaType.TV.value:
-            continue
-        result.append(SonarrSeries(
-            id=subscribe.id,
-            title=subscribe.name,
-            seasonCount=1,
-            seasons=[{
-                "seasonNumber": subscribe.season,
-                "monitored": True,
-            }],
-            remotePoster=subscribe.poster,
-            year=subscribe.year,
-            tmdbId=subscribe.tmdbid,
-            tvdbId=subscribe.tvdbid,
-            imdbId=subscribe.imdbid,
-            profileId=1,
-            languageProfileId=1,
-            qualityProfileId=1,
-            isAvailable=True,
-            monitored=True,
-            hasFile=False
-        ))
-    return result
+    return ServarrChain(db).sonarr_series()
 
 
 @arr_router.get("/series/lookup", summary=" Search for episodes")
@@ -579,88 +486,7 @@ def arr_series_lookup(apikey: str, term: str, db: Session = Depends(get_db)) ->
             detail=" Authentication failure！",
         )
 
-    #  GainTVDBID
-    if not term.startswith("tvdb:"):
-        mediainfo = MediaChain(db).recognize_media(meta=MetaInfo(term),
-                                                   mtype=MediaType.TV)
-        if not mediainfo:
-            return [SonarrSeries()]
-        tvdbid = mediainfo.tvdb_id
-        if not tvdbid:
-            return [SonarrSeries()]
-    else:
-        mediainfo = None
-        tvdbid = int(term.replace("tvdb:", ""))
-
-    #  Consult (a document etc)TVDB Text
-    tvdbinfo = MediaChain(db).tvdb_info(tvdbid=tvdbid)
-    if not tvdbinfo:
-        return [SonarrSeries()]
-
-    #  Quarterly information
-    seas: List[int] = []
-    sea_num = tvdbinfo.get('season')
-    if sea_num:
-        seas = list(range(1, int(sea_num) + 1))
-
-    #  According toTVDB Search for media information
-    if not mediainfo:
-        mediainfo = MediaChain(db).recognize_media(meta=MetaInfo(tvdbinfo.get('seriesName')),
-                                                   mtype=MediaType.TV)
-
-    #  Query the existence of
-    exists = MediaChain(db).media_exists(mediainfo)
-    if exists:
-        hasfile = True
-    else:
-        hasfile = False
-
-    #  Check subscription information
-    seasons: List[dict] = []
-    subscribes = Subscribe.get_by_tmdbid(db, mediainfo.tmdb_id)
-    if subscribes:
-        #  Monitored
-        monitored = True
-        #  Monitored季
-        sub_seas = [sub.season for sub in subscribes]
-        for sea in seas:
-            if sea in sub_seas:
-                seasons.append({
-                    "seasonNumber": sea,
-                    "monitored": True,
-                })
-            else:
-                seasons.append({
-                    "seasonNumber": sea,
-                    "monitored": False,
-                })
-        subid = subscribes[-1].id
-    else:
-        subid = None
-        monitored = False
-        for sea in seas:
-            seasons.append({
-                "seasonNumber": sea,
-                "monitored": False,
-            })
-
-    return [SonarrSeries(
-        id=subid,
-        title=mediainfo.title,
-        seasonCount=len(seasons),
-        seasons=seasons,
-        remotePoster=mediainfo.get_poster_image(),
-        year=mediainfo.year,
-        tmdbId=mediainfo.tmdb_id,
-        tvdbId=mediainfo.tvdb_id,
-        imdbId=mediainfo.imdb_id,
-        profileId=1,
-        languageProfileId=1,
-        qualityProfileId=1,
-        isAvailable=True,
-        monitored=monitored,
-        hasFile=hasfile
-    )]
+    return ServarrChain(db).sonarr_lookup(term)
 
 
 @arr_router.get("/series/{tid}", summary=" Episode details")
@@ -673,28 +499,9 @@ def arr_serie(apikey: str, tid: int, db: Session = Depends(get_db)) -> Any:
             status_code=403,
             detail=" Authentication failure！",
         )
-    subscribe = Subscribe.get(db, tid)
-    if subscribe:
-        return SonarrSeries(
-            id=subscribe.id,
-            title=subscribe.name,
-            seasonCount=1,
-            seasons=[{
-                "seasonNumber": subscribe.season,
-                "monitored": True,
-            }],
-            year=subscribe.year,
-            remotePoster=subscribe.poster,
-            tmdbId=subscribe.tmdbid,
-            tvdbId=subscribe.tvdbid,
-            imdbId=subscribe.imdbid,
-            profileId=1,
-            languageProfileId=1,
-            qualityProfileId=1,
-            isAvailable=True,
-            monitored=True,
-            hasFile=False
-        )
+    series = ServarrChain(db).sonarr_serie(tid)
+    if series:
+        return series
     else:
         raise HTTPException(
             status_code=404,
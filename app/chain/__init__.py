@@ -1,5 +1,6 @@
 import gc
 import pickle
+import time
 import traceback
 from abc import ABCMeta
 from pathlib import Path
@@ -20,7 +21,6 @@ from app.log import logger
 from app.schemas import TransferInfo, TransferTorrent, ExistMediaInfo, DownloadingTorrent, CommingMessage, Notification, \
     WebhookEventInfo, TmdbEpisode
 from app.schemas.types import TorrentStatus, MediaType, MediaImageType, EventType
-from app.utils.object import ObjectUtils
 
 
 class ChainBase(metaclass=ABCMeta):
@@ -79,16 +79,21 @@ class ChainBase(metaclass=ABCMeta):
             else:
                 return result is None
 
+        def is_signature_match(types, ret):
+            """
+            Determine if the result is consistent with the pre-resolved parameter types of the method
+            """
+            return types is not None and len(types) == 1 and isinstance(ret, types[0])
+
         logger.debug(f" Request module execution：{method} ...")
         result = None
-        modules = self.modulemanager.get_modules(method)
-        for module in modules:
+        start_time = time.time()
+        for module, func, types in self.modulemanager.get_handlers(method):
             try:
-                func = getattr(module, method)
                 if is_result_empty(result):
                     #  Come (or go) backNone， First implementation or need to continue to the next module
                     result = func(*args, **kwargs)
-                elif ObjectUtils.check_signature(func, result):
+                elif is_signature_match(types, result):
                     #  The return result is consistent with the method signature， Pass the results into the（ Cannot run multiple modules at the same time need to be controlled by a switch）
                     result = func(result)
                 elif isinstance(result, list):
@@ -101,6 +106,7 @@ class ChainBase(metaclass=ABCMeta):
                     break
             except Exception as err:
                 logger.error(f" Runtime module {method}  Make a mistake：{module.__class__.__name__} - {err}\n{traceback.print_exc()}")
+        self.modulemanager.record_call(method, time.time() - start_time)
         return result
 
     def recognize_media(self, meta: MetaBase = None,
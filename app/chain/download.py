@@ -624,6 +624,28 @@ class DownloadChain(ChainBase):
         #  Return to downloaded resources， That's all that's left.
         return downloaded_list, no_exists
 
+    def __get_exists_info(self, mediainfo: MediaInfo, season: int = None) -> Optional[ExistMediaInfo]:
+        """
+        Query the existing episodes of a media， Prioritize the local media library index， Query the media server only on a miss
+        :param mediainfo:  Identified media information
+        :param season:  Classifier for seasonal crop yield or seasons of a tv series
+        """
+        ids = {
+            "tmdbid": mediainfo.tmdb_id,
+            "imdbid": mediainfo.imdb_id,
+            "tvdbid": mediainfo.tvdb_id
+        }
+        exists_info = self.mediaserver.get_exists_info(mtype=mediainfo.type.value, **ids)
+        if exists_info:
+            return exists_info
+        itemid = self.mediaserver.get_item_id(mtype=mediainfo.type.value,
+                                              tmdbid=mediainfo.tmdb_id,
+                                              season=season)
+        exists_info = self.media_exists(mediainfo=mediainfo, itemid=itemid)
+        if exists_info:
+            self.mediaserver.cache_exists_info(mtype=mediainfo.type.value, info=exists_info, **ids)
+        return exists_info
+
     def get_no_exists_info(self, meta: MetaBase,
                            mediainfo: MediaInfo,
                            no_exists: Dict[int, Dict[int, NotExistMediaInfo]] = None,
@@ -673,9 +695,7 @@ class DownloadChain(ChainBase):
 
         if mediainfo.type == MediaType.MOVIE:
             #  Cinematic
-            itemid = self.mediaserver.get_item_id(mtype=mediainfo.type.value,
-                                                  tmdbid=mediainfo.tmdb_id)
-            exists_movies: Optional[ExistMediaInfo] = self.media_exists(mediainfo=mediainfo, itemid=itemid)
+            exists_movies: Optional[ExistMediaInfo] = self.__get_exists_info(mediainfo=mediainfo)
             if exists_movies:
                 logger.info(f" Movies already in the media library：{mediainfo.title_year}")
                 return True, {}
@@ -692,11 +712,9 @@ class DownloadChain(ChainBase):
                     logger.error(f" Season set information is not available in the media information：{mediainfo.title_year}")
                     return False, {}
             #  Dramas
-            itemid = self.mediaserver.get_item_id(mtype=mediainfo.type.value,
-                                                  tmdbid=mediainfo.tmdb_id,
-                                                  season=mediainfo.season)
             #  Episodes already in the media library
-            exists_tvs: Optional[ExistMediaInfo] = self.media_exists(mediainfo=mediainfo, itemid=itemid)
+            exists_tvs: Optional[ExistMediaInfo] = self.__get_exists_info(mediainfo=mediainfo,
+                                                                          season=mediainfo.season)
             if not exists_tvs:
                 #  All seasons are missing
                 for season, episodes in mediainfo.seasons.items():
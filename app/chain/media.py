@@ -1,7 +1,13 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Tuple
 
+from cachetools import TTLCache
+
 from app.chain import ChainBase
+from app.core.config import settings
 from app.core.context import Context, MediaInfo
 from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfo, MetaInfoPath
@@ -13,6 +19,11 @@ class MediaChain(ChainBase):
     """
     Media information processing chain
     """
+    #  Recognition results of batch recognition， By the identified metadata
+    _recognize_cache = TTLCache(maxsize=1024 if settings.BIG_MEMORY_MODE else 256, ttl=600)
+    _recognize_lock = threading.Lock()
+    #  Number of recognitions running at the same time in batch recognition
+    _batch_workers = 8
 
     def recognize_by_title(self, title: str, subtitle: str = None) -> Optional[Context]:
         """
@@ -82,3 +93,88 @@ class MediaChain(ChainBase):
         logger.info(f"{content}  Search to {len(medias)}  Relevant media information")
         #  Recognize的元数据，媒体信息列表
         return meta, medias
+
+    @staticmethod
+    def __recognize_key(meta: MetaBase) -> str:
+        """
+        Key of the metadata in the recognition cache， Titles identified as the same metadata share a result
+        """
+        return f"{meta.type.value if meta.type else ''}|{meta.name}|{meta.year}|{meta.begin_season}"
+
+    def __recognize_cached(self, meta: MetaBase) -> Tuple[Optional[MediaInfo], bool, float]:
+        """
+        Identify media messages through the recognition cache
+        :return:  Media information， From the cache， Time spent in milliseconds
+        """
+        key = self.__recognize_key(meta)
+        with self._recognize_lock:
+            if key in self._recognize_cache:
+                return self._recognize_cache[key], True, 0
+        start_time = time.perf_counter()
+        mediainfo = self.recognize_media(meta=meta)
+        if mediainfo:
+            self.obtain_images(mediainfo=mediainfo)
+        with self._recognize_lock:
+            self._recognize_cache[key] = mediainfo
+        return mediainfo, False, (time.perf_counter() - start_time) * 1000
+
+    def recognize_batch(self, items: List[dict]) -> List[dict]:
+        """
+        Batch identify media messages of titles or file paths，
+        Duplicate items and items identified as the same metadata are recognized once， Different ones at the same time
+        :param items:  [{"title", "subtitle"} or {"path"}]
+        :return:  [{"context", "cached", "deduplicated", "time"}]， In the order of the items
+        """
+        #  Identifying metadata of distinct items
+        metas = {}
+        for item in items:
+            key = (item.get("path"), item.get("title"), item.get("subtitle"))
+            if key in metas:
+                continue
+            start_time = time.perf_counter()
+            if item.get("path"):
+                meta = MetaInfoPath(Path(item.get("path")))
+            else:
+                meta = MetaInfo(item.get("title") or "", item.get("subtitle"))
+            metas[key] = (meta, (time.perf_counter() - start_time) * 1000)
+        #  Identify media messages of distinct metadata
+        recognize_metas = {}
+        for meta, _ in metas.values():
+            if meta.name:
+                recognize_metas.setdefault(self.__recognize_key(meta), meta)
+        logger.info(f" Start batch recognition， {len(items)}  Items， {len(recognize_metas)}  Distinct media ...")
+        recognized = {}
+        if recognize_metas:
+            with ThreadPoolExecutor(max_workers=min(self._batch_workers, len(recognize_metas))) as executor:
+                futures = {key: executor.submit(self.__recognize_cached, meta)
+                           for key, meta in recognize_metas.items()}
+                for key, future in futures.items():
+                    try:
+                        recognized[key] = future.result()
+                    except Exception as err:
+                        logger.error(f" Batch recognition {recognize_metas[key].name}  Make a mistake：{err}")
+                        recognized[key] = (None, False, 0)
+        #  Only the first item of a metadata or a media carries its cost， The others are marked as deduplicated
+        results = []
+        counted_items, counted_metas = set(), set()
+        for item in items:
+            item_key = (item.get("path"), item.get("title"), item.get("subtitle"))
+            meta, cost = metas[item_key]
+            deduplicated = item_key in counted_items
+            if deduplicated:
+                cost = 0
+            counted_items.add(item_key)
+            mediainfo, cached, recognize_cost = None, False, 0
+            if meta.name:
+                recognize_key = self.__recognize_key(meta)
+                mediainfo, cached, recognize_cost = recognized.get(recognize_key, (None, False, 0))
+                if recognize_key in counted_metas:
+                    recognize_cost, deduplicated = 0, True
+                counted_metas.add(recognize_key)
+            results.append({
+                "context": Context(meta_info=meta, media_info=mediainfo).to_dict(),
+                "cached": cached,
+                "deduplicated": deduplicated,
+                "time": round(cost + recognize_cost, 2)
+            })
+        return results
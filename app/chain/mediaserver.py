@@ -56,47 +56,61 @@ class MediaServerChain(ChainBase):
             _dbOper = MediaServerOper(_db)
             #  Summary statistics
             total_count = 0
-            #  Empty the register
-            _dbOper.empty(server=settings.MEDIASERVER)
             #  Synchronized blacklists
             sync_blacklist = settings.MEDIASERVER_SYNC_BLACKLIST.split(
                 ",") if settings.MEDIASERVER_SYNC_BLACKLIST else []
             #  Media server setup
             if not settings.MEDIASERVER:
+                #  Empty the register
+                _dbOper.empty(server=settings.MEDIASERVER)
+                _dbOper.reload_index()
+                _db.close()
                 return
             mediaservers = settings.MEDIASERVER.split(",")
-            #  Traversing the media server
-            for mediaserver in mediaservers:
-                logger.info(f" Starting to synchronize media libraries {mediaserver}  Data ...")
-                for library in self.librarys(mediaserver):
-                    #  Synchronized blacklists 跳过
-                    if library.name in sync_blacklist:
-                        continue
-                    logger.info(f" Synchronizing. {mediaserver}  Media library {library.name} ...")
-                    library_count = 0
-                    for item in self.items(mediaserver, library.id):
-                        if not item:
-                            continue
-                        if not item.item_id:
+            #  Read all items first， The current data is kept when a media library cannot be read completely
+            libraries = []
+            try:
+                for mediaserver in mediaservers:
+                    logger.info(f" Starting to synchronize media libraries {mediaserver}  Data ...")
+                    for library in self.librarys(mediaserver):
+                        #  Synchronized blacklists 跳过
+                        if library.name in sync_blacklist:
                             continue
-                        #  Reckoning
-                        library_count += 1
-                        seasoninfo = {}
-                        #  Typology
-                        item_type = " Dramas" if item.item_type in ['Series', 'show'] else " Cinematic"
-                        if item_type == " Dramas":
-                            #  Search for episode information
-                            espisodes_info = self.episodes(mediaserver, item.item_id) or []
-                            for episode in espisodes_info:
-                                seasoninfo[episode.season] = episode.episodes
-                        #  Insert data
-                        item_dict = item.dict()
-                        item_dict['seasoninfo'] = json.dumps(seasoninfo)
-                        item_dict['item_type'] = item_type
-                        _dbOper.add(**item_dict)
-                    logger.info(f"{mediaserver}  Media library {library.name}  Synchronized completion， Number of common steps：{library_count}")
-                    #  Totals add up
-                    total_count += library_count
+                        logger.info(f" Synchronizing. {mediaserver}  Media library {library.name} ...")
+                        libraries.append((mediaserver, library, list(self.items(mediaserver, library.id) or [])))
+            except Exception as err:
+                logger.error(f"【MediaServer】 Media library data synchronization aborted：{err}")
+                _db.close()
+                return
+            #  Empty the register
+            _dbOper.empty(server=settings.MEDIASERVER)
+            for mediaserver, library, items in libraries:
+                library_count = 0
+                for item in items:
+                    if not item:
+                        continue
+                    if not item.item_id:
+                        continue
+                    #  Reckoning
+                    library_count += 1
+                    seasoninfo = {}
+                    #  Typology
+                    item_type = " Dramas" if item.item_type in ['Series', 'show'] else " Cinematic"
+                    if item_type == " Dramas":
+                        #  Search for episode information
+                        espisodes_info = self.episodes(mediaserver, item.item_id) or []
+                        for episode in espisodes_info:
+                            seasoninfo[episode.season] = episode.episodes
+                    #  Insert data
+                    item_dict = item.dict()
+                    item_dict['seasoninfo'] = json.dumps(seasoninfo)
+                    item_dict['item_type'] = item_type
+                    _dbOper.add(**item_dict)
+                logger.info(f"{mediaserver}  Media library {library.name}  Synchronized completion， Number of common steps：{library_count}")
+                #  Totals add up
+                total_count += library_count
+            #  Synchronized data in the other worker processes
+            _dbOper.reload_index()
             #  Close the database connection
             if _db:
                 _db.close()
@@ -1,8 +1,8 @@
-import pickle
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Callable, Union, Tuple
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
@@ -13,6 +13,7 @@ from app.core.context import MediaInfo, TorrentInfo
 from app.core.metainfo import MetaInfo
 from app.db.systemconfig_oper import SystemConfigOper
 from app.helper.progress import ProgressHelper
+from app.helper.searchresult import SearchResultStore
 from app.helper.sites import SitesHelper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
@@ -32,50 +33,63 @@ class SearchChain(ChainBase):
         self.progress = ProgressHelper()
         self.systemconfig = SystemConfigOper()
         self.torrenthelper = TorrentHelper()
+        self.resultstore = SearchResultStore()
 
-    def search_by_tmdbid(self, tmdbid: int, mtype: MediaType = None, area: str = "title") -> List[Context]:
+    def search_by_tmdbid(self, tmdbid: int, mtype: MediaType = None, area: str = "title",
+                         callback: Callable[[str, List[TorrentInfo]], None] = None,
+                         cancel: threading.Event = None,
+                         userid: Union[int, str] = None) -> List[Context]:
         """
         According toTMDB ID Search resources， Exact match， But not without filtering locally available resources
         :param tmdbid: TMDB ID
         :param mtype:  Media, esp. news media， Cinematic or  Dramas
         :param area:  Search scope，title or imdbid
+        :param callback:  Called with the site name and its resources as each site finishes
+        :param cancel:  Search stops when set
+        :param userid:  SubscribersID， Results are saved for this user
         """
         mediainfo = self.recognize_media(tmdbid=tmdbid, mtype=mtype)
         if not mediainfo:
             logger.error(f'{tmdbid}  Media message recognition failure！')
             return []
-        results = self.process(mediainfo=mediainfo, area=area)
+        results = self.process(mediainfo=mediainfo, area=area, callback=callback, cancel=cancel)
+        if cancel and cancel.is_set():
+            return results
         #  Saving results
-        bytes_results = pickle.dumps(results)
-        self.systemconfig.set(SystemConfigKey.SearchResults, bytes_results)
+        self.resultstore.save(userid=userid, query=f"tmdb:{tmdbid}:{area}",
+                              contexts=results, title=mediainfo.title_year)
         return results
 
-    def search_by_title(self, title: str, page: int = 0, site: int = None) -> List[TorrentInfo]:
+    def search_by_title(self, title: str, page: int = 0, site: int = None,
+                        callback: Callable[[str, List[TorrentInfo]], None] = None,
+                        cancel: threading.Event = None) -> List[TorrentInfo]:
         """
         Search for resources by title， No recognition or filtering， Direct return to site content
         :param title:  Caption， Returns all site home contents when empty
         :param page:  Pagination
         :param site:  WebsiteID
+        :param callback:  Called with the site name and its resources as each site finishes
+        :param cancel:  Search stops when set
         """
         if title:
             logger.info(f' Start searching for resources， Byword：{title} ...')
         else:
             logger.info(f' Start browsing resources， Website：{site} ...')
         #  Look for sth.
-        return self.__search_all_sites(keywords=[title], sites=[site] if site else None, page=page) or []
+        return self.__search_all_sites(keywords=[title], sites=[site] if site else None, page=page,
+                                       callback=callback, cancel=cancel) or []
 
-    def last_search_results(self) -> List[Context]:
+    def last_search_results(self, userid: Union[int, str] = None, query: str = None,
+                            page: int = 1, count: int = 0) -> Tuple[int, List[dict]]:
         """
         Get last search results
+        :param userid:  SubscribersID
+        :param query:  Query key， The most recent query when empty
+        :param page:  Page number
+        :param count:  Number per page，0 For all
+        :return:  Total number， Results in context dictionary form
         """
-        results = self.systemconfig.get(SystemConfigKey.SearchResults)
-        if not results:
-            return []
-        try:
-            return pickle.loads(results)
-        except Exception as e:
-            print(str(e))
-            return []
+        return self.resultstore.get(userid=userid, query=query, page=page, count=count)
 
     def process(self, mediainfo: MediaInfo,
                 keyword: str = None,
@@ -83,7 +97,9 @@ class SearchChain(ChainBase):
                 sites: List[int] = None,
                 priority_rule: str = None,
                 filter_rule: Dict[str, str] = None,
-                area: str = "title") -> List[Context]:
+                area: str = "title",
+                callback: Callable[[str, List[TorrentInfo]], None] = None,
+                cancel: threading.Event = None) -> List[Context]:
         """
         Search for seed resources based on media information， Exact match， Apply filtering rules， At the same time, according tono_exists Filtering resources that already exist locally
         :param mediainfo:  Media information
@@ -93,6 +109,8 @@ class SearchChain(ChainBase):
         :param priority_rule:  Priority rules， Use search prioritization rules when empty
         :param filter_rule:  Filter rules， Null is to use the default filtering rules
         :param area:  Search scope，title or imdbid
+        :param callback:  Called with the site name and its resources as each site finishes
+        :param cancel:  Search stops when set
         """
         logger.info(f' Start searching for resources， Byword：{keyword or mediainfo.title} ...')
         #  Additional media information
@@ -121,8 +139,13 @@ class SearchChain(ChainBase):
             mediainfo=mediainfo,
             keywords=keywords,
             sites=sites,
-            area=area
+            area=area,
+            callback=callback,
+            cancel=cancel
         )
+        if cancel and cancel.is_set():
+            logger.info(f'{keyword or mediainfo.title}  Search cancelled')
+            return []
         if not torrents:
             logger.warn(f'{keyword or mediainfo.title}  No resources searched')
             return []
@@ -193,10 +216,7 @@ class SearchChain(ChainBase):
                             continue
                 #  Comparison of titles and original language titles
                 meta_name = StringUtils.clear_upper(torrent_meta.name)
-                if meta_name in [
-                    StringUtils.clear_upper(mediainfo.title),
-                    StringUtils.clear_upper(mediainfo.original_title)
-                ]:
+                if meta_name in mediainfo.normalized_titles:
                     logger.info(f'{mediainfo.title}  Matching to resources by title：{torrent.site_name} - {torrent.title}')
                     _match_torrents.append(torrent)
                     continue
@@ -212,11 +232,9 @@ class SearchChain(ChainBase):
                         _match_torrents.append(torrent)
                         continue
                 #  Comparing aliases and translations
-                for name in mediainfo.names:
-                    if StringUtils.clear_upper(name) == meta_name:
-                        logger.info(f'{mediainfo.title}  Match to resource by alias or translation：{torrent.site_name} - {torrent.title}')
-                        _match_torrents.append(torrent)
-                        break
+                if meta_name in mediainfo.normalized_names:
+                    logger.info(f'{mediainfo.title}  Match to resource by alias or translation：{torrent.site_name} - {torrent.title}')
+                    _match_torrents.append(torrent)
                 else:
                     logger.warn(f'{torrent.site_name} - {torrent.title}  Title mismatch')
             self.progress.update(value=100,
@@ -241,7 +259,9 @@ class SearchChain(ChainBase):
                            mediainfo: Optional[MediaInfo] = None,
                            sites: List[int] = None,
                            page: int = 0,
-                           area: str = "title") -> Optional[List[TorrentInfo]]:
+                           area: str = "title",
+                           callback: Callable[[str, List[TorrentInfo]], None] = None,
+                           cancel: threading.Event = None) -> Optional[List[TorrentInfo]]:
         """
         Multi-threaded search for multiple sites
         :param mediainfo:   Identified media messages
@@ -249,6 +269,8 @@ class SearchChain(ChainBase):
         :param sites:   Designated siteID Listings， Search only the specified site if available， Otherwise search all sites
         :param page:   Search page
         :param area:   Search area title or imdbid
+        :param callback:   Called with the site name and its resources as each site finishes
+        :param cancel:   Stop waiting for the remaining sites when set
         :reutrn:  Resource list
         """
         #  Unopened sites are not searched
@@ -285,7 +307,7 @@ class SearchChain(ChainBase):
                              key=ProgressKey.Search)
         #  Multi-threaded
         executor = ThreadPoolExecutor(max_workers=len(indexer_sites))
-        all_task = []
+        all_task = {}
         for site in indexer_sites:
             if area == "imdbid":
                 #  Look for sth.IMDBID
@@ -299,18 +321,27 @@ class SearchChain(ChainBase):
                                        keywords=keywords,
                                        mtype=mediainfo.type if mediainfo else None,
                                        page=page)
-            all_task.append(task)
+            all_task[task] = site
         #  Result set
         results = []
-        for future in as_completed(all_task):
-            finish_count += 1
-            result = future.result()
-            if result:
-                results.extend(result)
-            logger.info(f" Site search progress：{finish_count} / {total_num}")
-            self.progress.update(value=finish_count / total_num * 100,
-                                 text=f" Searching{keywords or ''}， Done {finish_count} / {total_num}  Stations ...",
-                                 key=ProgressKey.Search)
+        pending = set(all_task)
+        while pending:
+            done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            if cancel and cancel.is_set():
+                logger.info(f" Search cancelled， Remaining {len(pending)}  Stations are ignored")
+                break
+            for future in done:
+                finish_count += 1
+                result = future.result()
+                if result:
+                    results.extend(result)
+                if callback:
+                    callback(all_task[future].get("name"), result or [])
+                logger.info(f" Site search progress：{finish_count} / {total_num}")
+                self.progress.update(value=finish_count / total_num * 100,
+                                     text=f" Searching{keywords or ''}， Done {finish_count} / {total_num}  Stations ...",
+                                     key=ProgressKey.Search)
+        executor.shutdown(wait=False, cancel_futures=True)
         #  Computational time
         end_time = datetime.now()
         #  Update progress
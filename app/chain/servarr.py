@@ -0,0 +1,229 @@
+import threading
+from typing import List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.chain import ChainBase
+from app.core.config import settings
+from app.core.context import MediaInfo
+from app.core.metainfo import MetaInfo
+from app.db.mediaserver_oper import MediaServerOper
+from app.db.subscribe_oper import SubscribeOper
+from app.log import logger
+from app.schemas import RadarrMovie, SonarrSeries
+from app.schemas.types import MediaType
+
+
+class ServarrChain(ChainBase):
+    """
+    Sonarr/Radarr emulation， Payloads are built from the subscription projection and the media library index，
+    Media looked up by tmdbid/tvdbid are kept for a day so that polling does not query TMDB again
+    """
+    #  Media looked up，movie:tmdbid -> MediaInfo，tvdb:tvdbid -> (MediaInfo,  Seasons)，title: Term -> tvdbid
+    _medias = TTLCache(maxsize=1024 if settings.BIG_MEMORY_MODE else 256, ttl=24 * 60 * 60)
+    #  Media not in the library， Checked again after a while
+    _missing = TTLCache(maxsize=1024, ttl=10 * 60)
+    _lock = threading.Lock()
+
+    def __init__(self, db=None):
+        super().__init__(db)
+        self.subscribeoper = SubscribeOper(self._db)
+        self.mediaserver = MediaServerOper(self._db)
+
+    @classmethod
+    def __get_cache(cls, key: str):
+        with cls._lock:
+            return cls._medias.get(key)
+
+    @classmethod
+    def __set_cache(cls, key: str, value):
+        with cls._lock:
+            cls._medias[key] = value
+
+    def __has_file(self, mediainfo: MediaInfo) -> bool:
+        """
+        Whether a media is in the library， The media library index first， Then the media server
+        """
+        ids = {
+            "tmdbid": mediainfo.tmdb_id,
+            "imdbid": mediainfo.imdb_id,
+            "tvdbid": mediainfo.tvdb_id
+        }
+        if self.mediaserver.get_exists_info(mtype=mediainfo.type.value, **ids):
+            return True
+        key = f"{mediainfo.type.value}:{mediainfo.tmdb_id}"
+        with self._lock:
+            if key in self._missing:
+                return False
+        exists_info = self.media_exists(mediainfo=mediainfo)
+        if exists_info:
+            self.mediaserver.cache_exists_info(mtype=mediainfo.type.value, info=exists_info, **ids)
+            return True
+        with self._lock:
+            self._missing[key] = True
+        return False
+
+    @staticmethod
+    def __movie(subscribe: dict) -> RadarrMovie:
+        return RadarrMovie(
+            id=subscribe.get("id"),
+            title=subscribe.get("name"),
+            year=subscribe.get("year"),
+            isAvailable=True,
+            monitored=True,
+            tmdbId=subscribe.get("tmdbid"),
+            imdbId=subscribe.get("imdbid"),
+            profileId=1,
+            qualityProfileId=1,
+            hasFile=False
+        )
+
+    @staticmethod
+    def __series(subscribe: dict) -> SonarrSeries:
+        return SonarrSeries(
+            id=subscribe.get("id"),
+            title=subscribe.get("name"),
+            seasonCount=1,
+            seasons=[{
+                "seasonNumber": subscribe.get("season"),
+                "monitored": True,
+            }],
+            remotePoster=subscribe.get("poster"),
+            year=subscribe.get("year"),
+            tmdbId=subscribe.get("tmdbid"),
+            tvdbId=subscribe.get("tvdbid"),
+            imdbId=subscribe.get("imdbid"),
+            profileId=1,
+            languageProfileId=1,
+            qualityProfileId=1,
+            isAvailable=True,
+            monitored=True,
+            hasFile=False
+        )
+
+    def radarr_movies(self) -> List[RadarrMovie]:
+        """
+        All movie subscriptions
+        """
+        return [self.__movie(subscribe) for subscribe in self.subscribeoper.list_indexed(MediaType.MOVIE.value)]
+
+    def radarr_movie(self, mid: int) -> Optional[RadarrMovie]:
+        """
+        Movie subscription by subscription ID
+        """
+        subscribe = self.subscribeoper.get_indexed(mid)
+        if not subscribe:
+            return None
+        return self.__movie(subscribe)
+
+    def radarr_lookup(self, tmdbid: int) -> List[RadarrMovie]:
+        """
+        Movie by tmdbid， With its subscription and library state
+        """
+        key = f"movie:{tmdbid}"
+        mediainfo: Optional[MediaInfo] = self.__get_cache(key)
+        if not mediainfo:
+            mediainfo = self.recognize_media(mtype=MediaType.MOVIE, tmdbid=tmdbid)
+            if not mediainfo:
+                return [RadarrMovie()]
+            self.__set_cache(key, mediainfo)
+        subscribes = self.subscribeoper.get_indexed_by_tmdbid(tmdbid)
+        return [RadarrMovie(
+            id=subscribes[0].get("id") if subscribes else None,
+            title=mediainfo.title,
+            year=mediainfo.year,
+            isAvailable=True,
+            monitored=True if subscribes else False,
+            tmdbId=mediainfo.tmdb_id,
+            imdbId=mediainfo.imdb_id,
+            titleSlug=mediainfo.original_title,
+            folderName=mediainfo.title_year,
+            profileId=1,
+            qualityProfileId=1,
+            hasFile=self.__has_file(mediainfo)
+        )]
+
+    def sonarr_series(self) -> List[SonarrSeries]:
+        """
+        All tv series subscriptions
+        """
+        return [self.__series(subscribe) for subscribe in self.subscribeoper.list_indexed(MediaType.TV.value)]
+
+    def sonarr_serie(self, tid: int) -> Optional[SonarrSeries]:
+        """
+        Tv series subscription by subscription ID
+        """
+        subscribe = self.subscribeoper.get_indexed(tid)
+        if not subscribe:
+            return None
+        return self.__series(subscribe)
+
+    def __lookup_series(self, term: str) -> Optional[Tuple[MediaInfo, List[int]]]:
+        """
+        Tv series and its seasons by `tvdb:${id}` or title
+        """
+        mediainfo = None
+        if term.startswith("tvdb:"):
+            tvdbid = int(term.replace("tvdb:", ""))
+        else:
+            tvdbid = self.__get_cache(f"title:{term}")
+            if not tvdbid:
+                mediainfo = self.recognize_media(meta=MetaInfo(term), mtype=MediaType.TV)
+                if not mediainfo or not mediainfo.tvdb_id:
+                    return None
+                tvdbid = mediainfo.tvdb_id
+                self.__set_cache(f"title:{term}", tvdbid)
+        key = f"tvdb:{tvdbid}"
+        cached = self.__get_cache(key)
+        if cached:
+            return cached
+        tvdbinfo = self.tvdb_info(tvdbid=tvdbid)
+        if not tvdbinfo:
+            return None
+        #  Quarterly information
+        seasons: List[int] = []
+        sea_num = tvdbinfo.get('season')
+        if sea_num:
+            seasons = list(range(1, int(sea_num) + 1))
+        #  According toTVDB Search for media information
+        if not mediainfo:
+            mediainfo = self.recognize_media(meta=MetaInfo(tvdbinfo.get('seriesName')),
+                                             mtype=MediaType.TV)
+            if not mediainfo:
+                return None
+        self.__set_cache(key, (mediainfo, seasons))
+        logger.debug(f"Servarr  Projected tv series {mediainfo.title_year} tvdb:{tvdbid}")
+        return mediainfo, seasons
+
+    def sonarr_lookup(self, term: str) -> List[SonarrSeries]:
+        """
+        Tv series by `tvdb:${id}` or title， With its subscribed seasons and library state
+        """
+        series = self.__lookup_series(term)
+        if not series:
+            return [SonarrSeries()]
+        mediainfo, seas = series
+        #  Check subscription information
+        subscribes = self.subscribeoper.get_indexed_by_tmdbid(mediainfo.tmdb_id)
+        sub_seas = [sub.get("season") for sub in subscribes]
+        seasons = [{
+            "seasonNumber": sea,
+            "monitored": sea in sub_seas,
+        } for sea in seas]
+        return [SonarrSeries(
+            id=subscribes[-1].get("id") if subscribes else None,
+            title=mediainfo.title,
+            seasonCount=len(seasons),
+            seasons=seasons,
+            remotePoster=mediainfo.get_poster_image(),
+            year=mediainfo.year,
+            tmdbId=mediainfo.tmdb_id,
+            tvdbId=mediainfo.tvdb_id,
+            imdbId=mediainfo.imdb_id,
+            profileId=1,
+            languageProfileId=1,
+            qualityProfileId=1,
+            isAvailable=True,
+            monitored=True if subscribes else False,
+            hasFile=self.__has_file(mediainfo)
+        )]
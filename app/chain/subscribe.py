@@ -451,6 +451,11 @@ class SubscribeChain(ChainBase):
             default_filter = self.systemconfig.get(SystemConfigKey.DefaultFilterRules) or {}
             include = subscribe.include or default_filter.get("include")
             exclude = subscribe.exclude or default_filter.get("exclude")
+            #  Priority filtering rules
+            if subscribe.best_version:
+                filter_rule = self.systemconfig.get(SystemConfigKey.BestVersionFilterRules)
+            else:
+                filter_rule = self.systemconfig.get(SystemConfigKey.SubscribeFilterRules)
             #  Iterate over the cached seeds
             _match_context = []
             for domain, contexts in torrents.items():
@@ -463,11 +468,6 @@ class SubscribeChain(ChainBase):
                     if torrent_mediainfo.tmdb_id != mediainfo.tmdb_id \
                             or torrent_mediainfo.type != mediainfo.type:
                         continue
-                    #  Priority filtering rules
-                    if subscribe.best_version:
-                        filter_rule = self.systemconfig.get(SystemConfigKey.BestVersionFilterRules)
-                    else:
-                        filter_rule = self.systemconfig.get(SystemConfigKey.SubscribeFilterRules)
                     result: List[TorrentInfo] = self.filter_torrents(
                         rule_string=filter_rule,
                         torrent_list=[torrent_info],
@@ -12,6 +12,7 @@ from app.db.site_oper import SiteOper
 from app.db.systemconfig_oper import SystemConfigOper
 from app.helper.rss import RssHelper
 from app.helper.sites import SitesHelper
+from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.schemas import Notification
 from app.schemas.types import SystemConfigKey, MessageChannel, NotificationType
@@ -56,9 +57,9 @@ class TorrentsChain(ChainBase, metaclass=Singleton):
 
         #  Read cache
         if stype == 'spider':
-            return self.load_cache(self._spider_file) or {}
+            return TorrentHelper.unpack_cache(self.load_cache(self._spider_file)) or {}
         else:
-            return self.load_cache(self._rss_file) or {}
+            return TorrentHelper.unpack_cache(self.load_cache(self._rss_file)) or {}
 
     @cached(cache=TTLCache(maxsize=128 if settings.BIG_MEMORY_MODE else 1, ttl=600))
     def browse(self, domain: str) -> List[TorrentInfo]:
@@ -192,9 +193,9 @@ class TorrentsChain(ChainBase, metaclass=Singleton):
 
         #  Save cache locally
         if stype == "spider":
-            self.save_cache(torrents_cache, self._spider_file)
+            self.save_cache(TorrentHelper.pack_cache(torrents_cache), self._spider_file)
         else:
-            self.save_cache(torrents_cache, self._rss_file)
+            self.save_cache(TorrentHelper.pack_cache(torrents_cache), self._rss_file)
 
         #  Come (or go) back
         return torrents_cache
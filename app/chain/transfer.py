@@ -1,7 +1,11 @@
+import copy
 import glob
 import re
 import shutil
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional, Tuple, Union, Dict
 
@@ -15,6 +19,7 @@ from app.core.context import MediaInfo
 from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfoPath
 from app.db.downloadhistory_oper import DownloadHistoryOper
+from app.db.mediaserver_oper import MediaServerOper
 from app.db.models.downloadhistory import DownloadHistory
 from app.db.models.transferhistory import TransferHistory
 from app.db.systemconfig_oper import SystemConfigOper
@@ -35,11 +40,14 @@ class TransferChain(ChainBase):
     """
     Document transfer processing chain
     """
+    #  Number of files of a batch transferred in parallel
+    _transfer_workers = 4
 
     def __init__(self, db: Session = None):
         super().__init__(db)
         self.downloadhis = DownloadHistoryOper(self._db)
         self.transferhis = TransferHistoryOper(self._db)
+        self.mediaserver = MediaServerOper(self._db)
         self.progress = ProgressHelper()
         self.mediachain = MediaChain(self._db)
         self.tmdbchain = TmdbChain(self._db)
@@ -142,8 +150,13 @@ class TransferChain(ChainBase):
                              text=f" Commencement of transfer {path}， Common {total_num}  File ...",
                              key=ProgressKey.FileTransfer)
 
-        #  Organize blocked words
-        transfer_exclude_words = self.systemconfig.get(SystemConfigKey.TransferExcludeWords)
+        #  Organize blocked words， Compiled once per change
+        transfer_exclude_words = self.systemconfig.cached(SystemConfigKey.TransferExcludeWords,
+                                                          self.compile_exclude_words)
+
+        #  Media passed in
+        if mediainfo:
+            mediainfo = self.__prepare_media(mediainfo)
 
         #  Process all directories or files to be transferred， By default a transfer path or file has only one media message
         for trans_path in trans_paths:
@@ -170,7 +183,12 @@ class TransferChain(ChainBase):
                 #  There are sets of customized formats，过滤文件
                 file_paths = [f for f in file_paths if formaterHandler.match(f.name)]
 
-            #  Transfer of all documents
+            #  Transfer plan： Recognize each file， Files of the same media and season share the recognition result and episode data
+            plans: List[dict] = []
+            #  Recognized media， Key by name、 Particular year、 Typology、 Classifier for seasonal crop yield or seasons of a tv series
+            recognized: Dict[Tuple, Optional[MediaInfo]] = {}
+            #  Episode data， Key bytmdbid、 Classifier for seasonal crop yield or seasons of a tv series
+            episodes_infos: Dict[Tuple, Optional[list]] = {}
             for file_path in file_paths:
                 #  Recycle bin and hidden files not handled
                 file_path_str = str(file_path)
@@ -187,10 +205,8 @@ class TransferChain(ChainBase):
                 #  Organize blocked words不处理
                 is_blocked = False
                 if transfer_exclude_words:
-                    for keyword in transfer_exclude_words:
-                        if not keyword:
-                            continue
-                        if keyword and re.search(r"%s" % keyword, file_path_str, re.IGNORECASE):
+                    for keyword, keyword_re in transfer_exclude_words:
+                        if keyword_re.search(file_path_str):
                             logger.info(f"{file_path}  Hit listener's blocking words (computing) {keyword}， Not dealt with")
                             is_blocked = True
                             break
@@ -211,16 +227,12 @@ class TransferChain(ChainBase):
                         skip_num += 1
                         continue
 
-                #  Update progress
-                self.progress.update(value=processed_num / total_num * 100,
-                                     text=f" Moving. （{processed_num + 1}/{total_num}）{file_path.name} ...",
-                                     key=ProgressKey.FileTransfer)
-
                 if not meta:
                     #  Document metadata
                     file_meta = MetaInfoPath(file_path)
                 else:
-                    file_meta = meta
+                    #  Per file copy， The metadata of the caller is shared by all files
+                    file_meta = copy.copy(meta)
 
                 #  Merger season
                 if season is not None:
@@ -245,8 +257,11 @@ class TransferChain(ChainBase):
                         file_meta.end_episode = end_ep
 
                 if not mediainfo:
-                    #  Identify media messages
-                    file_mediainfo = self.recognize_media(meta=file_meta)
+                    #  Identify media messages， Files of the same name、 Year and season are only recognized once
+                    rkey = (file_meta.name, file_meta.year, file_meta.type, file_meta.begin_season)
+                    if rkey not in recognized:
+                        recognized[rkey] = self.__prepare_media(self.recognize_media(meta=file_meta))
+                    file_mediainfo = recognized[rkey]
                 else:
                     file_mediainfo = mediainfo
 
@@ -269,24 +284,16 @@ class TransferChain(ChainBase):
                     fail_num += 1
                     continue
 
-                #  If not enabled does the new inbound media follow theTMDB Information changes are then based ontmdbid Query the previoustitle
-                if not settings.SCRAP_FOLLOW_TMDB:
-                    transfer_history = self.transferhis.get_by_type_tmdbid(tmdbid=file_mediainfo.tmdb_id,
-                                                                           mtype=file_mediainfo.type.value)
-                    if transfer_history:
-                        file_mediainfo.title = transfer_history.title
-
                 logger.info(f"{file_path.name}  Identify as：{file_mediainfo.type.value} {file_mediainfo.title_year}")
 
-                #  Updating media images
-                self.obtain_images(mediainfo=file_mediainfo)
-
-                #  Getting set data
+                #  Getting set data， Once per season
+                episodes_info = None
                 if file_mediainfo.type == MediaType.TV:
-                    episodes_info = self.tmdbchain.tmdb_episodes(tmdbid=file_mediainfo.tmdb_id,
-                                                                 season=file_meta.begin_season or 1)
-                else:
-                    episodes_info = None
+                    ekey = (file_mediainfo.tmdb_id, file_meta.begin_season or 1)
+                    if ekey not in episodes_infos:
+                        episodes_infos[ekey] = self.tmdbchain.tmdb_episodes(tmdbid=file_mediainfo.tmdb_id,
+                                                                            season=file_meta.begin_season or 1)
+                    episodes_info = episodes_infos[ekey]
 
                 #  Get downloadhash
                 if not download_hash:
@@ -294,16 +301,28 @@ class TransferChain(ChainBase):
                     if download_file:
                         download_hash = download_file.download_hash
 
-                #  Execution transfer
-                transferinfo: TransferInfo = self.transfer(meta=file_meta,
-                                                           mediainfo=file_mediainfo,
-                                                           path=file_path,
-                                                           transfer_type=transfer_type,
-                                                           target=target,
-                                                           episodes_info=episodes_info)
+                plans.append({
+                    "file_path": file_path,
+                    "meta": file_meta,
+                    "mediainfo": file_mediainfo,
+                    "episodes_info": episodes_info,
+                    "download_hash": download_hash
+                })
+
+            #  Execution transfer， The pre-identified metadata may be shared by files， Transfer one by one
+            success_records: List[dict] = []
+            #  Whether the transfer module failed， No more files are submitted then
+            module_failed = False
+            for plan, transferinfo in self.__run_plans(plans, workers=1 if meta else self._transfer_workers,
+                                                       transfer_type=transfer_type, target=target):
+                file_path: Path = plan["file_path"]
+                file_meta: MetaBase = plan["meta"]
+                file_mediainfo: MediaInfo = plan["mediainfo"]
                 if not transferinfo:
-                    logger.error(" Failure to run the file transfer module")
-                    return False, " Failure to run the file transfer module"
+                    if not module_failed:
+                        logger.error(" Failure to run the file transfer module")
+                        module_failed = True
+                    continue
                 if not transferinfo.success:
                     #  Transfer failure
                     logger.warn(f"{file_path.name}  Failure to stock：{transferinfo.message}")
@@ -312,7 +331,7 @@ class TransferChain(ChainBase):
                     self.transferhis.add_fail(
                         src_path=file_path,
                         mode=transfer_type,
-                        download_hash=download_hash,
+                        download_hash=plan["download_hash"],
                         meta=file_meta,
                         mediainfo=file_mediainfo,
                         transferinfo=transferinfo
@@ -347,15 +366,15 @@ class TransferChain(ChainBase):
                     transfers[mkey].file_list_new.extend(transferinfo.file_list_new)
                     transfers[mkey].fail_list.extend(transferinfo.fail_list)
 
-                #  Add transfer success history
-                self.transferhis.add_success(
-                    src_path=file_path,
-                    mode=transfer_type,
-                    download_hash=download_hash,
-                    meta=file_meta,
-                    mediainfo=file_mediainfo,
-                    transferinfo=transferinfo
-                )
+                #  Transfer success history， Written together after the batch
+                success_records.append({
+                    "src_path": file_path,
+                    "mode": transfer_type,
+                    "download_hash": plan["download_hash"],
+                    "meta": file_meta,
+                    "mediainfo": file_mediainfo,
+                    "transferinfo": transferinfo
+                })
                 #  Scraping of individual documents
                 if settings.SCRAP_METADATA:
                     self.scrape_metadata(path=transferinfo.target_path, mediainfo=file_mediainfo)
@@ -365,20 +384,31 @@ class TransferChain(ChainBase):
                                      text=f"{file_path.name}  Transfer completed",
                                      key=ProgressKey.FileTransfer)
 
+            #  Add transfer success history， Also of the files transferred before the module failed
+            self.transferhis.add_success_batch(success_records)
+            if module_failed:
+                return False, " Failure to run the file transfer module"
+
             #  Directory or file transfer complete
             self.progress.update(text=f"{trans_path}  Transfer completed， Follow-up being implemented ...",
                                  key=ProgressKey.FileTransfer)
 
             #  Implementation follow-up
+            refreshed_paths = set()
             for mkey, media in medias.items():
                 transfer_meta = metas[mkey]
                 transfer_info = transfers[mkey]
                 #  Media catalog
                 if transfer_info.target_path.is_file():
                     transfer_info.target_path = transfer_info.target_path.parent
-                #  Refresh media library， Root or quarter directory
-                if settings.REFRESH_MEDIASERVER:
+                #  Refresh media library， Root or quarter directory， Each directory only once
+                if settings.REFRESH_MEDIASERVER \
+                        and transfer_info.target_path not in refreshed_paths:
+                    refreshed_paths.add(transfer_info.target_path)
                     self.refresh_mediaserver(mediainfo=media, file_path=transfer_info.target_path)
+                #  Episodes in the media library have changed， Expire the local index
+                self.mediaserver.expire_exists_info(mtype=media.type.value, tmdbid=media.tmdb_id,
+                                                    imdbid=media.imdb_id, tvdbid=media.tvdb_id)
                 #  Send notification
                 se_str = None
                 if media.type == MediaType.TV:
@@ -406,6 +436,84 @@ class TransferChain(ChainBase):
 
         return True, "\n".join(err_msgs)
 
+    @staticmethod
+    def __target_key(plan: dict) -> tuple:
+        """
+        Files with the same media、 Episodes and extension may be renamed to the same target
+        """
+        file_meta: MetaBase = plan["meta"]
+        file_mediainfo: MediaInfo = plan["mediainfo"]
+        return (file_mediainfo.type, file_mediainfo.tmdb_id, file_meta.begin_season,
+                tuple(file_meta.episode_list), file_meta.part, plan["file_path"].suffix.lower())
+
+    def __run_plans(self, plans: List[dict], workers: int, transfer_type: str, target: Path):
+        """
+        Transfer planned files in parallel and yield ( Plan,  Transfer result) in order，
+        Only as many files as workers are submitted ahead and none after the transfer module fails，
+        Files that may have the same target are transferred one after another
+        """
+        target_locks: Dict[tuple, threading.Lock] = {self.__target_key(plan): threading.Lock() for plan in plans}
+        failed = threading.Event()
+
+        def __transfer(plan: dict) -> Optional[TransferInfo]:
+            with target_locks[self.__target_key(plan)]:
+                if failed.is_set():
+                    return None
+                transferinfo = self.transfer(meta=plan["meta"],
+                                             mediainfo=plan["mediainfo"],
+                                             path=plan["file_path"],
+                                             transfer_type=transfer_type,
+                                             target=target,
+                                             episodes_info=plan["episodes_info"])
+                if not transferinfo:
+                    failed.set()
+                return transferinfo
+
+        pending = iter(plans)
+        running = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for plan in islice(pending, workers):
+                running.append((plan, executor.submit(__transfer, plan)))
+            while running:
+                plan, future = running.popleft()
+                transferinfo = future.result()
+                if not failed.is_set():
+                    for next_plan in islice(pending, 1):
+                        running.append((next_plan, executor.submit(__transfer, next_plan)))
+                yield plan, transferinfo
+
+    def __prepare_media(self, mediainfo: Optional[MediaInfo]) -> Optional[MediaInfo]:
+        """
+        Prepare the recognized media for transfer， Once per media
+        """
+        if not mediainfo:
+            return None
+        #  If not enabled does the new inbound media follow theTMDB Information changes are then based ontmdbid Query the previoustitle
+        if not settings.SCRAP_FOLLOW_TMDB:
+            transfer_history = self.transferhis.get_by_type_tmdbid(tmdbid=mediainfo.tmdb_id,
+                                                                   mtype=mediainfo.type.value)
+            if transfer_history:
+                mediainfo.title = transfer_history.title
+        #  Updating media images
+        self.obtain_images(mediainfo=mediainfo)
+        return mediainfo
+
+    @staticmethod
+    def compile_exclude_words(words: List[str]) -> List[Tuple[str, re.Pattern]]:
+        """
+        Compile blocked words of transfer， Invalid ones are skipped
+        :return: [( Blocked word,  Regex)]
+        """
+        compiled = []
+        for word in words or []:
+            if not word:
+                continue
+            try:
+                compiled.append((word, re.compile(r"%s" % word, re.IGNORECASE)))
+            except re.error as err:
+                logger.warn(f" Invalid blocked word {word}：{err}")
+        return compiled
+
     @staticmethod
     def __get_trans_paths(directory: Path):
         """
@@ -2,6 +2,7 @@ import time
 from typing import Any
 
 from app.chain import ChainBase
+from app.db.mediaserver_oper import MediaServerOper
 from app.schemas import Notification
 from app.schemas.types import EventType, MediaImageType, MediaType, NotificationType
 from app.utils.web import WebUtils
@@ -20,6 +21,10 @@ class WebhookChain(ChainBase):
         event_info = self.webhook_parser(body=body, form=form, args=args)
         if not event_info:
             return
+        #  Media library changes， Expire the local index
+        if event_info.event in ["library.new", "library.deleted", "ItemAdded", "ItemDeleted"] \
+                and event_info.tmdb_id:
+            MediaServerOper(self._db).expire_exists_info(tmdbid=event_info.tmdb_id)
         #  Broadcasting incident
         self.eventmanager.send_event(EventType.WebhookMessage, event_info)
         #  Assembly message content
@@ -12,6 +12,8 @@ from app.core.event import Event as ManagerEvent
 from app.core.event import eventmanager, EventManager
 from app.core.plugin import PluginManager
 from app.db import SessionFactory
+from app.helper.response import ResponseCache
+from app.helper.sharedstate import SharedState
 from app.log import logger
 from app.scheduler import Scheduler
 from app.schemas import Notification
@@ -157,13 +159,30 @@ class Command(metaclass=Singleton):
                     'data': command.get('data')
                 }
             )
+        #  Message processing thread， Only in the process elected to consume events
+        self._thread = None
+        SharedState().elect(EventManager.role, self.__start_consumer, self.__stop_consumer)
+
+    def __start_consumer(self):
+        """
+        Start consuming events
+        """
         #  Broadcast registration command menu
         self.chain.register_commands(commands=self.get_commands())
-        #  Message processing thread
+        self._event.clear()
         self._thread = Thread(target=self.__run)
         #  Starting an event processing thread
         self._thread.start()
 
+    def __stop_consumer(self):
+        """
+        Stop consuming events
+        """
+        self._event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
     def __run(self):
         """
         Event processing thread
@@ -181,6 +200,8 @@ class Command(metaclass=Singleton):
                             self.pluginmanager.run_plugin_method(names[0], names[1], event)
                     except Exception as e:
                         logger.error(f" Event handling error：{str(e)} - {traceback.format_exc()}")
+                #  Responses built from data changed by the event
+                ResponseCache().invalidate_event(event.event_type)
 
     def __run_command(self, command: Dict[str, any],
                       data_str: str = "",
@@ -236,8 +257,7 @@ class Command(metaclass=Singleton):
         """
         停止Event processing thread
         """
-        self._event.set()
-        self._thread.join()
+        self.__stop_consumer()
         if self._db:
             self._db.close()
 
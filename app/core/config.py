@@ -27,6 +27,10 @@ class Settings(BaseSettings):
     PORT: int = 3001
     #  Front-end listening port
     NGINX_PORT: int = 3000
+    # API Worker processes
+    WORKERS: int = 1
+    #  State shared between worker processes local/sqlite， Empty to select by the number of workers
+    STATE_BACKEND: str = None
     #  Debug mode or not
     DEBUG: bool = False
     #  Whether to develop a model
@@ -1,14 +1,32 @@
 import re
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass, field, asdict, fields
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Set
 
 from app.core.config import settings
 from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfo
 from app.schemas.types import MediaType
+from app.utils.string import StringUtils
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _get_properties(cls: type) -> frozenset:
+    """
+    Property names of a class， Computed once per class
+    """
+    return frozenset(name for name in dir(cls) if isinstance(getattr(cls, name), property))
+
+
+@lru_cache(maxsize=None)
+def _get_fields(cls: type) -> Tuple[str, ...]:
+    """
+    Field names of a dataclass in definition order
+    """
+    return tuple(f.name for f in fields(cls))
+
+
+@dataclass(slots=True)
 class TorrentInfo:
     #  WebsiteID
     site: int = None
@@ -55,29 +73,51 @@ class TorrentInfo:
     #  Seeding priority
     pri_order: int = 0
 
-    def __setattr__(self, name: str, value: Any):
-        self.__dict__[name] = value
+    def __getstate__(self) -> tuple:
+        """
+        Pickle field values only， In field order
+        """
+        return tuple(getattr(self, name) for name in _get_fields(TorrentInfo))
+
+    def __setstate__(self, state: Any):
+        #  Caches written before slots pickled the attribute dictionary
+        if isinstance(state, dict):
+            default = TorrentInfo()
+            for name in _get_fields(TorrentInfo):
+                setattr(self, name, state[name] if name in state else getattr(default, name))
+        else:
+            for name, value in zip(_get_fields(TorrentInfo), state):
+                setattr(self, name, value)
 
-    def __get_properties(self):
+    @staticmethod
+    def to_columns(torrents: List["TorrentInfo"]) -> Dict[str, list]:
         """
-        Getting a list of properties
+        Convert a seed list to columns， Field name -> Values of all seeds
         """
-        property_names = []
-        for member_name in dir(self.__class__):
-            member = getattr(self.__class__, member_name)
-            if isinstance(member, property):
-                property_names.append(member_name)
-        return property_names
+        return {name: [getattr(torrent, name) for torrent in torrents] for name in _get_fields(TorrentInfo)}
+
+    @staticmethod
+    def from_columns(columns: Dict[str, list]) -> List["TorrentInfo"]:
+        """
+        Restore a seed list from columns
+        """
+        names = [name for name in _get_fields(TorrentInfo) if name in columns]
+        torrents = []
+        for values in zip(*[columns[name] for name in names]):
+            torrent = TorrentInfo()
+            for name, value in zip(names, values):
+                setattr(torrent, name, value)
+            torrents.append(torrent)
+        return torrents
 
     def from_dict(self, data: dict):
         """
-        Initialize from dictionary
+        Initialize from dictionary， Keys other than fields are ignored
         """
-        properties = self.__get_properties()
+        names = _get_fields(TorrentInfo)
         for key, value in data.items():
-            if key in properties:
-                continue
-            setattr(self, key, value)
+            if key in names:
+                setattr(self, key, value)
 
     @staticmethod
     def get_free_string(upload_volume_factor: float, download_volume_factor: float) -> str:
@@ -109,7 +149,8 @@ class TorrentInfo:
         """
         Return to dictionary
         """
-        dicts = asdict(self)
+        dicts = {name: getattr(self, name) for name in _get_fields(TorrentInfo)}
+        dicts["labels"] = list(self.labels) if self.labels else []
         dicts["volume_factor"] = self.volume_factor
         return dicts
 
@@ -220,25 +261,29 @@ class MediaInfo:
         if self.douban_info:
             self.set_douban_info(self.douban_info)
 
-    def __setattr__(self, name: str, value: Any):
-        self.__dict__[name] = value
-
-    def __get_properties(self):
+    def __getstate__(self) -> dict:
         """
-        Getting a list of properties
+        Pickle only the attributes that differ from the class defaults
         """
-        property_names = []
-        for member_name in dir(self.__class__):
-            member = getattr(self.__class__, member_name)
-            if isinstance(member, property):
-                property_names.append(member_name)
-        return property_names
+        cls = self.__class__
+        return {key: value for key, value in self.__dict__.items()
+                if not hasattr(cls, key) or getattr(cls, key) != value}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+    def __setattr__(self, name: str, value: Any):
+        self.__dict__[name] = value
+        #  Names changed， Recompute the normalized names next time
+        if name in ("title", "original_title", "names"):
+            self.__dict__.pop("_normalized_titles", None)
+            self.__dict__.pop("_normalized_names", None)
 
     def from_dict(self, data: dict):
         """
         Initialize from dictionary
         """
-        properties = self.__get_properties()
+        properties = _get_properties(self.__class__)
         for key, value in data.items():
             if key in properties:
                 continue
@@ -485,6 +530,27 @@ class MediaInfo:
             if not hasattr(self, key):
                 setattr(self, key, value)
 
+    @property
+    def normalized_titles(self) -> Set[str]:
+        """
+        Normalized title and original language title， Computed once for matching
+        """
+        if "_normalized_titles" not in self.__dict__:
+            self.__dict__["_normalized_titles"] = {
+                StringUtils.clear_upper(self.title),
+                StringUtils.clear_upper(self.original_title)
+            }
+        return self.__dict__["_normalized_titles"]
+
+    @property
+    def normalized_names(self) -> Set[str]:
+        """
+        Normalized aliases and translations， Computed once for matching
+        """
+        if "_normalized_names" not in self.__dict__:
+            self.__dict__["_normalized_names"] = {StringUtils.clear_upper(name) for name in self.names or []}
+        return self.__dict__["_normalized_names"]
+
     @property
     def title_year(self):
         if self.title:
@@ -585,7 +651,7 @@ class MediaInfo:
         self.next_episode_to_air = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """
     Context object (computing)
@@ -598,6 +664,15 @@ class Context:
     #  Seed information
     torrent_info: TorrentInfo = None
 
+    def __getstate__(self) -> tuple:
+        return self.meta_info, self.media_info, self.torrent_info
+
+    def __setstate__(self, state: Any):
+        #  Caches written before slots pickled the attribute dictionary
+        if isinstance(state, dict):
+            state = (state.get("meta_info"), state.get("media_info"), state.get("torrent_info"))
+        self.meta_info, self.media_info, self.torrent_info = state
+
     def to_dict(self):
         """
         Convert to dictionary
@@ -1,5 +1,6 @@
 from queue import Queue, Empty
 
+from app.helper.sharedstate import SharedState
 from app.log import logger
 from app.utils.singleton import Singleton
 from app.schemas.types import EventType
@@ -7,8 +8,10 @@ from app.schemas.types import EventType
 
 class EventManager(metaclass=Singleton):
     """
-    Event manager
+    Event manager， Events sent in other worker processes are forwarded to the process consuming them
     """
+    #  Role of the event consuming process， The same as the scheduler since plugins handle events in the process running them
+    role = "scheduler"
 
     #  Event queue
     _eventQueue: Queue = None
@@ -20,6 +23,18 @@ class EventManager(metaclass=Singleton):
         self._eventQueue = Queue()
         #  Event response function dictionary
         self._handlers = {}
+        #  Shared state of the worker processes
+        self._state = SharedState()
+        self._state.listen("event", self.__receive, role=self.role)
+
+    def __receive(self, channel: str, data: tuple):
+        """
+        Event forwarded by another worker process， Only received while leading the role
+        """
+        etype, event_data = data
+        event = Event(etype)
+        event.event_data = event_data
+        self._eventQueue.put(event)
 
     def get_event(self):
         """
@@ -67,7 +82,13 @@ class EventManager(metaclass=Singleton):
         event = Event(etype.value)
         event.event_data = data or {}
         logger.debug(f"Send event：{etype.value} - {event.event_data}")
-        self._eventQueue.put(event)
+        if self._state.is_leader(self.role):
+            self._eventQueue.put(event)
+            return
+        try:
+            self._state.publish("event", (etype.value, event.event_data))
+        except Exception as err:
+            logger.error(f" Forwarding event {etype.value}  Make a mistake：{err}")
 
     def register(self, etype: [EventType, list]):
         """
@@ -9,14 +9,23 @@ class CustomizationMatcher(metaclass=Singleton):
     """
     Recognizing custom placeholders
     """
-    customization = None
     custom_separator = None
 
     def __init__(self):
         self.systemconfig = SystemConfigOper()
-        self.customization = None
         self.custom_separator = None
 
+    @staticmethod
+    def __compile(customization):
+        """
+        Compile custom placeholders， Only when they change
+        """
+        if not customization:
+            return None
+        if isinstance(customization, str):
+            customization = customization.replace("\n", ";").replace("|", ";").strip(";").split(";")
+        return re.compile(r"%s" % "|".join([f"({item})" for item in customization]))
+
     def match(self, title=None):
         """
         :param title:  Resource title or file name
@@ -24,16 +33,10 @@ class CustomizationMatcher(metaclass=Singleton):
         """
         if not title:
             return ""
-        if not self.customization:
-            #  Custom placeholders
-            customization = self.systemconfig.get(SystemConfigKey.Customization)
-            if not customization:
-                return ""
-            if isinstance(customization, str):
-                customization = customization.replace("\n", ";").replace("|", ";").strip(";").split(";")
-            self.customization = "|".join([f"({item})" for item in customization])
-
-        customization_re = re.compile(r"%s" % self.customization)
+        #  Custom placeholders， Compiled once per change
+        customization_re = self.systemconfig.cached(SystemConfigKey.Customization, self.__compile)
+        if not customization_re:
+            return ""
         #  Handling of multiple repetitions， Reservation of order of precedence（ In order of adding custom placeholders）
         unique_customization = {}
         for item in re.findall(customization_re, title):
@@ -1,9 +1,7 @@
 import re
 import zhconv
 import anitopy
-from app.core.meta.customization import CustomizationMatcher
 from app.core.meta.metabase import MetaBase
-from app.core.meta.releasegroup import ReleaseGroupsMatcher
 from app.utils.string import StringUtils
 from app.schemas.types import MediaType
 
@@ -14,6 +12,7 @@ class MetaAnime(MetaBase):
     """
     _anime_no_words = ['CHS&CHT', 'MP4', 'GB MP4', 'WEB-DL']
     _name_nostring_re = r"S\d{2}\s*-\s*S\d{2}|S\d{2}|\s+S\d{1,2}|EP?\d{2,4}\s*-\s*EP?\d{2,4}|EP?\d{2,4}|\s+EP?\d{1,4}"
+    _name_nostring_pattern = re.compile(_name_nostring_re, re.IGNORECASE)
 
     def __init__(self, title: str, subtitle: str = None, isfile: bool = False):
         super().__init__(title, subtitle, isfile)
@@ -61,10 +60,10 @@ class MetaAnime(MetaBase):
                 if self.cn_name:
                     _, self.cn_name, _, _, _, _ = StringUtils.get_keyword(self.cn_name)
                     if self.cn_name:
-                        self.cn_name = re.sub(r'%s' % self._name_nostring_re, '', self.cn_name, flags=re.IGNORECASE).strip()
+                        self.cn_name = self._name_nostring_pattern.sub('', self.cn_name).strip()
                         self.cn_name = zhconv.convert(self.cn_name, "zh-hans")
                 if self.en_name:
-                    self.en_name = re.sub(r'%s' % self._name_nostring_re, '', self.en_name, flags=re.IGNORECASE).strip().title()
+                    self.en_name = self._name_nostring_pattern.sub('', self.en_name).strip().title()
                     self._name = StringUtils.str_title(self.en_name)
                 #  Particular year
                 year = anitopy_info.get("anime_year")
@@ -141,12 +140,9 @@ class MetaAnime(MetaBase):
                         self.resource_pix = self.resource_pix.lower()
                     if str(self.resource_pix).isdigit():
                         self.resource_pix = str(self.resource_pix) + "p"
-                #  Production team/ Subtitling team
-                self.resource_team = \
-                    ReleaseGroupsMatcher().match(title=original_title) or \
-                    anitopy_info_origin.get("release_group") or None
-                #  Custom placeholders
-                self.customization = CustomizationMatcher().match(title=original_title) or None
+                #  Production team/ Subtitling team、 Custom placeholders
+                self._parsed_team = anitopy_info_origin.get("release_group")
+                self.init_release_info(original_title)
                 #  Video encoding
                 self.video_encode = anitopy_info.get("video_term")
                 if isinstance(self.video_encode, list):
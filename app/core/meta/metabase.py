@@ -5,8 +5,11 @@ import cn2an
 import regex as re
 
 
+from app.core.meta.customization import CustomizationMatcher
+from app.core.meta.releasegroup import ReleaseGroupsMatcher
+from app.db.systemconfig_oper import SystemConfigOper
 from app.utils.string import StringUtils
-from app.schemas.types import MediaType
+from app.schemas.types import MediaType, SystemConfigKey
 
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
@@ -63,12 +66,21 @@ class MetaBase(object):
     #  Identifier information for the application
     apply_words: Optional[List[str]] = None
 
+    #  Production team recognized by the parser itself， Used when no release group matches
+    _parsed_team = None
+    #  Title and setting versions the production team was recognized with， Not recognized again while unchanged
+    _release_key = None
     #  Subheading解析
     _subtitle_flag = False
     _subtitle_season_re = r"(?<![ Altogether]\s*)[ (prefix indicating ordinal number, e.g. first, number two etc)\s]+([0-9 One, two, three, four, five, six, seven, eight, nine, ten.S\-]+)\s* Classifier for seasonal crop yield or seasons of a tv series(?!\s*[ Altogether])"
     _subtitle_season_all_re = r"[ Altogether]\s*([0-9 One, two, three, four, five, six, seven, eight, nine, ten.]+)\s* Classifier for seasonal crop yield or seasons of a tv series|([0-9 One, two, three, four, five, six, seven, eight, nine, ten.]+)\s* Classifier for seasonal crop yield or seasons of a tv series\s* Surname quan"
     _subtitle_episode_re = r"(?<![ Altogether]\s*)[ (prefix indicating ordinal number, e.g. first, number two etc)\s]+([0-9 One, two, three, four, five, six, seven, eight, nine, ten, zero.EP\-]+)\s*[ Talking period](?!\s*[ Altogether])"
     _subtitle_episode_all_re = r"([0-9 One, two, three, four, five, six, seven, eight, nine, ten, zero.]+)\s* Classifier for sections of a tv series e.g. episode\s* Surname quan|[ Altogether]\s*([0-9 One, two, three, four, five, six, seven, eight, nine, ten, zero.]+)\s*[ Talking period]"
+    _subtitle_flag_pattern = re.compile(r'[ All season episodes]', re.IGNORECASE)
+    _subtitle_season_pattern = re.compile(_subtitle_season_re, re.IGNORECASE)
+    _subtitle_season_all_pattern = re.compile(_subtitle_season_all_re, re.IGNORECASE)
+    _subtitle_episode_pattern = re.compile(_subtitle_episode_re, re.IGNORECASE)
+    _subtitle_episode_all_pattern = re.compile(_subtitle_episode_all_re, re.IGNORECASE)
 
     def __init__(self, title: str, subtitle: str = None, isfile: bool = False):
         if not title:
@@ -77,6 +89,35 @@ class MetaBase(object):
         self.subtitle = subtitle
         self.isfile = isfile
 
+    def __getstate__(self) -> dict:
+        """
+        Pickle only the attributes that differ from the class defaults
+        """
+        cls = self.__class__
+        return {key: value for key, value in self.__dict__.items()
+                if not hasattr(cls, key) or getattr(cls, key) != value}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+    def init_release_info(self, title: str):
+        """
+        Recognize the production team and custom placeholders， Depends on user settings，
+        Skipped when already recognized for the same title and settings
+        :param title:  Resource title or file name
+        """
+        systemconfig = SystemConfigOper()
+        release_key = (title,
+                       systemconfig.version(SystemConfigKey.CustomReleaseGroups),
+                       systemconfig.version(SystemConfigKey.Customization))
+        if self._release_key == release_key:
+            return
+        #  Production team/ Subtitling team
+        self.resource_team = ReleaseGroupsMatcher().match(title=title) or self._parsed_team or None
+        #  Custom placeholders
+        self.customization = CustomizationMatcher().match(title=title) or None
+        self._release_key = release_key
+
     @property
     def name(self) -> str:
         """
@@ -97,9 +138,9 @@ class MetaBase(object):
         if not title_text:
             return
         title_text = f" {title_text} "
-        if re.search(r'[ All season episodes]', title_text, re.IGNORECASE):
+        if self._subtitle_flag_pattern.search(title_text):
             #  (prefix indicating ordinal number, e.g. first, number two etc)x Classifier for seasonal crop yield or seasons of a tv series
-            season_str = re.search(r'%s' % self._subtitle_season_re, title_text, re.IGNORECASE)
+            season_str = self._subtitle_season_pattern.search(title_text)
             if season_str:
                 seasons = season_str.group(1)
                 if seasons:
@@ -130,7 +171,7 @@ class MetaBase(object):
                 self.type = MediaType.TV
                 self._subtitle_flag = True
             #  (prefix indicating ordinal number, e.g. first, number two etc)x Classifier for sections of a tv series e.g. episode
-            episode_str = re.search(r'%s' % self._subtitle_episode_re, title_text, re.IGNORECASE)
+            episode_str = self._subtitle_episode_pattern.search(title_text)
             if episode_str:
                 episodes = episode_str.group(1)
                 if episodes:
@@ -161,7 +202,7 @@ class MetaBase(object):
                 self.type = MediaType.TV
                 self._subtitle_flag = True
             # x Holistic
-            episode_all_str = re.search(r'%s' % self._subtitle_episode_all_re, title_text, re.IGNORECASE)
+            episode_all_str = self._subtitle_episode_all_pattern.search(title_text)
             if episode_all_str:
                 episode_all = episode_all_str.group(1)
                 if not episode_all:
@@ -177,7 +218,7 @@ class MetaBase(object):
                     self.type = MediaType.TV
                     self._subtitle_flag = True
             #  Surname quanx Classifier for seasonal crop yield or seasons of a tv series x Final round number (i.e. third quarter of a year)
-            season_all_str = re.search(r"%s" % self._subtitle_season_all_re, title_text, re.IGNORECASE)
+            season_all_str = self._subtitle_season_all_pattern.search(title_text)
             if season_all_str:
                 season_all = season_all_str.group(1)
                 if not season_all:
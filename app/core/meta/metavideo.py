@@ -2,9 +2,7 @@ import re
 from pathlib import Path
 
 from app.core.config import settings
-from app.core.meta.customization import CustomizationMatcher
 from app.core.meta.metabase import MetaBase
-from app.core.meta.releasegroup import ReleaseGroupsMatcher
 from app.utils.string import StringUtils
 from app.utils.tokens import Tokens
 from app.schemas.types import MediaType
@@ -49,6 +47,30 @@ class MetaVideo(MetaBase):
     _resources_pix_re2 = r"(^[248]+K)"
     _video_encode_re = r"^[HX]26[45]$|^AVC$|^HEVC$|^VC\d?$|^MPEG\d?$|^Xvid$|^DivX$|^HDR\d*$"
     _audio_encode_re = r"^DTS\d?$|^DTSHD$|^DTSHDMA$|^Atmos$|^TrueHD\d?$|^AC3$|^\dAudios?$|^DDP\d?$|^DD\d?$|^LPCM\d?$|^AAC\d?$|^FLAC\d?$|^HD\d?$|^MA\d?$"
+    #  Precompiled patterns
+    _name_no_begin_pattern = re.compile(_name_no_begin_re)
+    _year_range_pattern = re.compile(r'([\s.]+)(\d{4})-(\d{4})')
+    _size_pattern = re.compile(r'[0-9.]+\s*[MGT]i?B(?![A-Z]+)', re.IGNORECASE)
+    _date_pattern = re.compile(r'\d{4}[\s._-]\d{1,2}[\s._-]\d{1,2}')
+    _diy_pattern = re.compile(r'D[Ii]Y')
+    _diy_team_pattern = re.compile(r'-D[Ii]Y@')
+    #  Compiled on first use， Compiling fails when the pattern is not valid
+    _name_nostring_pattern = None
+    _spaces_pattern = re.compile(r'\s+')
+    _name_no_chinese_pattern = re.compile(_name_no_chinese_re, re.IGNORECASE)
+    _name_se_words_pattern = re.compile("%s" % _name_se_words, re.IGNORECASE)
+    _roman_numerals_pattern = re.compile(_roman_numerals)
+    _season_pattern = re.compile(_season_re, re.IGNORECASE)
+    _episode_pattern = re.compile(_episode_re, re.IGNORECASE)
+    _resources_type_pattern = re.compile(r"(%s)" % _resources_type_re, re.IGNORECASE)
+    _resources_pix_pattern = re.compile(_resources_pix_re, re.IGNORECASE)
+    _resources_pix_pattern2 = re.compile(_resources_pix_re2, re.IGNORECASE)
+    _season_end_pattern = re.compile(r"SEASON$", re.IGNORECASE)
+    _part_pattern = re.compile(_part_re, re.IGNORECASE)
+    _source_pattern = re.compile(r"(%s)" % _source_re, re.IGNORECASE)
+    _effect_pattern = re.compile(r"(%s)" % _effect_re, re.IGNORECASE)
+    _video_encode_pattern = re.compile(r"(%s)" % _video_encode_re, re.IGNORECASE)
+    _audio_encode_pattern = re.compile(r"(%s)" % _audio_encode_re, re.IGNORECASE)
 
     def __init__(self, title: str, subtitle: str = None, isfile: bool = False):
         super().__init__(title, subtitle, isfile)
@@ -66,13 +88,13 @@ class MetaVideo(MetaBase):
             self.type = MediaType.TV
             return
         #  Remove the first line from the name1 Classifier for individual things or people, general, catch-all classifier[] Content
-        title = re.sub(r'%s' % self._name_no_begin_re, "", title, count=1)
+        title = self._name_no_begin_pattern.sub("", title, count=1)
         #  Particle marking the following noun as a direct objectxxxx-xxxx Year for previous year， Often appearing in seasonal episodes
-        title = re.sub(r'([\s.]+)(\d{4})-(\d{4})', r'\1\2', title)
+        title = self._year_range_pattern.sub(r'\1\2', title)
         #  Remove the size.
-        title = re.sub(r'[0-9.]+\s*[MGT]i?B(?![A-Z]+)', "", title, flags=re.IGNORECASE)
+        title = self._size_pattern.sub("", title)
         #  Take out the year, month and day.
-        title = re.sub(r'\d{4}[\s._-]\d{1,2}[\s._-]\d{1,2}', "", title)
+        title = self._date_pattern.sub("", title)
         #  Broken up inseparate itemstokens
         tokens = Tokens(title)
         self.tokens = tokens
@@ -116,8 +138,8 @@ class MetaVideo(MetaBase):
             self.resource_type = self._source.strip()
         #  Extract the original diskDIY
         if self.resource_type and "BluRay" in self.resource_type:
-            if (self.subtitle and re.findall(r'D[Ii]Y', self.subtitle)) \
-                    or re.findall(r'-D[Ii]Y@', original_title):
+            if (self.subtitle and self._diy_pattern.findall(self.subtitle)) \
+                    or self._diy_team_pattern.findall(original_title):
                 self.resource_type = f"{self.resource_type} DIY"
         #  Analyzing subheadings， As long as the season and set
         self.init_subtitle(self.org_string)
@@ -129,17 +151,16 @@ class MetaVideo(MetaBase):
         #  Deal withpart
         if self.part and self.part.upper() == "PART":
             self.part = None
-        #  Production team/ Subtitling team
-        self.resource_team = ReleaseGroupsMatcher().match(title=original_title) or None
-        #  Custom placeholders
-        self.customization = CustomizationMatcher().match(title=original_title) or None
+        #  Production team/ Subtitling team、 Custom placeholders
+        self.init_release_info(original_title)
 
     def __fix_name(self, name: str):
         if not name:
             return name
-        name = re.sub(r'%s' % self._name_nostring_re, '', name,
-                      flags=re.IGNORECASE).strip()
-        name = re.sub(r'\s+', ' ', name)
+        if MetaVideo._name_nostring_pattern is None:
+            MetaVideo._name_nostring_pattern = re.compile(self._name_nostring_re, re.IGNORECASE)
+        name = self._name_nostring_pattern.sub('', name).strip()
+        name = self._spaces_pattern.sub(' ', name)
         if name.isdigit() \
                 and int(name) < 1800 \
                 and not self.year \
@@ -182,12 +203,12 @@ class MetaVideo(MetaBase):
             if not self.cn_name:
                 self.cn_name = token
             elif not self._stop_cnname_flag:
-                if not re.search("%s" % self._name_no_chinese_re, token, flags=re.IGNORECASE) \
-                        and not re.search("%s" % self._name_se_words, token, flags=re.IGNORECASE):
+                if not self._name_no_chinese_pattern.search(token) \
+                        and not self._name_se_words_pattern.search(token):
                     self.cn_name = "%s %s" % (self.cn_name, token)
                 self._stop_cnname_flag = True
         else:
-            is_roman_digit = re.search(self._roman_numerals, token)
+            is_roman_digit = self._roman_numerals_pattern.search(token)
             #  Arabic or roman numerals
             if token.isdigit() or is_roman_digit:
                 #  Not after the first season.
@@ -223,16 +244,16 @@ class MetaVideo(MetaBase):
                     #  The first number before the name， Take down
                     if not self._unknown_name_str:
                         self._unknown_name_str = token
-            elif re.search(r"%s" % self._season_re, token, re.IGNORECASE):
+            elif self._season_pattern.search(token):
                 #  Classifier for seasonal crop yield or seasons of a tv series的处理
-                if self.en_name and re.search(r"SEASON$", self.en_name, re.IGNORECASE):
+                if self.en_name and self._season_end_pattern.search(self.en_name):
                     #  If matched to the season， English names end inSeason， ClarificationSeason Belongs to the title， Should not be removed as a disruptive word subsequently
                     self.en_name += ' '
                 self._stop_name_flag = True
                 return
-            elif re.search(r"%s" % self._episode_re, token, re.IGNORECASE) \
-                    or re.search(r"(%s)" % self._resources_type_re, token, re.IGNORECASE) \
-                    or re.search(r"%s" % self._resources_pix_re, token, re.IGNORECASE):
+            elif self._episode_pattern.search(token) \
+                    or self._resources_type_pattern.search(token) \
+                    or self._resources_pix_pattern.search(token):
                 #  Classifier for sections of a tv series e.g. episode、来源、版本等不要
                 self._stop_name_flag = True
                 return
@@ -256,7 +277,7 @@ class MetaVideo(MetaBase):
                 and not self.resource_pix \
                 and not self.resource_type:
             return
-        re_res = re.search(r"%s" % self._part_re, token, re.IGNORECASE)
+        re_res = self._part_pattern.search(token)
         if re_res:
             if not self.part:
                 self.part = re_res.group(1)
@@ -284,7 +305,7 @@ class MetaVideo(MetaBase):
                 self.en_name = "%s %s" % (self.en_name.strip(), self.year)
             elif self.cn_name:
                 self.cn_name = "%s %s" % (self.cn_name, self.year)
-        elif self.en_name and re.search(r"SEASON$", self.en_name, re.IGNORECASE):
+        elif self.en_name and self._season_end_pattern.search(self.en_name):
             #  If matched to year， And the english name ends inSeason， ClarificationSeason Belongs to the title， Should not be removed as a disruptive word subsequently
             self.en_name += ' '
         self.year = token
@@ -295,7 +316,7 @@ class MetaVideo(MetaBase):
     def __init_resource_pix(self, token: str):
         if not self.name:
             return
-        re_res = re.findall(r"%s" % self._resources_pix_re, token, re.IGNORECASE)
+        re_res = self._resources_pix_pattern.findall(token)
         if re_res:
             self._last_token_type = "pix"
             self._continue_flag = False
@@ -320,7 +341,7 @@ class MetaVideo(MetaBase):
                     and self.resource_pix[-1] not in 'kpi':
                 self.resource_pix = "%sp" % self.resource_pix
         else:
-            re_res = re.search(r"%s" % self._resources_pix_re2, token, re.IGNORECASE)
+            re_res = self._resources_pix_pattern2.search(token)
             if re_res:
                 self._last_token_type = "pix"
                 self._continue_flag = False
@@ -329,7 +350,7 @@ class MetaVideo(MetaBase):
                     self.resource_pix = re_res.group(1).lower()
 
     def __init_season(self, token: str):
-        re_res = re.findall(r"%s" % self._season_re, token, re.IGNORECASE)
+        re_res = self._season_pattern.findall(token)
         if re_res:
             self._last_token_type = "season"
             self.type = MediaType.TV
@@ -378,7 +399,7 @@ class MetaVideo(MetaBase):
             self.begin_season = 1
 
     def __init_episode(self, token: str):
-        re_res = re.findall(r"%s" % self._episode_re, token, re.IGNORECASE)
+        re_res = self._episode_pattern.findall(token)
         if re_res:
             self._last_token_type = "episode"
             self._continue_flag = False
@@ -450,7 +471,7 @@ class MetaVideo(MetaBase):
     def __init_resource_type(self, token):
         if not self.name:
             return
-        source_res = re.search(r"(%s)" % self._source_re, token, re.IGNORECASE)
+        source_res = self._source_pattern.search(token)
         if source_res:
             self._last_token_type = "source"
             self._continue_flag = False
@@ -475,7 +496,7 @@ class MetaVideo(MetaBase):
             self._source = "WEB-DL"
             self._continue_flag = False
             return
-        effect_res = re.search(r"(%s)" % self._effect_re, token, re.IGNORECASE)
+        effect_res = self._effect_pattern.search(token)
         if effect_res:
             self._last_token_type = "effect"
             self._continue_flag = False
@@ -494,7 +515,7 @@ class MetaVideo(MetaBase):
                 and not self.begin_season \
                 and not self.begin_episode:
             return
-        re_res = re.search(r"(%s)" % self._video_encode_re, token, re.IGNORECASE)
+        re_res = self._video_encode_pattern.search(token)
         if re_res:
             self._continue_flag = False
             self._stop_name_flag = True
@@ -534,7 +555,7 @@ class MetaVideo(MetaBase):
                 and not self.begin_season \
                 and not self.begin_episode:
             return
-        re_res = re.search(r"(%s)" % self._audio_encode_re, token, re.IGNORECASE)
+        re_res = self._audio_encode_pattern.search(token)
         if re_res:
             self._continue_flag = False
             self._stop_name_flag = True
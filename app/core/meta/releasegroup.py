@@ -1,3 +1,5 @@
+from typing import List, Optional, Tuple
+
 import regex as re
 
 from app.db.systemconfig_oper import SystemConfigOper
@@ -74,6 +76,12 @@ class ReleaseGroupsMatcher(metaclass=Singleton):
         "anime": ['ANi', 'HYSUB', 'KTXP', 'LoliHouse', 'MCE', 'Nekomoe kissaten', '(?:Lilith|NC)-Raws', ' Weaving dreams subtitle group']
     }
 
+    #  Characters allowed before and after a release group
+    _prefix_chars = "-@[￡【&"
+    _suffix_chars = "@.][】&"
+    #  Maximum number of names a group pattern may expand to
+    _max_expansions = 256
+
     def __init__(self):
         self.systemconfig = SystemConfigOper()
         release_groups = []
@@ -82,27 +90,138 @@ class ReleaseGroupsMatcher(metaclass=Singleton):
                 release_groups.append(release_group)
         self.__release_groups = '|'.join(release_groups)
 
-    def match(self, title: str = None, groups: str = None):
+    @classmethod
+    def __expand(cls, pattern: str) -> Optional[List[str]]:
+        """
+        Expand a group pattern made of literals and (?:a|b) groups into all names in regex alternation order，
+        Returns None for other regex syntax
+        """
+        pos = 0
+        length = len(pattern)
+
+        def parse_alternation() -> List[str]:
+            nonlocal pos
+            names = parse_sequence()
+            while pos < length and pattern[pos] == "|":
+                pos += 1
+                names = names + parse_sequence()
+            return names
+
+        def parse_sequence() -> List[str]:
+            nonlocal pos
+            names = [""]
+            while pos < length and pattern[pos] not in "|)":
+                char = pattern[pos]
+                if char == "(":
+                    pos += 1
+                    if pattern.startswith("?:", pos):
+                        pos += 2
+                    elif pos < length and pattern[pos] == "?":
+                        raise ValueError(pattern)
+                    items = parse_alternation()
+                    if pos >= length or pattern[pos] != ")":
+                        raise ValueError(pattern)
+                    pos += 1
+                elif char == "\\":
+                    if pos + 1 >= length or pattern[pos + 1].isalnum():
+                        raise ValueError(pattern)
+                    items = [pattern[pos + 1]]
+                    pos += 2
+                elif char in ".[]*+?{}^$":
+                    raise ValueError(pattern)
+                else:
+                    items = [char]
+                    pos += 1
+                if pos < length and pattern[pos] in "*+?{":
+                    raise ValueError(pattern)
+                names = [name + item for name in names for item in items]
+                if len(names) > cls._max_expansions:
+                    raise ValueError(pattern)
+            return names
+
+        try:
+            names = parse_alternation()
+            if pos != length:
+                return None
+        except ValueError:
+            return None
+        return [name for name in names if name]
+
+    def __build_index(self, custom_groups: Optional[List[str]]) -> Tuple[dict, Optional[re.Pattern]]:
+        """
+        Build the index of built-in and custom groups， Only when custom groups change
+        :return:  Index of group names： Trie of lowercase characters， "" Key stores ( Priority,  Site)，
+                  Regex of the custom groups that cannot be expanded into names
+        """
+        trie = {}
+        fallback_groups = []
+        priority = 0
+        groups = [(site, group) for site, site_groups in self.RELEASE_GROUPS.items() for group in site_groups]
+        groups += [("custom", group) for group in custom_groups or [] if group]
+        for site, group in groups:
+            names = self.__expand(group)
+            if names is None:
+                fallback_groups.append(group)
+                continue
+            for name in names:
+                node = trie
+                for char in name:
+                    node = node.setdefault(char.lower(), {})
+                if "" not in node:
+                    node[""] = (priority, site)
+                priority += 1
+        fallback_re = re.compile(r"(?:%s)(?=[@.\s\]\[】&])" % "|".join(fallback_groups),
+                                 re.I) if fallback_groups else None
+        return trie, fallback_re
+
+    def match(self, title: str = None, groups: str = None, sites: List[str] = None):
         """
         :param title:  Resource title or file name
         :param groups:  Production team/ Subtitling team
+        :param sites:  Only match groups of these sites and custom groups
         :return:  Matching results
         """
         if not title:
             return ""
-        if not groups:
-            #  Custom groups
-            custom_release_groups = self.systemconfig.get(SystemConfigKey.CustomReleaseGroups)
-            if custom_release_groups:
-                custom_release_groups_str = '|'.join(custom_release_groups)
-                groups = f"{self.__release_groups}|{custom_release_groups_str}"
-            else:
-                groups = self.__release_groups
         title = f"{title} "
-        groups_re = re.compile(r"(?<=[-@\[￡【&])(?:%s)(?=[@.\s\]\[】&])" % groups, re.I)
+        if groups:
+            groups_re = re.compile(r"(?<=[-@\[￡【&])(?:%s)(?=[@.\s\]\[】&])" % groups, re.I)
+            unique_groups = []
+            for item in re.findall(groups_re, title):
+                if item not in unique_groups:
+                    unique_groups.append(item)
+            return "@".join(unique_groups)
+        #  Index rebuilt only when custom groups change
+        trie, fallback_re = self.systemconfig.cached(SystemConfigKey.CustomReleaseGroups, self.__build_index)
         #  Dealing with a production group identifying multiple times， Order of reservations
         unique_groups = []
-        for item in re.findall(groups_re, title):
+        pos, length = 1, len(title)
+        while pos < length:
+            if title[pos - 1] not in self._prefix_chars:
+                pos += 1
+                continue
+            #  Candidate with the highest priority starting here， Same as regex alternation order
+            best = None
+            node = trie
+            for end in range(pos, length):
+                node = node.get(title[end].lower())
+                if node is None:
+                    break
+                value = node.get("")
+                if value and (not sites or value[1] in sites or value[1] == "custom"):
+                    suffix = title[end + 1] if end + 1 < length else ""
+                    if (suffix.isspace() or suffix in self._suffix_chars) and suffix \
+                            and (not best or value[0] < best[0]):
+                        best = (value[0], end + 1)
+            if not best and fallback_re:
+                fallback = fallback_re.match(title, pos)
+                if fallback:
+                    best = (None, fallback.end())
+            if not best:
+                pos += 1
+                continue
+            item = title[pos:best[1]]
             if item not in unique_groups:
                 unique_groups.append(item)
+            pos = best[1]
         return "@".join(unique_groups)
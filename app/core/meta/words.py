@@ -14,50 +14,65 @@ class WordsMatcher(metaclass=Singleton):
     def __init__(self):
         self.systemconfig = SystemConfigOper()
 
-    def prepare(self, title: str) -> Tuple[str, List[str]]:
+    @staticmethod
+    def __parse(words: List[str]) -> List[tuple]:
         """
-        Preprocessing headings， Three formats are supported
-        1： Blocked word
-        2： Superseded word =>  Alternative word
-        3： Prepositioning words <>  Post locator >>  Offset（EP）
+        Parse customized identifiers into rules， Only when the identifiers change
+        :return: [( Word,  Type,  Arguments)]
         """
-        appley_words = []
-        #  Read customized identifiers
-        words: List[str] = self.systemconfig.get(SystemConfigKey.CustomIdentifiers) or []
-        for word in words:
+        rules = []
+        for word in words or []:
             if not word:
                 continue
             try:
                 if word.count(" => ") and word.count(" && ") and word.count(" >> ") and word.count(" <> "):
-                    #  Alternative word
-                    thc = str(re.findall(r'(.*?)\s*=>', word)[0]).strip()
-                    #  Superseded word
-                    bthc = str(re.findall(r'=>\s*(.*?)\s*&&', word)[0]).strip()
-                    #  Set pre-offset field
-                    pyq = str(re.findall(r'&&\s*(.*?)\s*<>', word)[0]).strip()
-                    #  Set post-offset fields
-                    pyh = str(re.findall(r'<>(.*?)\s*>>', word)[0]).strip()
-                    #  Set offset
-                    offsets = str(re.findall(r'>>\s*(.*?)$', word)[0]).strip()
-                    #  Alternative word
-                    title, message, state = self.__replace_regex(title, thc, bthc)
-                    if state:
-                        #  Alternative word成功再进行集偏移
-                        title, message, state = self.__episode_offset(title, pyq, pyh, offsets)
+                    #  Alternative word,  Superseded word,  Pre-offset field,  Post-offset field,  Offset
+                    rules.append((word, "replace_offset", (
+                        str(re.findall(r'(.*?)\s*=>', word)[0]).strip(),
+                        str(re.findall(r'=>\s*(.*?)\s*&&', word)[0]).strip(),
+                        str(re.findall(r'&&\s*(.*?)\s*<>', word)[0]).strip(),
+                        str(re.findall(r'<>(.*?)\s*>>', word)[0]).strip(),
+                        str(re.findall(r'>>\s*(.*?)$', word)[0]).strip()
+                    )))
                 elif word.count(" => "):
                     #  Alternative word
                     strings = word.split(" => ")
-                    title, message, state = self.__replace_regex(title, strings[0], strings[1])
+                    rules.append((word, "replace", (strings[0], strings[1])))
                 elif word.count(" >> ") and word.count(" <> "):
                     #  Set offset
                     strings = word.split(" <> ")
                     offsets = strings[1].split(" >> ")
-                    strings[1] = offsets[0]
-                    title, message, state = self.__episode_offset(title, strings[0], strings[1],
-                                                                  offsets[1])
+                    rules.append((word, "offset", (strings[0], offsets[0], offsets[1])))
                 else:
                     #  Blocked word
-                    title, message, state = self.__replace_regex(title, word, "")
+                    rules.append((word, "replace", (word, "")))
+            except Exception as err:
+                logger.warn(f" Invalid customized identifier {word}：{err}")
+        return rules
+
+    def prepare(self, title: str) -> Tuple[str, List[str]]:
+        """
+        Preprocessing headings， Three formats are supported
+        1： Blocked word
+        2： Superseded word =>  Alternative word
+        3： Prepositioning words <>  Post locator >>  Offset（EP）
+        """
+        appley_words = []
+        #  Customized identifiers， Parsed once per change
+        rules = self.systemconfig.cached(SystemConfigKey.CustomIdentifiers, self.__parse)
+        for word, rule_type, args in rules:
+            try:
+                if rule_type == "replace_offset":
+                    thc, bthc, pyq, pyh, offsets = args
+                    #  Alternative word
+                    title, message, state = self.__replace_regex(title, thc, bthc)
+                    if state:
+                        #  Alternative word成功再进行集偏移
+                        title, message, state = self.__episode_offset(title, pyq, pyh, offsets)
+                elif rule_type == "replace":
+                    title, message, state = self.__replace_regex(title, *args)
+                else:
+                    title, message, state = self.__episode_offset(title, *args)
 
                 if state:
                     appley_words.append(word)
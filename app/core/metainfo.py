@@ -1,3 +1,5 @@
+import copy
+from functools import lru_cache
 from pathlib import Path
 
 import regex as re
@@ -23,8 +25,11 @@ def MetaInfo(title: str, subtitle: str = None) -> MetaBase:
         isfile = True
     else:
         isfile = False
-    #  Recognize
-    meta = MetaAnime(title, subtitle, isfile) if is_anime(title) else MetaVideo(title, subtitle, isfile)
+    #  Recognize， The same title and subtitle are only parsed once
+    meta = copy.deepcopy(_parse_meta(title, subtitle, isfile))
+    #  Production team and custom placeholders depend on user settings， Recognized again when they changed
+    if title:
+        meta.init_release_info(title)
     #  Original title of record
     meta.title = org_title
     #   Record the identifiers used
@@ -33,6 +38,14 @@ def MetaInfo(title: str, subtitle: str = None) -> MetaBase:
     return meta
 
 
+@lru_cache(maxsize=4096)
+def _parse_meta(title: str, subtitle: str = None, isfile: bool = False) -> MetaBase:
+    """
+    Parse the preprocessed title， The result is shared and must be copied before modification
+    """
+    return MetaAnime(title, subtitle, isfile) if is_anime(title) else MetaVideo(title, subtitle, isfile)
+
+
 def MetaInfoPath(path: Path) -> MetaBase:
     """
     Recognize metadata based on paths
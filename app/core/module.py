@@ -1,4 +1,6 @@
-from typing import Generator, Optional
+import inspect
+import threading
+from typing import Generator, Optional, Dict, List, Any, Tuple
 
 from app.core.config import settings
 from app.helper.module import ModuleHelper
@@ -16,8 +18,14 @@ class ModuleManager(metaclass=Singleton):
     _modules: dict = {}
     #  List of runtime modules
     _running_modules: dict = {}
+    #  Method dispatch table： Method name -> [( Module instance,  Bound method,  Parameter types)]
+    _dispatch: Dict[str, List[Tuple[Any, Any, Optional[tuple]]]] = {}
+    #  Method call statistics： Method name -> { Number of calls,  Total time}
+    _method_stats: Dict[str, Dict[str, float]] = {}
 
     def __init__(self):
+        self._dispatch_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
         self.load_modules()
 
     def load_modules(self):
@@ -31,6 +39,7 @@ class ModuleManager(metaclass=Singleton):
         )
         self._running_modules = {}
         self._modules = {}
+        self._dispatch = {}
         for module in modules:
             module_id = module.__name__
             self._modules[module_id] = module
@@ -42,6 +51,8 @@ class ModuleManager(metaclass=Singleton):
                 _module.init_module()
                 self._running_modules[module_id] = _module
                 logger.info(f"Moudle Loaded：{module_id}")
+        #  Rebuild the dispatch table
+        self.build_dispatch()
 
     def stop(self):
         """
@@ -65,13 +76,76 @@ class ModuleManager(metaclass=Singleton):
             return True
         return False
 
+    def build_dispatch(self):
+        """
+        Build the method dispatch table of all running modules， Rebuilt after modules are reloaded
+        """
+        dispatch: Dict[str, List[Tuple[Any, Any, Optional[tuple]]]] = {}
+        for _, module in self._running_modules.items():
+            for method in dir(module):
+                if method.startswith("_"):
+                    continue
+                try:
+                    func = getattr(module, method)
+                except Exception as err:
+                    logger.debug(f" Module {module.__class__.__name__}  Attribute {method}  Unreadable：{err}")
+                    continue
+                #  Static methods are plain functions
+                if not (inspect.ismethod(func) or inspect.isfunction(func)) \
+                        or not ObjectUtils.check_method(func):
+                    continue
+                dispatch.setdefault(method, []).append((module, func, self.__signature_types(func)))
+        with self._dispatch_lock:
+            self._dispatch = dispatch
+
+    @staticmethod
+    def __signature_types(func: Any) -> Optional[tuple]:
+        """
+        Parameter types of a method， Used to determine whether the result of the previous module can be passed in
+        """
+        try:
+            parameters = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            return None
+        types = tuple(param.annotation for param in parameters)
+        if any(not isinstance(t, type) for t in types):
+            return None
+        return types
+
+    def get_handlers(self, method: str) -> List[Tuple[Any, Any, Optional[tuple]]]:
+        """
+        Get the implementations of a method from the dispatch table， In order of module loading
+        :return: [( Module instance,  Bound method,  Parameter types)]
+        """
+        return self._dispatch.get(method) or []
+
     def get_modules(self, method: str) -> Generator:
         """
         Get a list of modules that implement the same method
         """
-        if not self._running_modules:
-            return []
-        for _, module in self._running_modules.items():
-            if hasattr(module, method) \
-                    and ObjectUtils.check_method(getattr(module, method)):
-                yield module
+        for module, _, _ in self.get_handlers(method):
+            yield module
+
+    def record_call(self, method: str, elapsed: float):
+        """
+        Record a method call
+        :param method:  Method name
+        :param elapsed:  Time， Unit seconds
+        """
+        with self._stats_lock:
+            stats = self._method_stats.setdefault(method, {"count": 0, "elapsed": 0.0})
+            stats["count"] += 1
+            stats["elapsed"] += elapsed
+
+    def get_method_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get method call statistics， Including number of calls、 Total and average time in milliseconds
+        """
+        with self._stats_lock:
+            return {
+                method: {
+                    "count": int(stats["count"]),
+                    "total_ms": round(stats["elapsed"] * 1000, 2),
+                    "avg_ms": round(stats["elapsed"] * 1000 / stats["count"], 2) if stats["count"] else 0
+                } for method, stats in self._method_stats.items()
+            }
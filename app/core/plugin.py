@@ -1,8 +1,18 @@
+import importlib
+import threading
+import time
 import traceback
-from typing import List, Any, Dict, Tuple
+import uuid
+from functools import wraps
+from typing import List, Any, Dict, Tuple, Optional, Callable
 
+import psutil
+
+from app import schemas
 from app.db.systemconfig_oper import SystemConfigOper
 from app.helper.module import ModuleHelper
+from app.helper.response import ResponseCache
+from app.helper.sharedstate import SharedState
 from app.helper.sites import SitesHelper
 from app.log import logger
 from app.schemas.types import SystemConfigKey
@@ -12,12 +22,24 @@ from app.utils.singleton import Singleton
 
 class PluginManager(metaclass=Singleton):
     """
-    Plug-in manager
+    Plug-in manager， Plugins are loaded in every worker process，
+    Their services， Such as timers and directory monitors， Only run in the process leading the role
     """
+    #  Role of the process running plugin services， The same as the scheduler
+    role = "scheduler"
+    #  Waiting time of plugin calls forwarded to that process， Unit seconds
+    _call_timeout = 60
+
     systemconfig: SystemConfigOper = None
+    #  Whether plugin services run in this process
+    _serving: bool = False
 
-    #  Plugin list
+    #  Plugin metadata， Read from source without importing
+    _manifests: Dict[str, dict] = {}
+    #  Imported plugin classes
     _plugins: dict = {}
+    #  Plugin import cost
+    _import_costs: Dict[str, dict] = {}
     #  List of runtime state plug-ins
     _running_plugins: dict = {}
     #  ConfigureKey
@@ -25,9 +47,20 @@ class PluginManager(metaclass=Singleton):
 
     def __init__(self):
         self.siteshelper = SitesHelper()
-        self.init_config()
+        self._state = SharedState()
+        self.__load()
+        #  Plugin changes and calls from the other worker processes
+        self._state.listen("plugin", self.__receive)
+        self._state.elect(self.role, self.__start_services, self.__stop_services)
 
     def init_config(self):
+        """
+        Reload all plugins， Also in the other worker processes
+        """
+        self.__load()
+        self._state.publish("plugin", ("reload", None, None))
+
+    def __load(self):
         #  Configuration management
         self.systemconfig = SystemConfigOper()
         #  Stop existing plug-ins
@@ -35,39 +68,165 @@ class PluginManager(metaclass=Singleton):
         #  Startup plugin
         self.start()
 
+    def __start_services(self):
+        """
+        Start the services of all plugins after this process is elected
+        """
+        self._serving = True
+        for plugin_id, plugin_obj in list(self._running_plugins.items()):
+            self.__init_plugin(plugin_id, plugin_obj)
+
+    def __stop_services(self):
+        """
+        Stop the services of all plugins after another process is elected
+        """
+        self._serving = False
+        for plugin_obj in list(self._running_plugins.values()):
+            if hasattr(plugin_obj, "stop_service"):
+                plugin_obj.stop_service()
+
+    def __init_plugin(self, plugin_id: str, plugin_obj: Any, conf: dict = None):
+        """
+        Effective plugin configuration， Starting its services
+        """
+        try:
+            plugin_obj.init_plugin(conf if conf is not None else self.get_plugin_config(plugin_id))
+        except Exception as err:
+            logger.error(f" Starting plug-ins {plugin_id}  Make a mistake：{err} - {traceback.format_exc()}")
+
+    def __receive(self, channel: str, data: tuple):
+        """
+        Plugin changes and calls from the other worker processes
+        """
+        action, plugin_id, args = data
+        if action == "reload":
+            self.__load()
+        elif action == "config":
+            if self._serving and self._running_plugins.get(plugin_id):
+                self.__init_plugin(plugin_id, self._running_plugins[plugin_id], args)
+        elif action == "call" and self._serving:
+            #  Plugin calls may take long， Not run in the polling thread
+            threading.Thread(target=self.__answer, args=(plugin_id, *args), daemon=True).start()
+
+    def __answer(self, plugin_id: str, call_id: str, path: str, args: tuple, kwargs: dict):
+        """
+        Run a plugin call forwarded by another worker process and save the result for it
+        """
+        try:
+            result = self.__call_api(plugin_id, path, *args, **kwargs)
+        except Exception as err:
+            logger.error(f" Plugin call {plugin_id}{path}  Make a mistake：{err} - {traceback.format_exc()}")
+            result = schemas.Response(success=False, message=str(err))
+        self._state.set(f"plugin.result.{call_id}", (result,), ttl=self._call_timeout)
+
+    def __call_api(self, plugin_id: str, path: str, *args, **kwargs) -> Any:
+        """
+        Run a plugin API endpoint of this process， Found by its path since endpoints need not be plugin methods
+        """
+        plugin_obj = self._running_plugins.get(plugin_id)
+        if not plugin_obj or not hasattr(plugin_obj, "get_api"):
+            return None
+        for api in plugin_obj.get_api() or []:
+            if api.get("path") == path:
+                return api["endpoint"](*args, **kwargs)
+        return None
+
+    def __forward(self, plugin_id: str, path: str, *args, **kwargs) -> Any:
+        """
+        Run a plugin call in the process running plugin services and wait for the result
+        """
+        call_id = uuid.uuid4().hex
+        self._state.publish("plugin", ("call", plugin_id, (call_id, path, args, kwargs)))
+        deadline = time.time() + self._call_timeout
+        while time.time() < deadline:
+            result = self._state.get(f"plugin.result.{call_id}")
+            if result is not None:
+                self._state.delete(f"plugin.result.{call_id}")
+                return result[0]
+            time.sleep(0.2)
+        return schemas.Response(success=False, message=f" Plugin call {plugin_id}{path}  Timed out")
+
+    def __endpoint(self, plugin_id: str, path: str, endpoint: Callable) -> Callable:
+        """
+        Plugin API endpoint， Forwarded when plugin services do not run in this process
+        :param plugin_id:  PluginsID
+        :param path:  API path within the plugin， Identifies the endpoint in every process
+        :param endpoint:  Endpoint function
+        """
+
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            if self._serving:
+                return self.__call_api(plugin_id, path, *args, **kwargs)
+            return self.__forward(plugin_id, path, *args, **kwargs)
+
+        return wrapper
+
     def start(self):
         """
         Start loading plug-ins
         """
 
-        #  Scanning plugin catalog
-        plugins = ModuleHelper.load(
-            "app.plugins",
-            filter_func=lambda _, obj: hasattr(obj, 'init_plugin')
-        )
+        #  Scanning plugin catalog， Only read metadata
+        manifests = ModuleHelper.load_manifests("app.plugins", base_name="_PluginBase")
         #  Installed plug-ins
         installed_plugins = self.systemconfig.get(SystemConfigKey.UserInstalledPlugins) or []
         #  Arrange in order
-        plugins.sort(key=lambda x: x.plugin_order if hasattr(x, "plugin_order") else 0)
+        manifests.sort(key=lambda x: x.get("attrs", {}).get("plugin_order") or 0)
         self._running_plugins = {}
         self._plugins = {}
-        for plugin in plugins:
-            plugin_id = plugin.__name__
+        self._manifests = {}
+        for manifest in manifests:
+            plugin_id = manifest.get("name")
             try:
-                #  StockpileClass
-                self._plugins[plugin_id] = plugin
-                #  Uninstalled not loaded
+                self._manifests[plugin_id] = manifest
+                #  Uninstalled not imported
                 if plugin_id not in installed_plugins:
                     continue
+                #  Import plugin code
+                plugin = self.__import_plugin(manifest)
+                if not plugin:
+                    continue
+                self._plugins[plugin_id] = plugin
                 #  Generating examples
                 plugin_obj = plugin()
-                #  Effective plugin configuration
-                plugin_obj.init_plugin(self.get_plugin_config(plugin_id))
                 #  Storing running instances
                 self._running_plugins[plugin_id] = plugin_obj
+                #  Effective plugin configuration， Only where plugin services run
+                if self._serving:
+                    self.__init_plugin(plugin_id, plugin_obj)
                 logger.info(f"Plugin Loaded：{plugin_id}")
             except Exception as err:
                 logger.error(f" Loading plug-ins {plugin_id}  Make a mistake：{err} - {traceback.format_exc()}")
+        #  Plugin list changed
+        ResponseCache().invalidate("plugin")
+
+    def __import_plugin(self, manifest: dict) -> Optional[Any]:
+        """
+        Import plug-in class， And record import time and memory
+        """
+        plugin_id = manifest.get("name")
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        start_time = time.perf_counter()
+        module = importlib.import_module(manifest.get("module"))
+        plugin = getattr(module, plugin_id, None)
+        self._import_costs[plugin_id] = {
+            "time_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "rss_kb": max(process.memory_info().rss - rss, 0) // 1024
+        }
+        logger.info(f" Import plugin {plugin_id}  Time {self._import_costs[plugin_id]['time_ms']}ms，"
+                     f" Memory {self._import_costs[plugin_id]['rss_kb']}KB")
+        if not plugin or not hasattr(plugin, "init_plugin"):
+            logger.error(f" Plug-in (software component) {plugin_id}  Not found in {manifest.get('module')}")
+            return None
+        return plugin
+
+    def get_import_costs(self) -> Dict[str, dict]:
+        """
+        Get the import time and memory of each plugin， Only plugins imported in this process
+        """
+        return self._import_costs
 
     def reload_plugin(self, plugin_id: str, conf: dict):
         """
@@ -75,7 +234,10 @@ class PluginManager(metaclass=Singleton):
         """
         if not self._running_plugins.get(plugin_id):
             return
-        self._running_plugins[plugin_id].init_plugin(conf)
+        if self._serving:
+            self._running_plugins[plugin_id].init_plugin(conf)
+        ResponseCache().invalidate("plugin")
+        self._state.publish("plugin", ("config", plugin_id, conf))
 
     def stop(self):
         """
@@ -91,13 +253,14 @@ class PluginManager(metaclass=Singleton):
                 plugin.stop_service()
         #  Empty the image
         self._plugins = {}
+        self._manifests = {}
         self._running_plugins = {}
 
     def get_plugin_config(self, pid: str) -> dict:
         """
         Getting plugin configuration
         """
-        if not self._plugins.get(pid):
+        if not self._manifests.get(pid):
             return {}
         return self.systemconfig.get(self._config_key % pid) or {}
 
@@ -105,7 +268,7 @@ class PluginManager(metaclass=Singleton):
         """
         Save plugin configuration
         """
-        if not self._plugins.get(pid):
+        if not self._manifests.get(pid):
             return False
         return self.systemconfig.set(self._config_key % pid, conf)
 
@@ -163,6 +326,7 @@ class PluginManager(metaclass=Singleton):
                     and ObjectUtils.check_method(plugin.get_api):
                 apis = plugin.get_api() or []
                 for api in apis:
+                    api["endpoint"] = self.__endpoint(pid, api["path"], api["endpoint"])
                     api["path"] = f"/{pid}{api['path']}"
                 ret_apis.extend(apis)
         return ret_apis
@@ -185,7 +349,9 @@ class PluginManager(metaclass=Singleton):
         all_confs = []
         #  Installed plug-ins
         installed_apps = self.systemconfig.get(SystemConfigKey.UserInstalledPlugins) or []
-        for pid, plugin in self._plugins.items():
+        for pid, manifest in self._manifests.items():
+            #  Plugin attributes from metadata
+            plugin = manifest.get("attrs") or {}
             #  Runner plug-in
             plugin_obj = self._running_plugins.get(pid)
             #  Basic property
@@ -198,41 +364,24 @@ class PluginManager(metaclass=Singleton):
             else:
                 conf.update({"installed": False})
             #  Operational state
-            if plugin_obj and hasattr(plugin, "get_state"):
+            if plugin_obj and self._serving and hasattr(plugin_obj, "get_state"):
                 conf.update({"state": plugin_obj.get_state()})
+            elif plugin_obj:
+                #  Services run in another process， Judged by the configuration
+                conf.update({"state": bool(self.get_plugin_config(pid).get("enabled"))})
             else:
                 conf.update({"state": False})
             #  Availability of detail pages
-            if hasattr(plugin, "get_page"):
-                if ObjectUtils.check_method(plugin.get_page):
-                    conf.update({"has_page": True})
-                else:
-                    conf.update({"has_page": False})
+            conf.update({"has_page": bool((manifest.get("methods") or {}).get("get_page"))})
             #  Scope of one's jurisdiction
-            if hasattr(plugin, "auth_level"):
-                if self.siteshelper.auth_level < plugin.auth_level:
+            if "auth_level" in plugin:
+                if self.siteshelper.auth_level < plugin.get("auth_level"):
                     continue
-            #  Name (of a thing)
-            if hasattr(plugin, "plugin_name"):
-                conf.update({"plugin_name": plugin.plugin_name})
-            #  Descriptive
-            if hasattr(plugin, "plugin_desc"):
-                conf.update({"plugin_desc": plugin.plugin_desc})
-            #  Releases
-            if hasattr(plugin, "plugin_version"):
-                conf.update({"plugin_version": plugin.plugin_version})
-            #  Icon (computing)
-            if hasattr(plugin, "plugin_icon"):
-                conf.update({"plugin_icon": plugin.plugin_icon})
-            #  Theme color
-            if hasattr(plugin, "plugin_color"):
-                conf.update({"plugin_color": plugin.plugin_color})
-            #  Author
-            if hasattr(plugin, "plugin_author"):
-                conf.update({"plugin_author": plugin.plugin_author})
-            #  Author链接
-            if hasattr(plugin, "author_url"):
-                conf.update({"author_url": plugin.author_url})
+            #  Name (of a thing)、 Descriptive、 Releases、 Icon (computing)、 Theme color、 Author、 Author链接
+            for attr in ["plugin_name", "plugin_desc", "plugin_version", "plugin_icon",
+                         "plugin_color", "plugin_author", "author_url"]:
+                if attr in plugin:
+                    conf.update({attr: plugin.get(attr)})
             #  Aggregate
             all_confs.append(conf)
         return all_confs
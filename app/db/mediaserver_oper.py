@@ -1,20 +1,181 @@
 import json
-from typing import Optional
+import threading
+import time
+from typing import Optional, Dict, Tuple, List
 
 from sqlalchemy.orm import Session
 
 from app.db import DbOper
 from app.db.models.mediaserver import MediaServerItem
+from app.helper.sharedstate import SharedState
+from app.schemas import ExistMediaInfo
+from app.schemas.types import MediaType
+from app.utils.singleton import Singleton
+
+
+class MediaServerIndex(metaclass=Singleton):
+    """
+    Memory index of media library items，tmdbid/imdbid/tvdbid -> Server、ItemID、 Seasons and episodes，
+    Loaded from the synchronized data on first use， Then maintained incrementally by MediaServerOper，
+    Reloaded in every worker process when a synchronization finishes
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # ( Typology,  Sourcing,  Media, esp. news mediaID) -> ExistMediaInfo
+        self._items: Dict[Tuple[str, str, str], ExistMediaInfo] = {}
+        #  Key -> Expiry time， Only for results of live media server queries
+        self._expires: Dict[Tuple[str, str, str], float] = {}
+        #  Changes made by the other worker processes
+        self._state = SharedState()
+        self._state.listen("mediaserver", self.__receive)
+
+    def load(self, db: Session):
+        """
+        Load all synchronized items from the database
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for server, item_id, item_type, tmdbid, imdbid, tvdbid, seasoninfo in MediaServerItem.list_exists_info(db):
+                self.add(server=server, item_id=item_id, item_type=item_type,
+                         tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid, seasoninfo=seasoninfo)
+            self._loaded = True
+
+    def reload(self):
+        """
+        Reload from the database on next use， Also in the other worker processes
+        """
+        self.__reset()
+        self._state.publish("mediaserver", ("reload", None))
+
+    def __receive(self, channel: str, data: tuple):
+        action, kwargs = data
+        if action == "reload":
+            self.__reset()
+        elif action == "remove":
+            self.__remove(**kwargs)
+
+    def __reset(self):
+        with self._lock:
+            self._items = {}
+            self._expires = {}
+            self._loaded = False
+
+    @staticmethod
+    def __keys(mtype: str, tmdbid: int = None, imdbid: str = None,
+               tvdbid: str = None) -> List[Tuple[str, str, str]]:
+        """
+        Index keys of a media item
+        """
+        keys = []
+        if tmdbid:
+            keys.append((mtype, "tmdb", str(tmdbid)))
+        if imdbid:
+            keys.append((mtype, "imdb", str(imdbid)))
+        if tvdbid:
+            keys.append((mtype, "tvdb", str(tvdbid)))
+        return keys
+
+    def get(self, mtype: str, tmdbid: int = None, imdbid: str = None,
+            tvdbid: str = None) -> Optional[ExistMediaInfo]:
+        for key in self.__keys(mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid):
+            info = self._items.get(key)
+            if not info:
+                continue
+            expire = self._expires.get(key)
+            if expire and expire < time.time():
+                #  The media server may have changed since the live query
+                with self._lock:
+                    if self._items.get(key) is info:
+                        self._items.pop(key, None)
+                        self._expires.pop(key, None)
+                continue
+            return info.copy(deep=True)
+        return None
+
+    def add(self, server: str, item_id: str, item_type: str, tmdbid: int = None,
+            imdbid: str = None, tvdbid: str = None, seasoninfo: Optional[str] = None):
+        keys = self.__keys(item_type, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid)
+        if not keys:
+            return
+        seasons = {}
+        if seasoninfo:
+            try:
+                seasons = {int(season): episodes for season, episodes in (json.loads(seasoninfo) or {}).items()}
+            except (ValueError, TypeError):
+                seasons = {}
+        self.put(item_type, ExistMediaInfo(
+            type=MediaType(item_type) if item_type in [MediaType.MOVIE.value, MediaType.TV.value] else None,
+            seasons=seasons,
+            server=server,
+            itemid=item_id
+        ), tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid)
+
+    def put(self, mtype: str, info: ExistMediaInfo, tmdbid: int = None,
+            imdbid: str = None, tvdbid: str = None, ttl: float = None):
+        """
+        :param ttl:  Validity period， Unit seconds， Kept until the next synchronization when empty
+        """
+        with self._lock:
+            for key in self.__keys(mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid):
+                self._items[key] = info
+                if ttl:
+                    self._expires[key] = time.time() + ttl
+                else:
+                    self._expires.pop(key, None)
+
+    def remove(self, mtype: str = None, tmdbid: int = None, imdbid: str = None, tvdbid: str = None):
+        self.__remove(mtype=mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid)
+        self._state.publish("mediaserver", ("remove", {"mtype": mtype, "tmdbid": tmdbid,
+                                                       "imdbid": imdbid, "tvdbid": tvdbid}))
+
+    def __remove(self, mtype: str = None, tmdbid: int = None, imdbid: str = None, tvdbid: str = None):
+        with self._lock:
+            mtypes = [mtype] if mtype else [MediaType.MOVIE.value, MediaType.TV.value]
+            infos = []
+            for _mtype in mtypes:
+                for key in self.__keys(_mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid):
+                    info = self._items.pop(key, None)
+                    self._expires.pop(key, None)
+                    if info:
+                        infos.append(info)
+            if not infos:
+                return
+            #  Other keys of the same item
+            for key in [key for key, info in self._items.items() if any(info is i for i in infos)]:
+                del self._items[key]
+                self._expires.pop(key, None)
+
+    def remove_server(self, server: str):
+        with self._lock:
+            for key in [key for key, info in self._items.items() if info.server == server]:
+                del self._items[key]
+                self._expires.pop(key, None)
 
 
 class MediaServerOper(DbOper):
     """
     Media server data management
     """
+    #  Validity period of live query results in the memory index， Unit seconds
+    _live_ttl = 5 * 60
 
     def __init__(self, db: Session = None):
         super().__init__(db)
 
+    @property
+    def index(self) -> MediaServerIndex:
+        """
+        Memory index of media library items
+        """
+        index = MediaServerIndex()
+        index.load(self._db)
+        return index
+
     def add(self, **kwargs) -> bool:
         """
         Add media server data
@@ -22,6 +183,10 @@ class MediaServerOper(DbOper):
         item = MediaServerItem(**kwargs)
         if not item.get_by_itemid(self._db, kwargs.get("item_id")):
             item.create(self._db)
+            self.index.add(server=kwargs.get("server"), item_id=kwargs.get("item_id"),
+                           item_type=kwargs.get("item_type"), tmdbid=kwargs.get("tmdbid"),
+                           imdbid=kwargs.get("imdbid"), tvdbid=kwargs.get("tvdbid"),
+                           seasoninfo=kwargs.get("seasoninfo"))
             return True
         return False
 
@@ -30,6 +195,13 @@ class MediaServerOper(DbOper):
         Empty media server data
         """
         MediaServerItem.empty(self._db, server)
+        self.index.remove_server(server)
+
+    def reload_index(self):
+        """
+        Reload the memory index in every worker process， After a synchronization
+        """
+        MediaServerIndex().reload()
 
     def exists(self, **kwargs) -> Optional[MediaServerItem]:
         """
@@ -63,3 +235,26 @@ class MediaServerOper(DbOper):
         if not item:
             return None
         return str(item.item_id)
+
+    def get_exists_info(self, mtype: str, tmdbid: int = None, imdbid: str = None,
+                        tvdbid: str = None) -> Optional[ExistMediaInfo]:
+        """
+        Query the existing episodes of a media from the memory index， No database query or server request
+        :param mtype:  Media type value
+        :return:  Returns if not in the indexNone
+        """
+        return self.index.get(mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid)
+
+    def cache_exists_info(self, mtype: str, info: ExistMediaInfo, tmdbid: int = None,
+                          imdbid: str = None, tvdbid: str = None):
+        """
+        Save the result of a live media server query to the memory index， Only for a short time，
+        The media server may not have scanned new files yet
+        """
+        self.index.put(mtype, info, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid, ttl=self._live_ttl)
+
+    def expire_exists_info(self, mtype: str = None, tmdbid: int = None, imdbid: str = None, tvdbid: str = None):
+        """
+        Remove a media from the memory index， The next check will query the media server
+        """
+        self.index.remove(mtype, tmdbid=tmdbid, imdbid=imdbid, tvdbid=tvdbid)
@@ -59,3 +59,13 @@ class MediaServerItem(Base):
         return db.query(MediaServerItem).filter(MediaServerItem.title == title,
                                                 MediaServerItem.item_type == mtype,
                                                 MediaServerItem.year == str(year)).first()
+
+    @staticmethod
+    def list_exists_info(db: Session):
+        return db.query(MediaServerItem.server,
+                        MediaServerItem.item_id,
+                        MediaServerItem.item_type,
+                        MediaServerItem.tmdbid,
+                        MediaServerItem.imdbid,
+                        MediaServerItem.tvdbid,
+                        MediaServerItem.seasoninfo).all()
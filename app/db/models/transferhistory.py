@@ -69,6 +69,10 @@ class TransferHistory(Base):
     def list_by_hash(db: Session, download_hash: str):
         return db.query(TransferHistory).filter(TransferHistory.download_hash == download_hash).all()
 
+    @staticmethod
+    def list_src_hash(db: Session):
+        return db.query(TransferHistory.src, TransferHistory.download_hash).all()
+
     @staticmethod
     def statistic(db: Session, days: int = 7):
         """
@@ -1,9 +1,56 @@
+import threading
 import time
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Optional
+
+from sqlalchemy.orm import Session
 
 from app.core.context import MediaInfo
 from app.db import DbOper
 from app.db.models.subscribe import Subscribe
+from app.helper.response import ResponseCache
+from app.utils.singleton import Singleton
+
+
+class SubscribeIndex(metaclass=Singleton):
+    """
+    Memory projection of subscriptions by ID and tmdbid， Loaded on first use，
+    Reloaded after the subscription table is written in any worker process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        #  SubscribeID -> Subscription
+        self._subscribes: Optional[Dict[int, dict]] = None
+        # tmdbid -> Subscriptions of each season
+        self._tmdbids: Dict[int, List[dict]] = {}
+        ResponseCache().watch("subscribe", self.clear)
+
+    def __load(self, db: Session) -> Tuple[Dict[int, dict], Dict[int, List[dict]]]:
+        with self._lock:
+            if self._subscribes is None:
+                self._subscribes = {subscribe.id: subscribe.to_dict() for subscribe in Subscribe.list(db)}
+                self._tmdbids = {}
+                for subscribe in self._subscribes.values():
+                    if subscribe.get("tmdbid"):
+                        self._tmdbids.setdefault(int(subscribe.get("tmdbid")), []).append(subscribe)
+            return self._subscribes, self._tmdbids
+
+    def list(self, db: Session, mtype: str = None) -> List[dict]:
+        subscribes, _ = self.__load(db)
+        return [subscribe for subscribe in subscribes.values() if not mtype or subscribe.get("type") == mtype]
+
+    def get(self, db: Session, sid: int) -> Optional[dict]:
+        subscribes, _ = self.__load(db)
+        return subscribes.get(sid)
+
+    def get_by_tmdbid(self, db: Session, tmdbid: int) -> List[dict]:
+        _, tmdbids = self.__load(db)
+        return tmdbids.get(tmdbid) or []
+
+    def clear(self):
+        with self._lock:
+            self._subscribes = None
+            self._tmdbids = {}
 
 
 class SubscribeOper(DbOper):
@@ -70,3 +117,21 @@ class SubscribeOper(DbOper):
         subscribe = self.get(sid)
         subscribe.update(self._db, payload)
         return subscribe
+
+    def list_indexed(self, mtype: str = None) -> List[dict]:
+        """
+        Subscriptions from the memory projection， In dictionary form
+        """
+        return SubscribeIndex().list(self._db, mtype=mtype)
+
+    def get_indexed(self, sid: int) -> Optional[dict]:
+        """
+        Subscription from the memory projection
+        """
+        return SubscribeIndex().get(self._db, sid)
+
+    def get_indexed_by_tmdbid(self, tmdbid: int) -> List[dict]:
+        """
+        Subscriptions of a media from the memory projection， One per season for tv series
+        """
+        return SubscribeIndex().get_by_tmdbid(self._db, tmdbid)
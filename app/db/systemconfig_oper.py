@@ -1,14 +1,22 @@
+import copy
 import json
-from typing import Any, Union
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 from app.db import DbOper, SessionFactory
 from app.db.models.systemconfig import SystemConfig
+from app.helper.sharedstate import SharedState
+from app.log import logger
 from app.schemas.types import SystemConfigKey
 from app.utils.object import ObjectUtils
 from app.utils.singleton import Singleton
 
 
 class SystemConfigOper(DbOper, metaclass=Singleton):
+    """
+    System settings in memory， Every key has a version increased on change，
+    Components derive objects from a key once and are notified when it changes
+    """
     #  Configuration objects
     __SYSTEMCONF: dict = {}
 
@@ -16,36 +24,86 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
         """
         Load configuration into memory
         """
-        self._db = SessionFactory()
-        super().__init__(self._db)
+        super().__init__(SessionFactory())
+        self._lock = threading.RLock()
+        #  Key -> Version
+        self.__versions: Dict[str, int] = {}
+        #  Key -> Callbacks on change
+        self.__watchers: Dict[str, List[Callable[[str, Any], None]]] = {}
+        #  (Key,  Build function) -> (Version,  Derived object)
+        self.__derived: Dict[Tuple[str, Callable], Tuple[int, Any]] = {}
         for item in SystemConfig.list(self._db):
             if ObjectUtils.is_obj(item.value):
                 self.__SYSTEMCONF[item.key] = json.loads(item.value)
             else:
                 self.__SYSTEMCONF[item.key] = item.value
+        #  Reads are served from memory， Writes use their own session
+        self._db.close()
+        self._db = None
+        #  Settings changed by the other worker processes
+        SharedState().listen("systemconfig", self.__receive)
+
+    def __receive(self, channel: str, data: tuple):
+        key, value = data
+        self.__update(key, value)
+
+    def __update(self, key: str, value: Any) -> bool:
+        """
+        Update memory and notify the watchers of the key
+        :return:  Whether the value changed
+        """
+        with self._lock:
+            current = self.__SYSTEMCONF.get(key)
+            #  The same object may have been changed in place by the caller
+            if key in self.__SYSTEMCONF and current is not value and current == value:
+                return False
+            self.__SYSTEMCONF[key] = value
+            self.__versions[key] = self.__versions.get(key, 0) + 1
+            for derived_key in [derived_key for derived_key in self.__derived if derived_key[0] == key]:
+                del self.__derived[derived_key]
+            watchers = list(self.__watchers.get(key) or [])
+        for callback in watchers:
+            try:
+                callback(key, value)
+            except Exception as err:
+                logger.error(f" Setting watcher of {key}  Error：{err}")
+        return True
 
     def set(self, key: Union[str, SystemConfigKey], value: Any):
         """
-        Setting up system settings
+        Setting up system settings， Not written when the value is unchanged
         """
         if isinstance(key, SystemConfigKey):
             key = key.value
-        #  Update memory
-        self.__SYSTEMCONF[key] = value
-        #  Write to database
-        if ObjectUtils.is_obj(value):
-            value = json.dumps(value)
-        elif value is None:
-            value = ''
-        conf = SystemConfig.get_by_key(self._db, key)
-        if conf:
-            if value:
-                conf.update(self._db, {"value": value})
-            else:
-                conf.delete(self._db, conf.id)
-        else:
-            conf = SystemConfig(key=key, value=value)
-            conf.create(self._db)
+        with self._lock:
+            #  Update memory
+            if not self.__update(key, value):
+                return
+            #  Keep a copy， Later changes of the caller are not taken as saved
+            if ObjectUtils.is_obj(value):
+                self.__SYSTEMCONF[key] = copy.deepcopy(value)
+            SharedState().publish("systemconfig", (key, value))
+            #  Write to database
+            if ObjectUtils.is_obj(value):
+                value = json.dumps(value)
+            elif value is None:
+                value = ''
+            self.__save(key, value)
+
+    @staticmethod
+    def __save(key: str, value: str):
+        """
+        Write a setting with a session of its own
+        """
+        with SessionFactory() as db:
+            conf = SystemConfig.get_by_key(db, key)
+            if conf:
+                if value:
+                    conf.update(db, {"value": value})
+                else:
+                    conf.delete(db, conf.id)
+            elif value:
+                SystemConfig(key=key, value=value).create(db)
 
     def get(self, key: Union[str, SystemConfigKey] = None) -> Any:
         """
@@ -57,6 +115,40 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
             return self.__SYSTEMCONF
         return self.__SYSTEMCONF.get(key)
 
-    def __del__(self):
-        if self._db:
-            self._db.close()
+    def version(self, key: Union[str, SystemConfigKey]) -> int:
+        """
+        Version of a setting， Increased every time its value changes
+        """
+        if isinstance(key, SystemConfigKey):
+            key = key.value
+        return self.__versions.get(key, 0)
+
+    def watch(self, key: Union[str, SystemConfigKey], callback: Callable[[str, Any], None]):
+        """
+        Run a callback with the key and the new value whenever a setting changes， Also by the other worker processes
+        """
+        if isinstance(key, SystemConfigKey):
+            key = key.value
+        with self._lock:
+            self.__watchers.setdefault(key, []).append(callback)
+
+    def cached(self, key: Union[str, SystemConfigKey], build: Callable[[Any], Any]) -> Any:
+        """
+        Object derived from a setting， Such as compiled rules， Built again only when the setting changes
+        :param key:  Setting
+        :param build:  Build the object from the value of the setting
+        """
+        if isinstance(key, SystemConfigKey):
+            key = key.value
+        with self._lock:
+            version = self.__versions.get(key, 0)
+            derived = self.__derived.get((key, build))
+            if derived and derived[0] == version:
+                return derived[1]
+            value = self.__SYSTEMCONF.get(key)
+        result = build(value)
+        with self._lock:
+            #  Not kept if the setting changed while building
+            if self.__versions.get(key, 0) == version:
+                self.__derived[(key, build)] = (version, result)
+        return result
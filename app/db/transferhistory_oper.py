@@ -1,13 +1,126 @@
 import json
+import threading
 import time
+from collections import Counter
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Optional
+
+from sqlalchemy.orm import Session
 
 from app.core.context import MediaInfo
 from app.core.meta import MetaBase
 from app.db import DbOper
 from app.db.models.transferhistory import TransferHistory
+from app.helper.sharedstate import SharedState
 from app.schemas import TransferInfo
+from app.utils.singleton import Singleton
+
+
+class TransferHistoryIndex(metaclass=Singleton):
+    """
+    Memory index of transferred source paths and download hashes， Loaded from the database on first use，
+    Then maintained incrementally by TransferHistoryOper， Changes are also applied in the other worker processes
+    """
+
+    #  Times the database is read again when changes keep arriving during loading
+    _load_attempts = 3
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        #  Serializes loading， Changes do not wait for the database read
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        #  Number of changes， Tells whether any arrived while the database was read
+        self._version = 0
+        #  Source path -> Number of records
+        self._srcs = Counter()
+        #  Downloaderhash -> Number of records
+        self._hashes = Counter()
+        #  Changes made by the other worker processes
+        self._state = SharedState()
+        self._state.listen("transferhistory", self.__receive)
+
+    def load(self, db: Session):
+        """
+        Load all source paths and hashes from the database，
+        Changes arriving meanwhile may or may not be in the rows read， So the rows are read again instead of applying them
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            for attempt in range(self._load_attempts):
+                if self._loaded:
+                    return
+                version = self._version
+                rows = TransferHistory.list_src_hash(db)
+                with self._lock:
+                    if self._version != version and attempt < self._load_attempts - 1:
+                        continue
+                    for src, download_hash in rows:
+                        if src:
+                            self._srcs[src] += 1
+                        if download_hash:
+                            self._hashes[download_hash] += 1
+                    self._loaded = True
+
+    def has_src(self, src: str) -> bool:
+        return self._srcs.get(src, 0) > 0
+
+    def has_hash(self, download_hash: str) -> bool:
+        return self._hashes.get(download_hash, 0) > 0
+
+    def add(self, src: Optional[str], download_hash: Optional[str] = None):
+        self.__add(src, download_hash)
+        self._state.publish("transferhistory", ("add", src, download_hash))
+
+    def remove(self, src: Optional[str], download_hash: Optional[str] = None):
+        self.__remove(src, download_hash)
+        self._state.publish("transferhistory", ("remove", src, download_hash))
+
+    def clear(self):
+        self.__clear()
+        self._state.publish("transferhistory", ("clear", None, None))
+
+    def __receive(self, channel: str, data: tuple):
+        action, src, download_hash = data
+        if action == "add":
+            self.__add(src, download_hash)
+        elif action == "remove":
+            self.__remove(src, download_hash)
+        elif action == "clear":
+            self.__clear()
+
+    def __add(self, src: Optional[str], download_hash: Optional[str] = None):
+        with self._lock:
+            self._version += 1
+            #  Not loaded yet， Loaded from the database with the change later
+            if not self._loaded:
+                return
+            if src:
+                self._srcs[src] += 1
+            if download_hash:
+                self._hashes[download_hash] += 1
+
+    def __remove(self, src: Optional[str], download_hash: Optional[str] = None):
+        with self._lock:
+            self._version += 1
+            if not self._loaded:
+                return
+            self.__decrease(self._srcs, src)
+            self.__decrease(self._hashes, download_hash)
+
+    @staticmethod
+    def __decrease(counter: Counter, key: Optional[str]):
+        if key and counter.get(key):
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
+
+    def __clear(self):
+        with self._lock:
+            self._version += 1
+            self._srcs.clear()
+            self._hashes.clear()
 
 
 class TransferHistoryOper(DbOper):
@@ -15,6 +128,29 @@ class TransferHistoryOper(DbOper):
     Transfer of historical management
     """
 
+    @property
+    def index(self) -> TransferHistoryIndex:
+        """
+        Memory index of transfer records
+        """
+        index = TransferHistoryIndex()
+        index.load(self._db)
+        return index
+
+    def exists_by_src(self, src: str) -> bool:
+        """
+        Determine from the memory index whether the source has been transferred， No database query
+        :param src:  Source path
+        """
+        return self.index.has_src(src)
+
+    def exists_by_hash(self, download_hash: str) -> bool:
+        """
+        Determine from the memory index whether the seed has transfer records， No database query
+        :param download_hash:  Torrenthash
+        """
+        return self.index.has_hash(download_hash)
+
     def get(self, historyid: int) -> TransferHistory:
         """
         Getting the transfer history
@@ -34,6 +170,8 @@ class TransferHistoryOper(DbOper):
         Search transfer records by source
         :param src:  Digitalkey
         """
+        if not self.index.has_src(src):
+            return None
         return TransferHistory.get_by_src(self._db, src)
 
     def list_by_hash(self, download_hash: str) -> List[TransferHistory]:
@@ -41,6 +179,8 @@ class TransferHistoryOper(DbOper):
         By seedhash Access to transfer records
         :param download_hash:  Torrenthash
         """
+        if not self.index.has_hash(download_hash):
+            return []
         return TransferHistory.list_by_hash(self._db, download_hash)
 
     def add(self, **kwargs) -> TransferHistory:
@@ -50,7 +190,9 @@ class TransferHistoryOper(DbOper):
         kwargs.update({
             "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         })
-        return TransferHistory(**kwargs).create(self._db)
+        transferhistory = TransferHistory(**kwargs).create(self._db)
+        self.index.add(transferhistory.src, transferhistory.download_hash)
+        return transferhistory
 
     def statistic(self, days: int = 7) -> List[Any]:
         """
@@ -84,32 +226,42 @@ class TransferHistoryOper(DbOper):
         """
         Deletion of transfer records
         """
+        transferhistory = TransferHistory.get(self._db, historyid)
+        if not transferhistory:
+            return
+        src, download_hash = transferhistory.src, transferhistory.download_hash
         TransferHistory.delete(self._db, historyid)
+        self.index.remove(src, download_hash)
 
     def truncate(self):
         """
         Emptying the transfer record
         """
         TransferHistory.truncate(self._db)
+        self.index.clear()
 
     def add_force(self, **kwargs) -> TransferHistory:
         """
         Add transfer history，相同源目录的记录会被删除
         """
         if kwargs.get("src"):
-            transferhistory = TransferHistory.get_by_src(self._db, kwargs.get("src"))
+            transferhistory = self.get_by_src(kwargs.get("src"))
             if transferhistory:
-                transferhistory.delete(self._db, transferhistory.id)
-        kwargs.update({
-            "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        })
-        return TransferHistory(**kwargs).create(self._db)
+                self.delete(transferhistory.id)
+        return self.add(**kwargs)
 
     def update_download_hash(self, historyid, download_hash):
         """
         Supplementary transfer recordsdownload_hash
         """
+        transferhistory = TransferHistory.get(self._db, historyid)
+        if not transferhistory:
+            return
+        old_hash = transferhistory.download_hash
         TransferHistory.update_download_hash(self._db, historyid, download_hash)
+        if old_hash != download_hash:
+            self.index.remove(None, old_hash)
+            self.index.add(None, download_hash)
 
     def add_success(self, src_path: Path, mode: str, meta: MetaBase,
                     mediainfo: MediaInfo, transferinfo: TransferInfo,
@@ -117,7 +269,45 @@ class TransferHistoryOper(DbOper):
         """
         Add transfer success history
         """
-        self.add_force(
+        self.add_force(**self.__success_kwargs(src_path=src_path, mode=mode, meta=meta,
+                                               mediainfo=mediainfo, transferinfo=transferinfo,
+                                               download_hash=download_hash))
+
+    def add_success_batch(self, records: List[dict]) -> List[TransferHistory]:
+        """
+        Batch add transfer success history， Written in one transaction
+        :param records: [{src_path, mode, meta, mediainfo, transferinfo, download_hash}]， Same as add_success
+        """
+        if not records:
+            return []
+        date = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        histories = []
+        replaced = []
+        for record in records:
+            kwargs = self.__success_kwargs(**record)
+            #  Records of the same source are replaced， Deleted in the same transaction
+            transferhistory = self.get_by_src(kwargs.get("src"))
+            if transferhistory:
+                replaced.append((transferhistory.src, transferhistory.download_hash))
+                self._db.delete(transferhistory)
+            kwargs["date"] = date
+            histories.append(TransferHistory(**kwargs))
+        self._db.add_all(histories)
+        TransferHistory.commit(self._db)
+        for src, download_hash in replaced:
+            self.index.remove(src, download_hash)
+        for transferhistory in histories:
+            self.index.add(transferhistory.src, transferhistory.download_hash)
+        return histories
+
+    @staticmethod
+    def __success_kwargs(src_path: Path, mode: str, meta: MetaBase,
+                         mediainfo: MediaInfo, transferinfo: TransferInfo,
+                         download_hash: str = None) -> dict:
+        """
+        Fields of a transfer success history
+        """
+        return dict(
             src=str(src_path),
             dest=str(transferinfo.target_path),
             mode=mode,
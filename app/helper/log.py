@@ -0,0 +1,169 @@
+import bisect
+import json
+import logging
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+from app.core.config import settings
+from app.utils.singleton import Singleton
+
+
+class LogHelper(metaclass=Singleton):
+    """
+    Log file reading， Tail reads seek backwards from the end，
+    Queries use a sparse index of timestamps saved on disk to skip to the requested time
+    """
+    #  Log file name
+    _log_name = "moviepilot.log"
+    #  Number of rotated files， The same as the log file handler
+    _backup_count = 3
+    #  Block size of backwards reads
+    _block_size = 8192
+    #  Interval of index points， Unit bytes
+    _index_step = 64 * 1024
+    #  Log record：【 Level】 Time -  File -  Message
+    _record_pattern = re.compile(r"^【(\w+)】(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (.+?) - (.*)$", re.S)
+    #  Time format of the log， Sorted as strings
+    _time_format = "%Y-%m-%d %H:%M:%S,%f"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index_file = settings.TEMP_PATH / "logindex.json"
+        try:
+            self._indexes: dict = json.loads(self._index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._indexes = {}
+
+    def log_files(self) -> List[Path]:
+        """
+        Current and rotated log files， Oldest first
+        """
+        log_file = settings.LOG_PATH / self._log_name
+        files = [log_file.with_name(f"{self._log_name}.{i}") for i in range(self._backup_count, 0, -1)]
+        return [file for file in files + [log_file] if file.exists()]
+
+    def tail(self, lines: int = 50) -> List[str]:
+        """
+        Last lines of the current log file， Read backwards by block
+        """
+        log_file = settings.LOG_PATH / self._log_name
+        if lines <= 0 or not log_file.exists():
+            return []
+        with open(log_file, "rb") as f:
+            f.seek(0, 2)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= lines:
+                size = min(self._block_size, position)
+                position -= size
+                f.seek(position)
+                data = f.read(size) + data
+        return [line.decode("utf-8", errors="replace") for line in data.splitlines()[-lines:]]
+
+    def __get_index(self, path: Path) -> List[Tuple[int, str]]:
+        """
+        Sparse index of a log file，[( Offset,  Time of the record starting there)]，
+        Extended incrementally when the file grows， Rebuilt when the file is replaced
+        """
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            head = f.readline(128).decode("utf-8", errors="replace")
+            with self._lock:
+                entry = self._indexes.get(path.name)
+                if entry and entry.get("head") == head and entry.get("size", 0) <= size:
+                    points, offset = entry.get("points") or [], entry.get("size", 0)
+                else:
+                    points, offset = [], 0
+                if offset == size:
+                    return points
+                next_point = points[-1][0] + self._index_step if points else 0
+                f.seek(offset)
+                for line in f:
+                    #  Incomplete last line
+                    if not line.endswith(b"\n"):
+                        break
+                    if offset >= next_point:
+                        match = self._record_pattern.match(line.decode("utf-8", errors="replace"))
+                        if match:
+                            points.append((offset, match.group(2)))
+                            next_point = offset + self._index_step
+                    offset += len(line)
+                self._indexes[path.name] = {"head": head, "size": offset, "points": points}
+                try:
+                    self._index_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._index_file.write_text(json.dumps(self._indexes), encoding="utf-8")
+                except OSError:
+                    pass
+        return points
+
+    def __read_records(self, path: Path, offset: int = 0):
+        """
+        Read log records from an offset， Lines without a header belong to the previous record
+        """
+        record = None
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                match = self._record_pattern.match(text)
+                if match:
+                    if record:
+                        yield record
+                    record = {
+                        "level": match.group(1),
+                        "time": match.group(2),
+                        "module": match.group(3),
+                        "message": match.group(4)
+                    }
+                elif record:
+                    record["message"] += "\n" + text
+        if record:
+            yield record
+
+    def query(self, level: str = None, module: str = None,
+              start: datetime = None, end: datetime = None,
+              keyword: str = None, limit: int = 200) -> List[dict]:
+        """
+        Query log records of the current and rotated files
+        :param level:  Minimum level， Such asWARNING
+        :param module:  File name of the module
+        :param start:  Start time
+        :param end:  End time
+        :param keyword:  Keyword in the message， Case insensitive
+        :param limit:  Maximum number， Keep the latest
+        :return: [{"level", "time", "module", "message"}]， Oldest first
+        """
+        min_level = logging.getLevelName(level.upper()) if level else None
+        if not isinstance(min_level, int):
+            min_level = None
+        start_time = start.strftime(self._time_format)[:-3] if start else None
+        end_time = end.strftime(self._time_format)[:-3] if end else None
+        keyword = keyword.lower() if keyword else None
+        results = deque(maxlen=max(limit, 1))
+        for path in self.log_files():
+            points = self.__get_index(path)
+            if end_time and points and points[0][1] > end_time:
+                break
+            offset = 0
+            if start_time and points:
+                #  Last index point before the start time
+                pos = bisect.bisect_left([point[1] for point in points], start_time)
+                if pos > 0:
+                    offset = points[pos - 1][0]
+            for record in self.__read_records(path, offset):
+                if start_time and record["time"] < start_time:
+                    continue
+                if end_time and record["time"] > end_time:
+                    return list(results)
+                if min_level and logging.getLevelName(record["level"]) < min_level:
+                    continue
+                if module and module.lower() not in record["module"].lower():
+                    continue
+                if keyword and keyword not in record["message"].lower():
+                    continue
+                results.append(record)
+        return list(results)
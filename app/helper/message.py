@@ -1,5 +1,5 @@
-import queue
-
+from app.helper.pubsub import PubSub
+from app.helper.sharedstate import SharedState
 from app.utils.singleton import Singleton
 
 
@@ -7,13 +7,23 @@ class MessageHelper(metaclass=Singleton):
     """
     Message queue manager
     """
+    #  Publish channel
+    channel = "message"
+    #  Key of the messages waiting for a subscriber in the shared state
+    _queue_key = "message.queue"
+    #  Number of waiting messages， The oldest are dropped when full
+    _queue_size = 100
+
     def __init__(self):
-        self.queue = queue.Queue()
+        self._pubsub = PubSub()
+        self._state = SharedState()
 
     def put(self, message: str):
-        self.queue.put(message)
+        #  Pushed directly when there are subscribers in any worker， Otherwise kept until the next subscription
+        if self._pubsub.has_subscribers(self.channel):
+            self._pubsub.publish(self.channel, message)
+            return
+        self._state.push(self._queue_key, message, maxlen=self._queue_size)
 
     def get(self):
-        if not self.queue.empty():
-            return self.queue.get(block=False)
-        return None
+        return self._state.pop(self._queue_key)
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import ast
 import importlib
 import pkgutil
+from pathlib import Path
+from typing import List
+
+from app.log import logger
 
 
 class ModuleHelper:
@@ -31,3 +36,71 @@ class ModuleHelper:
                     submodules.append(obj)
 
         return submodules
+
+    @classmethod
+    def load_manifests(cls, package_path, base_name: str) -> List[dict]:
+        """
+        Read class metadata from submodule sources without importing them
+        :param package_path:  Parent package name
+        :param base_name:  Name of the base class， Only classes directly inheriting it are read
+        :return: [{"module":  Submodule name, "name":  Class name, "attrs":  Class constant attributes, "methods": { Method name:  Implemented or not}}]
+        """
+
+        def is_implemented(func: ast.FunctionDef) -> bool:
+            """
+            The method body is not just documentation、pass Or ...
+            """
+            body = func.body
+            if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                    and isinstance(body[0].value.value, str):
+                body = body[1:]
+            return any(not isinstance(stmt, ast.Pass)
+                       and not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant))
+                       and not (isinstance(stmt, ast.Return) and stmt.value is None)
+                       for stmt in body)
+
+        manifests: list = []
+        packages = importlib.import_module(package_path)
+        for importer, package_name, is_pkg in pkgutil.iter_modules(packages.__path__):
+            if package_name.startswith('_'):
+                continue
+            source_path = Path(importer.path) / package_name
+            source_file = source_path / "__init__.py" if is_pkg else source_path.with_suffix(".py")
+            try:
+                tree = ast.parse(source_file.read_text(encoding="utf-8"))
+            except Exception as err:
+                logger.error(f" Read {package_path}.{package_name}  Metadata error：{err}")
+                continue
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef) or node.name.startswith('_'):
+                    continue
+                if not any(isinstance(base, ast.Name) and base.id == base_name for base in node.bases):
+                    continue
+                attrs, methods = {}, {}
+                for item in node.body:
+                    if isinstance(item, ast.Assign):
+                        targets = [t.id for t in item.targets if isinstance(t, ast.Name)]
+                    elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name) and item.value:
+                        targets = [item.target.id]
+                    elif isinstance(item, ast.FunctionDef):
+                        methods[item.name] = is_implemented(item)
+                        continue
+                    else:
+                        continue
+                    targets = [target for target in targets if not target.startswith('_')]
+                    if not targets:
+                        continue
+                    try:
+                        value = ast.literal_eval(item.value)
+                    except Exception:
+                        continue
+                    for target in targets:
+                        attrs[target] = value
+                manifests.append({
+                    "module": f'{package_path}.{package_name}',
+                    "name": node.name,
+                    "attrs": attrs,
+                    "methods": methods
+                })
+
+        return manifests
@@ -1,52 +1,64 @@
 from enum import Enum
-from typing import Union, Dict
+from typing import Union
 
+from app.helper.pubsub import PubSub
+from app.helper.sharedstate import SharedState
 from app.schemas.types import ProgressKey
 from app.utils.singleton import Singleton
 
 
 class ProgressHelper(metaclass=Singleton):
-    _process_detail: Dict[str, dict] = {}
+    """
+    Processing progress， Kept in the shared state so every worker process sees the same progress
+    """
 
     def __init__(self):
-        self._process_detail = {}
+        self._state = SharedState()
+        self._pubsub = PubSub()
 
     def init_config(self):
         pass
 
-    def __reset(self, key: Union[ProgressKey, str]):
+    @staticmethod
+    def channel(key: Union[ProgressKey, str]) -> str:
+        """
+        Publish channel of a progress， Also the key in the shared state
+        """
         if isinstance(key, Enum):
             key = key.value
-        self._process_detail[key] = {
-            "enable": False,
-            "value": 0,
-            "text": " Please wait...."
-        }
+        return f"progress.{key}"
+
+    def __save(self, key: Union[ProgressKey, str], detail: dict):
+        """
+        Save a progress and notify subscribers
+        """
+        channel = self.channel(key)
+        self._state.set(channel, detail)
+        self._pubsub.publish(channel, dict(detail))
 
     def start(self, key: Union[ProgressKey, str]):
-        self.__reset(key)
-        if isinstance(key, Enum):
-            key = key.value
-        self._process_detail[key]['enable'] = True
+        self.__save(key, {
+            "enable": True,
+            "value": 0,
+            "text": " Please wait...."
+        })
 
     def end(self, key: Union[ProgressKey, str]):
-        if isinstance(key, Enum):
-            key = key.value
-        if not self._process_detail.get(key):
+        detail = self.get(key)
+        if not detail:
             return
-        self._process_detail[key]['enable'] = False
+        detail['enable'] = False
+        self.__save(key, detail)
 
     def update(self, key: Union[ProgressKey, str], value: float = None, text: str = None):
-        if isinstance(key, Enum):
-            key = key.value
-        if not self._process_detail.get(key, {}).get('enable'):
+        detail = self.get(key)
+        if not detail or not detail.get('enable'):
             return
         if value:
-            self._process_detail[key]['value'] = value
+            detail['value'] = value
         if text:
-            self._process_detail[key]['text'] = text
+            detail['text'] = text
+        self.__save(key, detail)
 
     def get(self, key: Union[ProgressKey, str]) -> dict:
-        if isinstance(key, Enum):
-            key = key.value
-        return self._process_detail.get(key)
+        return self._state.get(self.channel(key))
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+from app.utils.singleton import Singleton
+
+
+class Subscription:
+    """
+    Subscription of a channel， Owned by one event loop
+    """
+
+    def __init__(self, channel: str, loop: asyncio.AbstractEventLoop,
+                 coalesce: bool = False, maxsize: int = 100):
+        """
+        :param channel:  Channel name
+        :param loop:  Event loop of the subscriber
+        :param coalesce:  Keep only the latest message， For state such as progress
+        :param maxsize:  Maximum number of pending messages， The oldest are dropped when full
+        """
+        self.channel = channel
+        self.loop = loop
+        self.dropped = 0
+        self._coalesce = coalesce
+        self._pending = deque(maxlen=1 if coalesce else maxsize)
+        self._event = asyncio.Event()
+
+    def push(self, data: Any):
+        """
+        Receive a message， Runs in the event loop of the subscriber
+        """
+        if not self._coalesce and len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(data)
+        self._event.set()
+
+    async def get(self, timeout: float = None) -> List[Any]:
+        """
+        Wait for messages and return all pending ones
+        :param timeout:  Wait timeout， Returns an empty list on timeout
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._event.clear()
+        messages = list(self._pending)
+        self._pending.clear()
+        return messages
+
+
+class PubSub(metaclass=Singleton):
+    """
+    In-process publish/subscribe hub， Publishers in any thread， Subscribers in event loops，
+    Publishing without subscribers costs only a dictionary lookup，
+    Bridged channels are also forwarded to the other worker processes
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        #  Shared state of the worker processes， Forwards messages and records subscribers
+        self._bridge = None
+        #  Prefixes of bridged channels
+        self._bridge_channels: Tuple[str, ...] = ()
+
+    def bridge(self, shared, channels: Tuple[str, ...]):
+        """
+        Forward channels to the other worker processes
+        :param shared:  SharedState
+        :param channels:  Channel prefixes
+        """
+        self._bridge = shared
+        self._bridge_channels = tuple(channels)
+        for prefix in self._bridge_channels:
+            shared.listen(prefix, self.__deliver)
+
+    def __bridged(self, channel: str) -> bool:
+        return bool(self._bridge) and channel.startswith(self._bridge_channels)
+
+    def subscribe(self, channel: str, coalesce: bool = False, maxsize: int = 100) -> Subscription:
+        """
+        Subscribe to a channel， Must be called in a running event loop
+        """
+        subscription = Subscription(channel=channel, loop=asyncio.get_running_loop(),
+                                    coalesce=coalesce, maxsize=maxsize)
+        with self._lock:
+            self._subscribers[channel] = self._subscribers.get(channel, []) + [subscription]
+        if self.__bridged(channel):
+            self._bridge.enter(channel)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Cancel a subscription
+        """
+        with self._lock:
+            current = self._subscribers.get(subscription.channel, [])
+            subscriptions = [sub for sub in current if sub is not subscription]
+            if subscriptions:
+                self._subscribers[subscription.channel] = subscriptions
+            else:
+                self._subscribers.pop(subscription.channel, None)
+        if len(subscriptions) < len(current) and self.__bridged(subscription.channel):
+            self._bridge.leave(subscription.channel)
+
+    def has_subscribers(self, channel: str) -> bool:
+        """
+        Whether the channel has subscribers， Including the other worker processes for bridged channels
+        """
+        if self._subscribers.get(channel):
+            return True
+        return self.__bridged(channel) and self._bridge.present(channel)
+
+    def publish(self, channel: str, data: Any) -> int:
+        """
+        Publish a message to all subscribers of the channel
+        :return:  Number of subscribers notified in this process
+        """
+        if self.__bridged(channel):
+            self._bridge.publish(channel, data)
+        return self.__deliver(channel, data)
+
+    def __deliver(self, channel: str, data: Any) -> int:
+        """
+        Deliver a message to the subscribers in this process
+        """
+        count = 0
+        for subscription in self._subscribers.get(channel) or []:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, data)
+                count += 1
+            except RuntimeError:
+                #  Event loop closed
+                self.unsubscribe(subscription)
+        return count
@@ -0,0 +1,91 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from app.log import logger
+
+
+class RefreshQueue:
+    """
+    Media library refresh queue， Collect refresh targets within a short window，
+    Deduplicate them by key and refresh the media server once when the window ends
+    """
+    #  All refresh queues， Name -> Queue
+    _queues: Dict[str, "RefreshQueue"] = {}
+
+    def __init__(self, name: str, refresh: Callable[[List[Any]], Any], delay: float = 10):
+        """
+        :param name:  Queue name， Usually the media server
+        :param refresh:  Refresh function， The input parameter is the list of deduplicated targets
+        :param delay:  Collection window， Unit seconds
+        """
+        self._name = name
+        self._refresh = refresh
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Any] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._stats = {
+            #  Number of refresh requests
+            "requested": 0,
+            #  Number of targets actually refreshed
+            "refreshed": 0,
+            #  Number of requests merged into another
+            "coalesced": 0,
+            #  Number of refresh batches
+            "batches": 0
+        }
+        RefreshQueue._queues[name] = self
+
+    def put(self, key: Hashable, target: Any):
+        """
+        Add a refresh target， Targets with the same key in the window are merged
+        """
+        with self._lock:
+            self._stats["requested"] += 1
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+            self._pending[key] = target
+            if not self._timer:
+                self._timer = threading.Timer(self._delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """
+        Refresh all collected targets
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            targets = list(self._pending.values())
+            self._pending = {}
+            if not targets:
+                return
+            self._stats["refreshed"] += len(targets)
+            self._stats["batches"] += 1
+        logger.info(f"{self._name}  Refresh media library， Common {len(targets)}  Targets")
+        try:
+            self._refresh(targets)
+        except Exception as err:
+            logger.error(f"{self._name}  Failed to refresh media library：{err}")
+
+    def stop(self):
+        """
+        Stop the queue， Refresh the remaining targets immediately
+        """
+        self.flush()
+
+    def get_stats(self) -> dict:
+        """
+        Refresh statistics of this queue
+        """
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+    @classmethod
+    def get_all_stats(cls) -> Dict[str, dict]:
+        """
+        Refresh statistics of all queues
+        """
+        return {name: queue.get_stats() for name, queue in cls._queues.items()}
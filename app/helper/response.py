@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.helper.sharedstate import SharedState
+from app.schemas.types import EventType
+from app.utils.singleton import Singleton
+
+
+class ResponseCache(metaclass=Singleton):
+    """
+    Serialized API response cache， Keyed by path and query parameters，
+    Grouped by data source and cleared when the source tables are written or related events are handled
+    """
+    #  Entries kept per group
+    _max_entries = 128
+    #  Validity period of each group， Unit seconds， Data not from the database relies on it
+    _group_ttl = {
+        "media": 60 * 60
+    }
+    #  Validity period of other groups， Guards against writes outside the session
+    _default_ttl = 10 * 60
+    #  Database table -> Groups
+    _table_groups = {
+        "subscribe": ["subscribe"],
+        "transferhistory": ["transfer"],
+        "site": ["site"],
+        "siteicon": ["site"],
+        "systemconfig": ["plugin"]
+    }
+    #  Event -> Groups
+    _event_groups = {
+        EventType.PluginReload.value: ["plugin"],
+        EventType.SiteDeleted.value: ["site"],
+        EventType.TransferComplete.value: ["transfer"],
+        EventType.HistoryDeleted.value: ["transfer"]
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        #  Group -> { Key -> (ETag, Content, Time)}
+        self._entries: Dict[str, OrderedDict] = {}
+        #  Group -> Generation， Increased on every clear
+        self._generations: Dict[str, int] = {}
+        #  Group -> Callbacks after the group is cleared
+        self._watchers: Dict[str, List[Callable[[], None]]] = {}
+        #  Groups cleared by the other worker processes
+        self._state = SharedState()
+        self._state.listen("response", lambda _, groups: self.__clear(*groups))
+
+    @staticmethod
+    def __key(request: Request) -> str:
+        params = sorted((key, value) for key, value in request.query_params.multi_items() if key != "token")
+        return f"{request.url.path}?{params}"
+
+    def get(self, group: str, key: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entries = self._entries.get(group)
+            if not entries or key not in entries:
+                return None
+            etag, body, created = entries[key]
+            if time.time() - created > self._group_ttl.get(group, self._default_ttl):
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return etag, body
+
+    def put(self, group: str, key: str, body: bytes, generation: int = None) -> str:
+        """
+        Save a serialized response， Not saved if the group was cleared after generation
+        :return: ETag
+        """
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        with self._lock:
+            if generation is not None and generation != self._generations.get(group, 0):
+                return etag
+            entries = self._entries.setdefault(group, OrderedDict())
+            entries[key] = (etag, body, time.time())
+            entries.move_to_end(key)
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+        return etag
+
+    def invalidate(self, *groups: str):
+        """
+        Clear the responses of groups， Also in the other worker processes
+        """
+        self.__clear(*groups)
+        self._state.publish("response", groups)
+
+    def __clear(self, *groups: str):
+        with self._lock:
+            for group in groups:
+                self._entries.pop(group, None)
+                self._generations[group] = self._generations.get(group, 0) + 1
+        for group in groups:
+            for callback in self._watchers.get(group) or []:
+                callback()
+
+    def watch(self, group: str, callback: Callable[[], None]):
+        """
+        Run a callback whenever a group is cleared， For other caches built from the same data
+        """
+        with self._lock:
+            self._watchers.setdefault(group, []).append(callback)
+
+    def invalidate_tables(self, tables: Set[str]):
+        """
+        Clear the responses built from database tables
+        """
+        groups = {group for table in tables for group in self._table_groups.get(table, [])}
+        if groups:
+            self.invalidate(*groups)
+
+    def invalidate_event(self, event_type: str):
+        """
+        Clear the responses affected by a handled event
+        """
+        groups = self._event_groups.get(event_type)
+        if groups:
+            self.invalidate(*groups)
+
+    def respond(self, request: Request, group: str, build: Callable[[], Any], model: Any = None) -> Response:
+        """
+        Cached response of an endpoint， Returns304 If the client already has it
+        :param request:  Request
+        :param group:  Cache group
+        :param build:  Build the response data when not cached
+        :param model:  Response model， The same as the response_model of the endpoint
+        """
+        key = self.__key(request)
+        cached = self.get(group, key)
+        if cached:
+            etag, body = cached
+        else:
+            generation = self._generations.get(group, 0)
+            data = build()
+            if model is not None:
+                data = parse_obj_as(model, data)
+            body = orjson.dumps(jsonable_encoder(data))
+            etag = self.put(group, key, body, generation=generation)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in (request.headers.get("if-none-match") or "").split(", "):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, _):
+    """
+    Record the tables written by the session
+    """
+    tables = session.info.setdefault("written_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            tables.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_execute(state):
+    """
+    Record the tables written by bulk updates and deletes
+    """
+    if (state.is_update or state.is_delete or state.is_insert) and state.bind_mapper:
+        state.session.info.setdefault("written_tables", set()).add(state.bind_mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_written(session: Session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        ResponseCache().invalidate_tables(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written(session: Session):
+    session.info.pop("written_tables", None)
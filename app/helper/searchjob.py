@@ -0,0 +1,154 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.helper.pubsub import PubSub
+from app.log import logger
+from app.utils.singleton import Singleton
+
+
+class SearchJob:
+    """
+    Background search job
+    """
+
+    def __init__(self, kind: str, params: dict):
+        self.id = uuid.uuid4().hex
+        #  Search type，title/media
+        self.kind = kind
+        self.params = params
+        # running/finished/cancelled/failed
+        self.state = "running"
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        #  Events in order， Replayed to late subscribers
+        self.events: List[dict] = []
+        #  Final results
+        self.results: List[dict] = []
+        self.cancel_event = threading.Event()
+
+    @property
+    def channel(self) -> str:
+        """
+        Publish channel of the job events
+        """
+        return f"search.{self.id}"
+
+    @property
+    def done(self) -> bool:
+        return self.state != "running"
+
+    def to_dict(self, results: bool = False) -> dict:
+        """
+        Job status， Optionally with final results
+        """
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "state": self.state,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished,
+            "sites": [event.get("site") for event in self.events if event.get("type") == "site"]
+        }
+        if results:
+            data["results"] = self.results
+        return data
+
+
+class SearchJobManager(metaclass=Singleton):
+    """
+    Run searches in background threads， Site results are published as they arrive
+    """
+    #  Number of searches running at the same time
+    _max_workers = 4
+    #  Time finished jobs are kept， Unit seconds
+    _job_ttl = 30 * 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, SearchJob] = {}
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="search-job")
+        self._pubsub = PubSub()
+
+    def submit(self, kind: str, params: dict,
+               search: Callable[[Callable[[str, list], None], threading.Event], List[Any]]) -> SearchJob:
+        """
+        Submit a search job
+        :param kind:  Search type
+        :param params:  Search parameters， Only for display
+        :param search:  Search function， The input parameters are the site callback and the cancel event，
+                        Returns the final results
+        """
+        self.__expire()
+        job = SearchJob(kind=kind, params=params)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self.__run, job, search)
+        return job
+
+    def __run(self, job: SearchJob, search: Callable):
+        def on_site(site: str, torrents: list):
+            self.__publish(job, {
+                "type": "site",
+                "site": site,
+                "torrents": [torrent.to_dict() for torrent in torrents]
+            })
+
+        try:
+            results = search(on_site, job.cancel_event) or []
+            job.results = [result.to_dict() for result in results]
+            if job.cancel_event.is_set():
+                job.state = "cancelled"
+            else:
+                job.state = "finished"
+        except Exception as err:
+            logger.error(f" Search job {job.id}  Make a mistake：{err}")
+            job.state = "failed"
+            job.error = str(err)
+        job.finished = time.time()
+        self.__publish(job, {
+            "type": job.state,
+            "error": job.error,
+            "count": len(job.results)
+        })
+
+    def __publish(self, job: SearchJob, event: dict):
+        with self._lock:
+            event["seq"] = len(job.events)
+            job.events.append(event)
+        self._pubsub.publish(job.channel, event)
+
+    def __expire(self):
+        """
+        Remove finished jobs that are out of date
+        """
+        now = time.time()
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.finished and now - job.finished > self._job_ttl]:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a running job， Sites still searching are ignored
+        """
+        job = self._jobs.get(job_id)
+        if not job or job.done:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def snapshot(self, job: SearchJob) -> List[dict]:
+        """
+        Events published so far
+        """
+        with self._lock:
+            return list(job.events)
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from cachetools import LRUCache
+
+from app.core.config import settings
+from app.core.context import Context
+from app.log import logger
+from app.utils.singleton import Singleton
+from app.utils.string import StringUtils
+
+
+class SearchResultStore(metaclass=Singleton):
+    """
+    Search result store， One file per user and query under the temporary directory，
+    Shared by the worker processes and kept across restarts，
+    Media information is kept once per query， Each result only keeps its own identification and seed information
+    """
+    #  Validity period of results， Unit seconds
+    _ttl = 24 * 60 * 60
+    #  Number of queries kept per user
+    _max_queries = 10
+    #  Number of parsed files kept in memory by each process
+    _max_loaded = 20
+    #  Directory of results without a user， Hashed user directories never take this name
+    _anonymous = "anonymous"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = settings.TEMP_PATH / "searchresults"
+        #  Recently parsed files of this process， Path -> ( Modification time,  Result)
+        self._loaded: LRUCache = LRUCache(maxsize=self._max_loaded)
+
+    @staticmethod
+    def __slim(data: Optional[dict]) -> Optional[dict]:
+        """
+        Remove empty values from a dictionary
+        """
+        if not data:
+            return data
+        return {key: value for key, value in data.items() if value not in (None, "", [], {})}
+
+    def __user_path(self, userid: Union[int, str]) -> Path:
+        if userid is None or userid == "":
+            return self._path / self._anonymous
+        return self._path / StringUtils.md5_hash(str(userid))
+
+    def __load(self, file: Path) -> Optional[dict]:
+        """
+        Read a result file， Parsed again only when it was changed
+        """
+        try:
+            mtime = file.stat().st_mtime_ns
+            with self._lock:
+                loaded = self._loaded.get(file)
+                if loaded and loaded[0] == mtime:
+                    return loaded[1]
+            entry = json.loads(file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            with self._lock:
+                self._loaded.pop(file, None)
+            return None
+        with self._lock:
+            self._loaded[file] = (mtime, entry)
+        return entry
+
+    def __remove(self, file: Path):
+        file.unlink(missing_ok=True)
+        with self._lock:
+            self._loaded.pop(file, None)
+
+    def __entries(self, userid: Union[int, str]) -> List[Tuple[Path, dict]]:
+        """
+        Valid results of a user， Most recent first， Expired files are removed
+        """
+        user_path = self.__user_path(userid)
+        if not user_path.exists():
+            return []
+        entries = []
+        now = time.time()
+        for file in user_path.glob("*.json"):
+            entry = self.__load(file)
+            if not entry or now - entry.get("time", 0) > self._ttl:
+                self.__remove(file)
+                continue
+            entries.append((file, entry))
+        entries.sort(key=lambda x: x[1].get("time", 0), reverse=True)
+        return entries
+
+    def save(self, userid: Union[int, str], query: str, contexts: List[Context], title: str = None):
+        """
+        Save the results of a query， Replacing the previous results of the same query
+        :param userid:  SubscribersID
+        :param query:  Query key
+        :param contexts:  Search results
+        :param title:  Query title for display
+        """
+        media = contexts[0].media_info if contexts else None
+        entry = {
+            "query": query,
+            "time": time.time(),
+            "title": title,
+            "media": self.__slim(media.to_dict()) if media else None,
+            "items": [{
+                "meta_info": self.__slim(context.meta_info.to_dict()) if context.meta_info else None,
+                "torrent_info": self.__slim(context.torrent_info.to_dict()) if context.torrent_info else None
+            } for context in contexts]
+        }
+        user_path = self.__user_path(userid)
+        file = user_path / f"{StringUtils.md5_hash(query)}.json"
+        try:
+            user_path.mkdir(parents=True, exist_ok=True)
+            #  Written to a temporary file first， Readers never see a partial file
+            temp_file = file.with_name(f"{file.name}.{os.getpid()}.{threading.get_ident()}")
+            temp_file.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(temp_file, file)
+        except (OSError, TypeError, ValueError) as err:
+            logger.error(f" Error saving search results：{err}")
+            return
+        for old_file, _ in self.__entries(userid)[self._max_queries:]:
+            self.__remove(old_file)
+
+    def get(self, userid: Union[int, str], query: str = None,
+            page: int = 1, count: int = 0) -> Tuple[int, List[dict]]:
+        """
+        Read results by page
+        :param userid:  SubscribersID
+        :param query:  Query key， The most recent query when empty
+        :param page:  Page number， Start from1
+        :param count:  Number per page，0 For all
+        :return:  Total number， Results of the page in context dictionary form
+        """
+        if query:
+            entry = self.__load(self.__user_path(userid) / f"{StringUtils.md5_hash(query)}.json")
+            if entry and time.time() - entry.get("time", 0) > self._ttl:
+                entry = None
+        else:
+            entries = self.__entries(userid)
+            entry = entries[0][1] if entries else None
+        if not entry:
+            return 0, []
+        items = entry["items"]
+        if count:
+            start = (max(page, 1) - 1) * count
+            items = items[start:start + count]
+        results = []
+        for item in items:
+            result = dict(item)
+            result["media_info"] = entry["media"]
+            results.append(result)
+        return len(entry["items"]), results
+
+    def list(self, userid: Union[int, str]) -> List[Dict[str, Any]]:
+        """
+        Queries kept for a user， Most recent first
+        """
+        return [{
+            "query": entry.get("query"),
+            "title": entry.get("title"),
+            "time": entry.get("time"),
+            "total": len(entry.get("items") or [])
+        } for _, entry in self.__entries(userid)]
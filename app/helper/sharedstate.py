@@ -0,0 +1,552 @@
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.helper.pubsub import PubSub
+from app.log import logger
+from app.utils.singleton import Singleton
+
+
+class StateBackend(metaclass=ABCMeta):
+    """
+    Storage of state shared between worker processes
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float = None):
+        """
+        Save a value
+        :param ttl:  Validity period， Unit seconds， Permanent when empty
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def keys(self, prefix: str) -> List[str]:
+        """
+        Keys that are not expired and start with the prefix
+        """
+        pass
+
+    @abstractmethod
+    def push(self, key: str, value: Any, maxlen: int = None):
+        """
+        Append to a list， The oldest are dropped beyond maxlen
+        """
+        pass
+
+    @abstractmethod
+    def pop(self, key: str) -> Any:
+        """
+        Remove and return the oldest item of a list， None when empty
+        """
+        pass
+
+    @abstractmethod
+    def publish(self, channel: str, data: Any, origin: str):
+        """
+        Broadcast a message to the other processes
+        """
+        pass
+
+    @abstractmethod
+    def poll(self, after: Optional[int], until: int = None) -> Tuple[int, List[Tuple[str, str, Any]]]:
+        """
+        Messages broadcast after a position
+        :param after:  Position returned by the last poll， Only the current position when empty
+        :param until:  Last position to read， All messages when empty
+        :return:  New position，[( Channel,  Origin,  Data)]
+        """
+        pass
+
+    @abstractmethod
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Acquire or renew a lease， Fails while another owner holds it
+        """
+        pass
+
+    @abstractmethod
+    def release(self, name: str, owner: str):
+        pass
+
+    def close(self):
+        pass
+
+
+class LocalStateBackend(StateBackend):
+    """
+    State in the memory of the only process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        #  Key -> ( Value,  Expiry time)
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def __get(self, key: str) -> Any:
+        value, expires = self._values.get(key, (None, None))
+        if expires and expires < time.time():
+            self._values.pop(key, None)
+            return None
+        return value
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self.__get(key)
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        with self._lock:
+            self._values[key] = (value, time.time() + ttl if ttl else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def keys(self, prefix: str) -> List[str]:
+        with self._lock:
+            return [key for key in list(self._values) if key.startswith(prefix) and self.__get(key) is not None]
+
+    def push(self, key: str, value: Any, maxlen: int = None):
+        with self._lock:
+            items = self.__get(key) or []
+            items.append(value)
+            if maxlen:
+                del items[:-maxlen]
+            self._values[key] = (items, None)
+
+    def pop(self, key: str) -> Any:
+        with self._lock:
+            items = self.__get(key)
+            return items.pop(0) if items else None
+
+    def publish(self, channel: str, data: Any, origin: str):
+        pass
+
+    def poll(self, after: Optional[int], until: int = None) -> Tuple[int, List[Tuple[str, str, Any]]]:
+        return 0, []
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        return True
+
+    def release(self, name: str, owner: str):
+        pass
+
+
+class SqliteStateBackend(StateBackend):
+    """
+    State in a SQLite file shared by the processes of one host
+    """
+    #  Time broadcast messages are kept， Unit seconds
+    _message_ttl = 60
+
+    def __init__(self, path: Path = None):
+        self._path = str(path or settings.TEMP_PATH / "state.db")
+        self._local = threading.local()
+        with self.__transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS kv "
+                         "(key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS bus "
+                         "(id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT, origin TEXT, data BLOB, created REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS lease "
+                         "(name TEXT PRIMARY KEY, owner TEXT, expires REAL)")
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Connection of the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if not conn:
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def __transaction(self):
+        """
+        Write transaction， Locks the database at the start so read-modify-write is atomic between processes
+        """
+        conn = self.__connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __get(self, conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute("SELECT value, expires FROM kv WHERE key = ?", (key,)).fetchone()
+        if not row or (row[1] and row[1] < time.time()):
+            return None
+        return pickle.loads(row[0])
+
+    @staticmethod
+    def __set(conn: sqlite3.Connection, key: str, value: Any, ttl: float = None):
+        conn.execute("INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                     (key, pickle.dumps(value), time.time() + ttl if ttl else None))
+
+    def get(self, key: str) -> Any:
+        return self.__get(self.__connect(), key)
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        self.__set(self.__connect(), key, value, ttl)
+
+    def delete(self, key: str):
+        self.__connect().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def keys(self, prefix: str) -> List[str]:
+        rows = self.__connect().execute("SELECT key FROM kv WHERE substr(key, 1, ?) = ? "
+                                        "AND (expires IS NULL OR expires > ?)",
+                                        (len(prefix), prefix, time.time())).fetchall()
+        return [row[0] for row in rows]
+
+    def push(self, key: str, value: Any, maxlen: int = None):
+        with self.__transaction() as conn:
+            items = self.__get(conn, key) or []
+            items.append(value)
+            if maxlen:
+                del items[:-maxlen]
+            self.__set(conn, key, items)
+
+    def pop(self, key: str) -> Any:
+        with self.__transaction() as conn:
+            items = self.__get(conn, key)
+            if not items:
+                return None
+            item = items.pop(0)
+            self.__set(conn, key, items)
+            return item
+
+    def publish(self, channel: str, data: Any, origin: str):
+        now = time.time()
+        with self.__transaction() as conn:
+            cursor = conn.execute("INSERT INTO bus (channel, origin, data, created) VALUES (?, ?, ?, ?)",
+                                  (channel, origin, pickle.dumps(data), now))
+            if cursor.lastrowid % 100 == 0:
+                conn.execute("DELETE FROM bus WHERE created < ?", (now - self._message_ttl,))
+
+    def poll(self, after: Optional[int], until: int = None) -> Tuple[int, List[Tuple[str, str, Any]]]:
+        conn = self.__connect()
+        if after is None:
+            row = conn.execute("SELECT MAX(id) FROM bus").fetchone()
+            return row[0] or 0, []
+        if until is None:
+            rows = conn.execute("SELECT id, channel, origin, data FROM bus WHERE id > ? ORDER BY id",
+                                (after,)).fetchall()
+        else:
+            rows = conn.execute("SELECT id, channel, origin, data FROM bus WHERE id > ? AND id <= ? ORDER BY id",
+                                (after, until)).fetchall()
+        if not rows:
+            return after, []
+        return rows[-1][0], [(row[1], row[2], pickle.loads(row[3])) for row in rows]
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self.__transaction() as conn:
+            row = conn.execute("SELECT owner, expires FROM lease WHERE name = ?", (name,)).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO lease (name, owner, expires) VALUES (?, ?, ?)",
+                         (name, owner, now + ttl))
+            return True
+
+    def release(self, name: str, owner: str):
+        self.__connect().execute("DELETE FROM lease WHERE name = ? AND owner = ?", (name, owner))
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn:
+            conn.close()
+            self._local.conn = None
+
+
+class SharedState(metaclass=Singleton):
+    """
+    State shared between worker processes and leader election，
+    With one worker everything stays in memory and this process leads every role
+    """
+    #  Available backends
+    _backends = {
+        "local": LocalStateBackend,
+        "sqlite": SqliteStateBackend
+    }
+    #  Validity period of leases and presence， Unit seconds， Renewed every third of it
+    _lease_ttl = 15
+    #  Interval of polling broadcast messages， Unit seconds
+    _poll_interval = 0.5
+    #  PubSub channels forwarded to the other processes， Including real-time logs so every process shows all records
+    _pubsub_channels = ("progress.", "message", "logging")
+
+    def __init__(self):
+        name = settings.STATE_BACKEND or ("sqlite" if settings.WORKERS > 1 else "local")
+        backend = self._backends.get(name)
+        if not backend:
+            logger.warning(f" Shared state backend {name}  Does not exist， Use local")
+            backend = LocalStateBackend
+        self.backend: StateBackend = backend()
+        self.owner = f"{socket.gethostname()}-{os.getpid()}"
+        self._lock = threading.Lock()
+        #  Role -> [( Elected callback,  Lost callback)]， Several components may follow one role
+        self._roles: Dict[str, List[Tuple[Callable, Optional[Callable]]]] = {}
+        #  Roles led by this process
+        self._leading: Set[str] = set()
+        #  Roles just gained， Their missed messages are not replayed yet
+        self._replays: Set[str] = set()
+        #  Channel prefix -> [( Callback of broadcast messages from the other processes,  Role consuming them)]
+        self._listeners: Dict[str, List[Tuple[Callable[[str, Any], None], Optional[str]]]] = {}
+        #  Name -> Number of local users， Visible to the other processes
+        self._presence: Dict[str, int] = {}
+        #  Role callbacks run in order off the lease thread， A slow callback never delays renewal
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-state-role")
+        self._event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lease_thread: Optional[threading.Thread] = None
+        if self.shared:
+            logger.info(f" Shared state backend：{name}， Process {self.owner}")
+            PubSub().bridge(self, self._pubsub_channels)
+
+    @property
+    def shared(self) -> bool:
+        """
+        Whether state is shared with other processes
+        """
+        return not isinstance(self.backend, LocalStateBackend)
+
+    def get(self, key: str) -> Any:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        self.backend.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self.backend.delete(key)
+
+    def push(self, key: str, value: Any, maxlen: int = None):
+        self.backend.push(key, value, maxlen)
+
+    def pop(self, key: str) -> Any:
+        return self.backend.pop(key)
+
+    def publish(self, channel: str, data: Any):
+        """
+        Broadcast a message to the other processes， Not delivered to this process
+        """
+        if self.shared:
+            self.backend.publish(channel, data, self.owner)
+
+    def listen(self, prefix: str, callback: Callable[[str, Any], None], role: str = None):
+        """
+        Receive messages broadcast by the other processes， Callbacks run in the polling thread
+        :param prefix:  Channel prefix
+        :param callback:  Input parameters are the channel and data
+        :param role:  Only the leader of the role receives the messages， A new leader also receives those sent while no process led it
+        """
+        with self._lock:
+            self._listeners.setdefault(prefix, []).append((callback, role))
+        self.__start()
+
+    def elect(self, role: str, on_elected: Callable[[], None], on_lost: Callable[[], None] = None):
+        """
+        Take part in the election of a role， Callbacks run when this process gains or loses it
+        """
+        if not self.shared:
+            self._leading.add(role)
+            on_elected()
+            return
+        with self._lock:
+            self._roles.setdefault(role, []).append((on_elected, on_lost))
+            leading = role in self._leading
+        if leading:
+            on_elected()
+        else:
+            self.__campaign()
+        self.__start()
+
+    def is_leader(self, role: str) -> bool:
+        """
+        Whether this process leads a role
+        """
+        return not self.shared or role in self._leading
+
+    def enter(self, name: str):
+        """
+        Record a local user of a name， Such as a subscriber of a channel
+        """
+        with self._lock:
+            self._presence[name] = self._presence.get(name, 0) + 1
+        if self.shared:
+            self.backend.set(f"presence.{name}.{self.owner}", self._presence[name], self._lease_ttl)
+
+    def leave(self, name: str):
+        with self._lock:
+            count = self._presence.get(name, 0) - 1
+            if count > 0:
+                self._presence[name] = count
+            else:
+                self._presence.pop(name, None)
+        if self.shared and count <= 0:
+            self.backend.delete(f"presence.{name}.{self.owner}")
+
+    def present(self, name: str) -> bool:
+        """
+        Whether any process has users of a name
+        """
+        if self._presence.get(name):
+            return True
+        return self.shared and bool(self.backend.keys(f"presence.{name}."))
+
+    def __start(self):
+        with self._lock:
+            if self._thread or not self.shared:
+                return
+            self._thread = threading.Thread(target=self.__run, name="shared-state", daemon=True)
+            self._thread.start()
+            self._lease_thread = threading.Thread(target=self.__renew, name="shared-state-lease", daemon=True)
+            self._lease_thread.start()
+
+    def __renew(self):
+        """
+        Renew leases and presence， Apart from polling so slow message callbacks never delay it
+        """
+        while not self._event.wait(self._lease_ttl / 3):
+            try:
+                self.__campaign()
+                for name, count in list(self._presence.items()):
+                    self.backend.set(f"presence.{name}.{self.owner}", count, self._lease_ttl)
+            except Exception as err:
+                logger.error(f" Shared state renewal error：{err}")
+
+    def __run(self):
+        """
+        Poll broadcast messages， The leader of a role records the position it consumed up to
+        """
+        position, _ = self.backend.poll(None)
+        saved = time.time()
+        while not self._event.wait(self._poll_interval):
+            try:
+                with self._lock:
+                    replays, self._replays = self._replays, set()
+                    serving = set(self._leading)
+                replays &= serving
+                for role in replays:
+                    self.__replay(role, position)
+                position, messages = self.backend.poll(position)
+                received = set()
+                for channel, origin, data in messages:
+                    if origin != self.owner:
+                        received |= self.__dispatch(channel, data, serving)
+                if time.time() - saved > self._lease_ttl / 3:
+                    saved = time.time()
+                    received = serving
+                for role in received | replays:
+                    self.backend.set(f"role.{role}.position", position, self._lease_ttl * 4)
+            except Exception as err:
+                logger.error(f" Shared state polling error：{err}")
+
+    def __replay(self, role: str, position: int):
+        """
+        Deliver the messages of a role gained by this process that no leader consumed，
+        Including those this process sent before it was elected
+        :param position:  Position polled by this process， Later messages are delivered by polling
+        """
+        start = self.backend.get(f"role.{role}.position")
+        if start is None or start >= position:
+            return
+        _, messages = self.backend.poll(start, position)
+        for channel, _, data in messages:
+            self.__dispatch(channel, data, {role}, unbound=False)
+        if messages:
+            logger.info(f" Process {self.owner}  Replayed {len(messages)}  Messages of {role}")
+
+    def __dispatch(self, channel: str, data: Any, roles: Set[str], unbound: bool = True) -> Set[str]:
+        """
+        Deliver a message to the listeners of its channel
+        :param roles:  Roles whose listeners receive it
+        :param unbound:  Whether listeners without a role receive it
+        :return:  Roles whose listeners received it
+        """
+        received = set()
+        for prefix, listeners in list(self._listeners.items()):
+            if not channel.startswith(prefix):
+                continue
+            for callback, role in listeners:
+                if (role and role not in roles) or (not role and not unbound):
+                    continue
+                if role:
+                    received.add(role)
+                try:
+                    callback(channel, data)
+                except Exception as err:
+                    logger.error(f" Shared message {channel}  Handling error：{err}")
+        return received
+
+    def __campaign(self):
+        """
+        Acquire or renew the leases of all roles， Callbacks run in the role thread
+        """
+        for role in list(self._roles):
+            leading = self.backend.acquire(f"role.{role}", self.owner, self._lease_ttl)
+            with self._lock:
+                if leading == (role in self._leading):
+                    continue
+                if leading:
+                    self._leading.add(role)
+                    self._replays.add(role)
+                else:
+                    self._leading.discard(role)
+                    self._replays.discard(role)
+                callbacks = list(self._roles[role])
+            if leading:
+                logger.info(f" Process {self.owner}  Elected {role}")
+            else:
+                logger.warning(f" Process {self.owner}  Lost {role}")
+            self._executor.submit(self.__notify, role, leading, callbacks)
+
+    @staticmethod
+    def __notify(role: str, leading: bool, callbacks: List[Tuple[Callable, Optional[Callable]]]):
+        for on_elected, on_lost in callbacks:
+            try:
+                if leading:
+                    on_elected()
+                elif on_lost:
+                    on_lost()
+            except Exception as err:
+                logger.error(f" Role {role}  Callback error：{err}")
+
+    def stop(self):
+        """
+        Stop polling and give up roles
+        """
+        self._event.set()
+        if self._thread:
+            self._thread.join()
+        if self._lease_thread:
+            self._lease_thread.join()
+        self._executor.shutdown(wait=False)
+        if not self.shared:
+            return
+        for role in list(self._leading):
+            self.backend.release(f"role.{role}", self.owner)
+        for name in list(self._presence):
+            self.backend.delete(f"presence.{name}.{self.owner}")
+        self._leading.clear()
+        self.backend.close()
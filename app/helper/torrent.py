@@ -1,14 +1,15 @@
 import datetime
+import pickle
 import re
 from pathlib import Path
-from typing import Tuple, Optional, List, Union
+from typing import Tuple, Optional, List, Union, Dict, Any
 from urllib.parse import unquote
 
 from requests import Response
 from torrentool.api import Torrent
 
 from app.core.config import settings
-from app.core.context import Context
+from app.core.context import Context, TorrentInfo, MediaInfo
 from app.core.metainfo import MetaInfo
 from app.db.systemconfig_oper import SystemConfigOper
 from app.log import logger
@@ -188,6 +189,8 @@ class TorrentHelper:
         """
         if not torrent_list:
             return []
+        #  Priority rules， Read once for the whole list
+        priority = self.system_config.get(SystemConfigKey.TorrentsPriority)
 
         def get_sort_str(_context):
             """
@@ -207,8 +210,6 @@ class TorrentHelper:
             else:
                 #  Episode number (of a tv series etc)越多的排越前面
                 _episode_len = str(len(_meta.episode_list)).rjust(4, '0')
-            #  Priority rules
-            priority = self.system_config.get(SystemConfigKey.TorrentsPriority)
             if priority != "site":
                 #  Arrange in order： Caption、 Resource type、 Breed、 End of a season
                 return "%s%s%s%s" % (str(_media.title).ljust(100, ' '),
@@ -258,6 +259,62 @@ class TorrentHelper:
 
         return result
 
+    @staticmethod
+    def pack_cache(cache: Dict[str, List[Context]]) -> dict:
+        """
+        Convert the seed cache to a compact form for saving， Seeds are stored as columns，
+        Identical media information is stored once
+        """
+        medias: List[bytes] = []
+        media_indexes: Dict[bytes, int] = {}
+        sites = {}
+        for domain, contexts in cache.items():
+            indexes = []
+            for context in contexts:
+                media = pickle.dumps(context.media_info)
+                if media not in media_indexes:
+                    media_indexes[media] = len(medias)
+                    medias.append(media)
+                indexes.append(media_indexes[media])
+            sites[domain] = {
+                "torrents": TorrentInfo.to_columns([context.torrent_info for context in contexts]),
+                "metas": [context.meta_info for context in contexts],
+                "medias": indexes
+            }
+        return {"__version__": 2, "medias": medias, "sites": sites}
+
+    @staticmethod
+    def unpack_cache(data: Any) -> Dict[str, List[Context]]:
+        """
+        Restore the seed cache from the compact form， Caches of the old form are returned as is
+        """
+        if not isinstance(data, dict) or "__version__" not in data:
+            return data
+        medias = [pickle.loads(media) for media in data.get("medias") or []]
+        #  Container attributes of each media， Found once instead of per context
+        containers = [[key for key, value in media.__dict__.items() if isinstance(value, (list, dict))]
+                      for media in medias]
+
+        def __clone_media(index: int) -> MediaInfo:
+            """
+            Each context gets its own media information， Containers are not shared
+            """
+            media = MediaInfo.__new__(MediaInfo)
+            state = media.__dict__
+            state.update(medias[index].__dict__)
+            for key in containers[index]:
+                state[key] = state[key].copy()
+            return media
+
+        cache = {}
+        for domain, site in (data.get("sites") or {}).items():
+            torrents = TorrentInfo.from_columns(site.get("torrents") or {})
+            cache[domain] = [Context(meta_info=meta,
+                                     media_info=__clone_media(index),
+                                     torrent_info=torrent)
+                             for meta, index, torrent in zip(site.get("metas"), site.get("medias"), torrents)]
+        return cache
+
     @staticmethod
     def get_torrent_episodes(files: list) -> list:
         """
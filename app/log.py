@@ -4,6 +4,8 @@ from logging.handlers import RotatingFileHandler
 import click
 
 from app.core.config import settings
+from app.helper.pubsub import PubSub
+from app.utils.singleton import Singleton
 
 # logger
 logger = logging.getLogger()
@@ -16,12 +18,76 @@ else:
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.DEBUG)
 
+#  Log file， Written and rotated by one process only
+class WorkerFileHandler(RotatingFileHandler):
+    """
+    With several worker processes only the process leading the role writes the log file，
+    The other processes forward their records to it
+    """
+    #  Role of the writing process， The same as the scheduler
+    role = "scheduler"
+    #  Forward channel
+    channel = "logging.file"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._listening = False
+
+    @staticmethod
+    def __state():
+        """
+        Shared state once it is created， Not created by logging
+        """
+        from app.helper.sharedstate import SharedState
+        return Singleton._instances.get(SharedState)
+
+    def emit(self, record):
+        state = self.__state()
+        if not state or not state.shared:
+            super().emit(record)
+            return
+        if not self._listening:
+            self._listening = True
+            state.listen(self.channel, self.__receive, role=self.role)
+        if state.is_leader(self.role):
+            super().emit(record)
+            return
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message = f"{message}\n{self.formatter.formatException(record.exc_info)}"
+            state.publish(self.channel, {
+                "name": record.name,
+                "levelno": record.levelno,
+                "levelname": record.levelname,
+                "filename": record.filename,
+                "created": record.created,
+                "msecs": record.msecs,
+                "msg": message
+            })
+        except Exception:
+            self.handleError(record)
+
+    def __receive(self, channel: str, data: dict):
+        """
+        Record forwarded by another worker process， Never forwarded again
+        """
+        state = self.__state()
+        if not state or not state.is_leader(self.role):
+            return
+        self.acquire()
+        try:
+            super().emit(logging.makeLogRecord(data))
+        finally:
+            self.release()
+
+
 #  Creating file outputHandler
-file_handler = RotatingFileHandler(filename=settings.LOG_PATH / 'moviepilot.log',
-                                   mode='w',
-                                   maxBytes=5 * 1024 * 1024,
-                                   backupCount=3,
-                                   encoding='utf-8')
+file_handler = WorkerFileHandler(filename=settings.LOG_PATH / 'moviepilot.log',
+                                 mode='a',
+                                 maxBytes=5 * 1024 * 1024,
+                                 backupCount=3,
+                                 encoding='utf-8')
 file_handler.setLevel(logging.INFO)
 level_name_colors = {
     logging.DEBUG: lambda level_name: click.style(str(level_name), fg="cyan"),
@@ -51,3 +117,24 @@ logger.addHandler(console_handler)
 file_formater = CustomFormatter("【%(levelname)s】%(asctime)s - %(filename)s - %(message)s")
 file_handler.setFormatter(file_formater)
 logger.addHandler(file_handler)
+
+
+#  Log publishing， Pushed to real-time log subscribers
+class PubSubHandler(logging.Handler):
+    #  Publish channel
+    channel = "logging"
+
+    def emit(self, record):
+        pubsub = PubSub()
+        if not pubsub.has_subscribers(self.channel):
+            return
+        try:
+            pubsub.publish(self.channel, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+pubsub_handler = PubSubHandler()
+pubsub_handler.setLevel(logging.INFO)
+pubsub_handler.setFormatter(file_formater)
+logger.addHandler(pubsub_handler)
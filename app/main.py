@@ -1,4 +1,3 @@
-import multiprocessing
 import os
 import sys
 import threading
@@ -23,6 +22,7 @@ from app.core.module import ModuleManager
 from app.core.plugin import PluginManager
 from app.db.init import init_db, update_db
 from app.helper.display import DisplayHelper
+from app.helper.sharedstate import SharedState
 from app.helper.sites import SitesHelper
 from app.scheduler import Scheduler
 
@@ -41,7 +41,7 @@ App.add_middleware(
 
 # uvicorn Service
 Server = uvicorn.Server(Config(App, host=settings.HOST, port=settings.PORT,
-                               reload=settings.DEV, workers=multiprocessing.cpu_count()))
+                               reload=settings.DEV, workers=settings.WORKERS))
 
 
 def init_routers():
@@ -147,6 +147,8 @@ def shutdown_server():
     DisplayHelper().stop()
     #  Stop timing service
     Scheduler().stop()
+    #  Give up roles of this worker
+    SharedState().stop()
     # Stopping front-end services
     stop_frontend()
 
@@ -182,4 +184,8 @@ if __name__ == '__main__':
     #  Updating the database
     update_db()
     #  Activate (a plan)API Service
-    Server.run()
+    if settings.WORKERS > 1 and not SystemUtils.is_frozen():
+        #  Several worker processes load the application by its import path
+        uvicorn.run("app.main:App", host=settings.HOST, port=settings.PORT, workers=settings.WORKERS)
+    else:
+        Server.run()
@@ -1,7 +1,9 @@
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from threading import Lock
-from typing import Optional, List, Tuple, Union, Dict
+from threading import Lock, Semaphore
+from typing import Optional, List, Tuple, Union, Dict, Callable
 
 from jinja2 import Template
 
@@ -9,16 +11,26 @@ from app.core.config import settings
 from app.core.context import MediaInfo
 from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfo
+from app.helper.progress import ProgressHelper
 from app.log import logger
 from app.modules import _ModuleBase
 from app.schemas import TransferInfo, ExistMediaInfo, TmdbEpisode
-from app.schemas.types import MediaType
+from app.schemas.types import MediaType, ProgressKey
 from app.utils.system import SystemUtils
 
 lock = Lock()
 
+#  Concurrency limit of each source and destination device
+_device_semaphores: Dict[Tuple[int, int], Semaphore] = {}
+
 
 class FileTransferModule(_ModuleBase):
+    #  Number of files transferred in parallel within a directory
+    _max_workers = 4
+    #  Number of files copied or moved in parallel between the same devices
+    _device_limit = 2
+    #  Minimum interval of progress updates of a file， Unit seconds， Each update is a shared state write
+    _progress_interval = 1
 
     def init_module(self) -> None:
         pass
@@ -60,6 +72,46 @@ class FileTransferModule(_ModuleBase):
                                    target_dir=target,
                                    episodes_info=episodes_info)
 
+    @staticmethod
+    def __get_device_semaphore(file_item: Path, target_file: Path) -> Semaphore:
+        """
+        Get the concurrency semaphore of the source and destination devices
+        """
+        target_dir = target_file.parent
+        while not target_dir.exists() and target_dir != target_dir.parent:
+            target_dir = target_dir.parent
+        try:
+            key = (file_item.stat().st_dev, target_dir.stat().st_dev)
+        except OSError:
+            key = (0, 0)
+        with lock:
+            if key not in _device_semaphores:
+                _device_semaphores[key] = Semaphore(FileTransferModule._device_limit)
+            return _device_semaphores[key]
+
+    @staticmethod
+    def __get_progress_callback(file_item: Path) -> Callable[[int, int], None]:
+        """
+        Progress callback of a single file， Updates the transfer progress text at most once per interval and on completion
+        """
+        progress = ProgressHelper()
+        last_percent = [-1]
+        last_time = [0.0]
+
+        def callback(copied: int, total: int):
+            percent = int(copied * 100 / total) if total else 100
+            if percent == last_percent[0]:
+                return
+            now = time.time()
+            if percent < 100 and now - last_time[0] < FileTransferModule._progress_interval:
+                return
+            last_percent[0] = percent
+            last_time[0] = now
+            progress.update(key=ProgressKey.FileTransfer,
+                            text=f" Transferring {file_item.name} {percent}% ...")
+
+        return callback
+
     @staticmethod
     def __transfer_command(file_item: Path, target_file: Path, transfer_type: str) -> int:
         """
@@ -68,27 +120,32 @@ class FileTransferModule(_ModuleBase):
         :param target_file:  Target file path
         :param transfer_type: RmtMode Migration pattern
         """
-        with lock:
-
-            #  Divert or distract (attention etc)
-            if transfer_type == 'link':
-                #  Hard link
-                retcode, retmsg = SystemUtils.link(file_item, target_file)
-            elif transfer_type == 'softlink':
-                #  Soft link (computing)
-                retcode, retmsg = SystemUtils.softlink(file_item, target_file)
-            elif transfer_type == 'move':
-                #  Mobility
-                retcode, retmsg = SystemUtils.move(file_item, target_file)
-            elif transfer_type == 'rclone_move':
-                # Rclone Move
-                retcode, retmsg = SystemUtils.rclone_move(file_item, target_file)
-            elif transfer_type == 'rclone_copy':
-                # Rclone Copy
-                retcode, retmsg = SystemUtils.rclone_copy(file_item, target_file)
-            else:
-                #  Make a copy of
-                retcode, retmsg = SystemUtils.copy(file_item, target_file)
+        #  Divert or distract (attention etc)
+        if transfer_type == 'link':
+            #  Hard link
+            retcode, retmsg = SystemUtils.link(file_item, target_file)
+        elif transfer_type == 'softlink':
+            #  Soft link (computing)
+            retcode, retmsg = SystemUtils.softlink(file_item, target_file)
+        else:
+            #  Data copying operations are limited per device
+            with FileTransferModule.__get_device_semaphore(file_item, target_file):
+                if transfer_type == 'move':
+                    #  Mobility
+                    retcode, retmsg = SystemUtils.move(
+                        file_item, target_file,
+                        callback=FileTransferModule.__get_progress_callback(file_item))
+                elif transfer_type == 'rclone_move':
+                    # Rclone Move
+                    retcode, retmsg = SystemUtils.rclone_move(file_item, target_file)
+                elif transfer_type == 'rclone_copy':
+                    # Rclone Copy
+                    retcode, retmsg = SystemUtils.rclone_copy(file_item, target_file)
+                else:
+                    #  Make a copy of
+                    retcode, retmsg = SystemUtils.copy(
+                        file_item, target_file,
+                        callback=FileTransferModule.__get_progress_callback(file_item))
 
         if retcode != 0:
             logger.error(retmsg)
@@ -270,12 +327,12 @@ class FileTransferModule(_ModuleBase):
 
     def __transfer_dir_files(self, src_dir: Path, target_dir: Path, transfer_type: str) -> int:
         """
-        Transfer all files in a directory by directory structure
+        Transfer all files in a directory by directory structure， Files are transferred in parallel
         :param src_dir:  Original path
         :param target_dir:  New pathway
         :param transfer_type: RmtMode Migration pattern
         """
-        retcode = 0
+        tasks = []
         for file in src_dir.glob("**/*"):
             #  Filter out directories
             if file.is_dir():
@@ -287,13 +344,15 @@ class FileTransferModule(_ModuleBase):
                 continue
             if not new_file.parent.exists():
                 new_file.parent.mkdir(parents=True, exist_ok=True)
-            retcode = self.__transfer_command(file_item=file,
-                                              target_file=new_file,
-                                              transfer_type=transfer_type)
-            if retcode != 0:
-                break
-
-        return retcode
+            tasks.append((file, new_file))
+        if not tasks:
+            return 0
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            retcodes = list(executor.map(lambda task: self.__transfer_command(file_item=task[0],
+                                                                              target_file=task[1],
+                                                                              transfer_type=transfer_type),
+                                         tasks))
+        return next((retcode for retcode in retcodes if retcode != 0), 0)
 
     def __transfer_file(self, file_item: Path, new_file: Path, transfer_type: str,
                         over_flag: bool = False) -> int:
@@ -11,6 +11,10 @@ from app.modules.filter.RuleParser import RuleParser
 class FilterModule(_ModuleBase):
     #  Rules parser
     parser: RuleParser = None
+    #  Parsed rule strings， Rule string -> [ Rule group]
+    _parsed: Dict[str, list] = {}
+    #  Maximum number of parsed rule strings kept
+    _max_parsed = 64
     #  Media information
     media: MediaInfo = None
 
@@ -103,6 +107,7 @@ class FilterModule(_ModuleBase):
 
     def init_module(self) -> None:
         self.parser = RuleParser()
+        self._parsed = {}
 
     def stop(self):
         pass
@@ -171,21 +176,29 @@ class FilterModule(_ModuleBase):
                 return False
         return True
 
+    def __parse_rules(self, rule_str: str) -> list:
+        """
+        Parse multilevel rules once for every rule string， Rules from settings change rarely
+        """
+        parsed = self._parsed.get(rule_str)
+        if parsed is None:
+            parsed = [self.parser.parse(rule_group.strip()).as_list()[0] for rule_group in rule_str.split('>')]
+            if len(self._parsed) >= self._max_parsed:
+                self._parsed.clear()
+            self._parsed[rule_str] = parsed
+        return parsed
+
     def __get_order(self, torrent: TorrentInfo, rule_str: str) -> Optional[TorrentInfo]:
         """
         Get rule priority for seed matches， The larger the value, the higher the priority， Returns if not matchedNone
         """
-        #  Multilevel rule
-        rule_groups = rule_str.split('>')
         #  Prioritization
         res_order = 100
         #  Whether or not it matches
         matched = False
 
-        for rule_group in rule_groups:
-            #  Parse rule set
-            parsed_group = self.parser.parse(rule_group.strip())
-            if self.__match_group(torrent, parsed_group.as_list()[0]):
+        for parsed_group in self.__parse_rules(rule_str):
+            if self.__match_group(torrent, parsed_group):
                 #  Interrupt when a match occurs
                 matched = True
                 logger.info(f" Torrent {torrent.site_name} - {torrent.title}  Priority is {100 - res_order + 1}")
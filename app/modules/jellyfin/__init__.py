@@ -3,6 +3,7 @@ from typing import Optional, Tuple, Union, Any, List, Generator
 
 from app import schemas
 from app.core.context import MediaInfo
+from app.helper.refresh import RefreshQueue
 from app.log import logger
 from app.modules import _ModuleBase
 from app.modules.jellyfin.jellyfin import Jellyfin
@@ -11,9 +12,11 @@ from app.schemas.types import MediaType
 
 class JellyfinModule(_ModuleBase):
     jellyfin: Jellyfin = None
+    _refresh_queue: RefreshQueue = None
 
     def init_module(self) -> None:
         self.jellyfin = Jellyfin()
+        self._refresh_queue = RefreshQueue("jellyfin", lambda _: self.jellyfin.refresh_root_library())
 
     def init_setting(self) -> Tuple[str, Union[str, bool]]:
         return "MEDIASERVER", "jellyfin"
@@ -27,7 +30,8 @@ class JellyfinModule(_ModuleBase):
             self.jellyfin.reconnect()
 
     def stop(self):
-        pass
+        if self._refresh_queue:
+            self._refresh_queue.stop()
 
     def user_authenticate(self, name: str, password: str) -> Optional[str]:
         """
@@ -101,7 +105,8 @@ class JellyfinModule(_ModuleBase):
         :param file_path:   File path
         :return:  Success or failure
         """
-        self.jellyfin.refresh_root_library()
+        # Jellyfin Refreshes the whole media library， All targets are merged into one
+        self._refresh_queue.put("/", file_path)
 
     def media_statistic(self) -> List[schemas.Statistic]:
         """
@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union, Optional, Dict, Generator, Tuple
 
 from requests import Response
@@ -12,6 +13,10 @@ from app.utils.singleton import Singleton
 
 
 class Jellyfin(metaclass=Singleton):
+    #  Number of items per page when crawling the library
+    _page_size = 500
+    #  Number of pages fetched in parallel
+    _page_workers = 4
 
     def __init__(self):
         self._host = settings.JELLYFIN_HOST
@@ -505,54 +510,79 @@ class Jellyfin(metaclass=Singleton):
         try:
             res = RequestUtils().get_res(req_url)
             if res and res.status_code == 200:
-                item = res.json()
-                tmdbid = item.get("ProviderIds", {}).get("Tmdb")
-                return schemas.MediaServerItem(
-                    server="jellyfin",
-                    library=item.get("ParentId"),
-                    item_id=item.get("Id"),
-                    item_type=item.get("Type"),
-                    title=item.get("Name"),
-                    original_title=item.get("OriginalTitle"),
-                    year=item.get("ProductionYear"),
-                    tmdbid=int(tmdbid) if tmdbid else None,
-                    imdbid=item.get("ProviderIds", {}).get("Imdb"),
-                    tvdbid=item.get("ProviderIds", {}).get("Tvdb"),
-                    path=item.get("Path")
-                )
+                return self.__format_item(res.json())
         except Exception as e:
             logger.error(f" GroutUsers/Items Make a mistake：" + str(e))
         return None
 
-    def get_items(self, parent: str) -> Generator:
+    @staticmethod
+    def __format_item(item: dict) -> schemas.MediaServerItem:
+        """
+        Convert media server project data to MediaServerItem
+        """
+        tmdbid = item.get("ProviderIds", {}).get("Tmdb")
+        return schemas.MediaServerItem(
+            server="jellyfin",
+            library=item.get("ParentId"),
+            item_id=item.get("Id"),
+            item_type=item.get("Type"),
+            title=item.get("Name"),
+            original_title=item.get("OriginalTitle"),
+            year=item.get("ProductionYear"),
+            tmdbid=int(tmdbid) if tmdbid else None,
+            imdbid=item.get("ProviderIds", {}).get("Imdb"),
+            tvdbid=item.get("ProviderIds", {}).get("Tvdb"),
+            path=item.get("Path")
+        )
+
+    def __get_items_page(self, parent: str, start: int) -> Tuple[List[dict], int]:
         """
-        Get a list of all media libraries on the media server
+        Get a page of movies and series under a media library， Recursive to all subfolders，
+        Sorted by name and ID so that pages neither overlap nor skip items
+        :return:  Project list,  Total number of items， Raises IOError if the page cannot be fetched
         """
-        if not parent:
-            yield None
-        if not self._host or not self._apikey:
-            yield None
-        req_url = "%sUsers/%s/Items?parentId=%s&api_key=%s" % (self._host, self.user, parent, self._apikey)
+        req_url = "%sUsers/%s/Items?ParentId=%s&Recursive=true&IncludeItemTypes=Movie,Series" \
+                  "&Fields=ProviderIds,OriginalTitle,ProductionYear,Path,ParentId&SortBy=SortName,Id" \
+                  "&StartIndex=%s&Limit=%s&api_key=%s" % (self._host, self.user, parent,
+                                                         start, self._page_size, self._apikey)
         try:
             res = RequestUtils().get_res(req_url)
             if res and res.status_code == 200:
-                results = res.json().get("Items") or []
-                for result in results:
-                    if not result:
-                        continue
-                    if result.get("Type") in ["Movie", "Series"]:
-                        yield self.get_iteminfo(result.get("Id"))
-                    elif "Folder" in result.get("Type"):
-                        for item in self.get_items(result.get("Id")):
-                            yield item
+                result = res.json()
+                return result.get("Items") or [], result.get("TotalRecordCount") or 0
+            error = f" Status code {res.status_code}" if res is not None else " No response"
         except Exception as e:
-            logger.error(f" GroutUsers/Items Make a mistake：" + str(e))
-        yield None
+            error = str(e)
+        #  A missing page would leave the synchronized data incomplete
+        raise IOError(f" GroutUsers/Items Make a mistake：{error}")
 
-    def get_data(self, url: str) -> Optional[Response]:
+    def get_items(self, parent: str) -> Generator:
+        """
+        Get all movies and series of a media library， Fetched by page， Pages after the first are fetched in parallel，
+        Raises IOError when a page cannot be fetched
+        """
+        if not parent:
+            return
+        if not self._host or not self._apikey:
+            return
+        items, total = self.__get_items_page(parent=parent, start=0)
+        for item in items:
+            if item:
+                yield self.__format_item(item)
+        if total <= self._page_size:
+            return
+        starts = range(self._page_size, total, self._page_size)
+        with ThreadPoolExecutor(max_workers=self._page_workers) as executor:
+            for items, _ in executor.map(lambda start: self.__get_items_page(parent=parent, start=start), starts):
+                for item in items:
+                    if item:
+                        yield self.__format_item(item)
+
+    def get_data(self, url: str, headers: dict = None) -> Optional[Response]:
         """
         CustomizableURL Getting data from the media server， Included among these[HOST]、[APIKEY]、[USER] Will be replaced with the actual value
         :param url:  Request address
+        :param headers:  Request header， Used as is when provided
         """
         if not self._host or not self._apikey:
             return None
@@ -560,7 +590,10 @@ class Jellyfin(metaclass=Singleton):
             .replace("[APIKEY]", self._apikey) \
             .replace("[USER]", self.user)
         try:
-            return RequestUtils(accept_type="application/json").get_res(url=url)
+            return RequestUtils(
+                headers=headers,
+                accept_type="application/json"
+            ).get_res(url=url)
         except Exception as e:
             logger.error(f" GroutJellyfin Make a mistake：" + str(e))
             return None
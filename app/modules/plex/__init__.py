@@ -3,6 +3,7 @@ from typing import Optional, Tuple, Union, Any, List, Generator
 
 from app import schemas
 from app.core.context import MediaInfo
+from app.helper.refresh import RefreshQueue
 from app.log import logger
 from app.modules import _ModuleBase
 from app.modules.plex.plex import Plex
@@ -11,12 +12,15 @@ from app.schemas.types import MediaType
 
 class PlexModule(_ModuleBase):
     plex: Plex = None
+    _refresh_queue: RefreshQueue = None
 
     def init_module(self) -> None:
         self.plex = Plex()
+        self._refresh_queue = RefreshQueue("plex", self.plex.refresh_library_by_items)
 
     def stop(self):
-        pass
+        if self._refresh_queue:
+            self._refresh_queue.stop()
 
     def init_setting(self) -> Tuple[str, Union[str, bool]]:
         return "MEDIASERVER", "plex"
@@ -95,16 +99,14 @@ class PlexModule(_ModuleBase):
         :param file_path:   File path
         :return:  Success or failure
         """
-        items = [
-            schemas.RefreshMediaItem(
-                title=mediainfo.title,
-                year=mediainfo.year,
-                type=mediainfo.type,
-                category=mediainfo.category,
-                target_path=file_path
-            )
-        ]
-        self.plex.refresh_library_by_items(items)
+        #  Collected and refreshed in batches， The same path is refreshed only once
+        self._refresh_queue.put(str(file_path), schemas.RefreshMediaItem(
+            title=mediainfo.title,
+            year=mediainfo.year,
+            type=mediainfo.type,
+            category=mediainfo.category,
+            target_path=file_path
+        ))
 
     def media_statistic(self) -> List[schemas.Statistic]:
         """
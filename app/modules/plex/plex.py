@@ -14,6 +14,8 @@ from app.utils.singleton import Singleton
 
 
 class Plex(metaclass=Singleton):
+    #  Number of items per page when crawling the library
+    _page_size = 500
 
     def __init__(self):
         self._host = settings.PLEX_HOST
@@ -351,7 +353,7 @@ class Plex(metaclass=Singleton):
         try:
             section = self._plex.library.sectionByID(int(parent))
             if section:
-                for item in section.all():
+                for item in section.all(container_size=self._page_size):
                     if not item:
                         continue
                     ids = self.__get_ids(item.guids)
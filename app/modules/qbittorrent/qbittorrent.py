@@ -1,5 +1,6 @@
+import threading
 import time
-from typing import Optional, Union, Tuple, List
+from typing import Optional, Union, Tuple, List, Dict, Callable
 
 import qbittorrentapi
 from qbittorrentapi import TorrentDictionary, TorrentFilesList
@@ -20,10 +21,24 @@ class Qbittorrent(metaclass=Singleton):
 
     qbc: Client = None
 
+    #  Seed states of the status_filter used， Same asqbittorrent Filter definitions
+    _status_states = {
+        "seeding": ["uploading", "stalledUP", "checkingUP", "queuedUP", "forcedUP"],
+        "downloading": ["downloading", "metaDL", "forcedMetaDL", "stalledDL", "checkingDL", "pausedDL",
+                        "queuedDL", "forcedDL"]
+    }
+
     def __init__(self):
         self._host, self._port = StringUtils.get_domain_address(address=settings.QB_HOST, prefix=True)
         self._username = settings.QB_USER
         self._password = settings.QB_PASSWORD
+        #  Shared seed snapshots， Incremental synchronization via sync/maindata
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Dict[str, dict] = {}
+        self._snapshot_rid = 0
+        self._snapshot_time = 0
+        self._snapshot_expired = False
+        self._snapshot_listeners: List[Callable[[List[str], List[str]], None]] = []
         if self._host and self._port:
             self.qbc = self.__login_qbittorrent()
 
@@ -40,6 +55,7 @@ class Qbittorrent(metaclass=Singleton):
         Reconnect
         """
         self.qbc = self.__login_qbittorrent()
+        self.expire_snapshot(full=True)
 
     def __login_qbittorrent(self) -> Optional[Client]:
         """
@@ -65,20 +81,26 @@ class Qbittorrent(metaclass=Singleton):
 
     def get_torrents(self, ids: Union[str, list] = None,
                      status: Union[str, list] = None,
-                     tags: Union[str, list] = None) -> Tuple[List[TorrentDictionary], bool]:
+                     tags: Union[str, list] = None,
+                     max_age: float = None) -> Tuple[List[TorrentDictionary], bool]:
         """
         Get seed list
+        :param max_age:  Filter the shared seed snapshot no older than this many seconds instead of querying， Used by periodic tasks
         return:  Seed list,  Whether or not an abnormality occurs
         """
         if not self.qbc:
             return [], True
+        if tags and not isinstance(tags, list):
+            tags = [tags]
+        if max_age is not None:
+            snapshot = self.get_torrents_snapshot(max_age=max_age)
+            if snapshot is not None:
+                return self.__filter_torrents(snapshot, ids=ids, status=status, tags=tags), False
         try:
             torrents = self.qbc.torrents_info(torrent_hashes=ids,
                                               status_filter=status)
             if tags:
                 results = []
-                if not isinstance(tags, list):
-                    tags = [tags]
                 for torrent in torrents:
                     torrent_tags = [str(tag).strip() for tag in torrent.get("tags").split(',')]
                     if set(tags).issubset(set(torrent_tags)):
@@ -89,29 +111,124 @@ class Qbittorrent(metaclass=Singleton):
             logger.error(f"Get seed list出错：{err}")
             return [], True
 
+    def __filter_torrents(self, snapshot: Dict[str, TorrentDictionary],
+                          ids: Union[str, list] = None,
+                          status: Union[str, list] = None,
+                          tags: list = None) -> List[TorrentDictionary]:
+        """
+        Filter the seed snapshot the same way as torrents_info
+        """
+        if ids:
+            if not isinstance(ids, list):
+                ids = [ids]
+            torrents = [snapshot[torrent_hash] for torrent_hash in ids if torrent_hash in snapshot]
+        else:
+            torrents = list(snapshot.values())
+        if status:
+            if not isinstance(status, list):
+                status = [status]
+            states = set()
+            for state in status:
+                states.update(self._status_states.get(state) or [])
+            torrents = [torrent for torrent in torrents if torrent.get("state") in states]
+        if tags:
+            torrents = [torrent for torrent in torrents
+                        if set(tags).issubset(set(str(tag).strip() for tag in (torrent.get("tags") or "").split(',')))]
+        return torrents
+
+    def get_torrents_snapshot(self, max_age: float = 3) -> Optional[Dict[str, TorrentDictionary]]:
+        """
+        Get shared seed snapshots， Snapshots within max_age Seconds are reused directly， Otherwise incremental synchronization
+        :param max_age:  Maximum age of a snapshot， Unit seconds
+        return:  TorrentHash -> Seed information,  Returns if an exception occursNone
+        """
+        if not self.qbc:
+            return None
+        with self._snapshot_lock:
+            if self._snapshot_expired or time.time() - self._snapshot_time > max_age:
+                try:
+                    maindata = self.qbc.sync_maindata(rid=self._snapshot_rid)
+                except Exception as err:
+                    logger.error(f" Synchronized seed snapshot error：{err}")
+                    self._snapshot_rid = 0
+                    return None
+                if maindata.get("full_update"):
+                    removed = list(set(self._snapshot.keys()) - set((maindata.get("torrents") or {}).keys()))
+                    self._snapshot = {}
+                else:
+                    removed = list(maindata.get("torrents_removed") or [])
+                for torrent_hash in removed:
+                    self._snapshot.pop(torrent_hash, None)
+                changed = []
+                for torrent_hash, data in (maindata.get("torrents") or {}).items():
+                    self._snapshot.setdefault(torrent_hash, {"hash": torrent_hash}).update(data)
+                    changed.append(torrent_hash)
+                self._snapshot_rid = maindata.get("rid") or 0
+                self._snapshot_time = time.time()
+                self._snapshot_expired = False
+                if changed or removed:
+                    self.__notify_snapshot_listeners(changed, removed)
+            return {torrent_hash: TorrentDictionary(data=dict(data), client=self.qbc)
+                    for torrent_hash, data in self._snapshot.items()}
+
+    def expire_snapshot(self, full: bool = False):
+        """
+        Expire the seed snapshot， The next acquisition will be resynchronized
+        :param full:  Whether or not to synchronize in full
+        """
+        self._snapshot_expired = True
+        if full:
+            self._snapshot_rid = 0
+
+    def add_snapshot_listener(self, listener: Callable[[List[str], List[str]], None]):
+        """
+        Register seed snapshot change listener， Called with the changed and removed seedsHash
+        """
+        if listener not in self._snapshot_listeners:
+            self._snapshot_listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener: Callable[[List[str], List[str]], None]):
+        """
+        Remove seed snapshot change listener
+        """
+        if listener in self._snapshot_listeners:
+            self._snapshot_listeners.remove(listener)
+
+    def __notify_snapshot_listeners(self, changed: List[str], removed: List[str]):
+        for listener in list(self._snapshot_listeners):
+            try:
+                listener(changed, removed)
+            except Exception as err:
+                logger.error(f" Seed snapshot listener error：{err}")
+
     def get_completed_torrents(self, ids: Union[str, list] = None,
-                               tags: Union[str, list] = None) -> Optional[List[TorrentDictionary]]:
+                               tags: Union[str, list] = None,
+                               max_age: float = None) -> Optional[List[TorrentDictionary]]:
         """
         Access to completed seeds
+        :param max_age:  Filter the shared seed snapshot， See get_torrents
         return:  Seed list,  Returns if an exception occursNone
         """
         if not self.qbc:
             return None
         # completed Will contain the movement state  Replace with obtainingseeding State of affairs  Includes event uploads,  It's being planted.,  And compulsory seeding
-        torrents, error = self.get_torrents(status=["seeding"], ids=ids, tags=tags)
+        torrents, error = self.get_torrents(status=["seeding"], ids=ids, tags=tags, max_age=max_age)
         return None if error else torrents or []
 
     def get_downloading_torrents(self, ids: Union[str, list] = None,
-                                 tags: Union[str, list] = None) -> Optional[List[TorrentDictionary]]:
+                                 tags: Union[str, list] = None,
+                                 max_age: float = None) -> Optional[List[TorrentDictionary]]:
         """
         Get the seed being downloaded
+        :param max_age:  Filter the shared seed snapshot， See get_torrents
         return:  Seed list,  Returns if an exception occursNone
         """
         if not self.qbc:
             return None
         torrents, error = self.get_torrents(ids=ids,
                                             status=["downloading"],
-                                            tags=tags)
+                                            tags=tags,
+                                            max_age=max_age)
         return None if error else torrents or []
 
     def remove_torrents_tag(self, ids: Union[str, list], tag: Union[str, list]) -> bool:
@@ -124,6 +241,7 @@ class Qbittorrent(metaclass=Singleton):
             return False
         try:
             self.qbc.torrents_delete_tags(torrent_hashes=ids, tags=tag)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Remove seedsTag出错：{err}")
@@ -138,6 +256,7 @@ class Qbittorrent(metaclass=Singleton):
         try:
             #  Labeling
             self.qbc.torrents_add_tags(tags=tags, torrent_hashes=ids)
+            self.expire_snapshot()
         except Exception as err:
             logger.error(f" Setting the seedTag Make a mistake：{err}")
 
@@ -247,6 +366,7 @@ class Qbittorrent(metaclass=Singleton):
                                             cookie=cookie,
                                             category=category,
                                             **kwargs)
+            self.expire_snapshot()
             return True if qbc_ret and str(qbc_ret).find("Ok") != -1 else False
         except Exception as err:
             logger.error(f"Add seeds出错：{err}")
@@ -260,6 +380,7 @@ class Qbittorrent(metaclass=Singleton):
             return False
         try:
             self.qbc.torrents_resume(torrent_hashes=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Seeding出错：{err}")
@@ -273,6 +394,7 @@ class Qbittorrent(metaclass=Singleton):
             return False
         try:
             self.qbc.torrents_pause(torrent_hashes=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Suspension of seeds出错：{err}")
@@ -288,11 +410,30 @@ class Qbittorrent(metaclass=Singleton):
             return False
         try:
             self.qbc.torrents_delete(delete_files=delete_file, torrent_hashes=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Delete seeds出错：{err}")
             return False
 
+    def move_torrents(self, ids: Union[str, list], location: str) -> bool:
+        """
+        Batch move seed storage location
+        :param ids:  TorrentHash Listings
+        :param location:  New storage location
+        """
+        if not self.qbc:
+            return False
+        if not ids or not location:
+            return False
+        try:
+            self.qbc.torrents_set_location(location=location, torrent_hashes=ids)
+            self.expire_snapshot()
+            return True
+        except Exception as err:
+            logger.error(f" Error moving seed：{err}")
+            return False
+
     def get_files(self, tid: str) -> Optional[TorrentFilesList]:
         """
         Access to the list of seed files
@@ -359,7 +500,9 @@ class Qbittorrent(metaclass=Singleton):
         if not self.qbc:
             return False
         try:
-            return self.qbc.torrents_recheck(torrent_hashes=ids)
+            ret = self.qbc.torrents_recheck(torrent_hashes=ids)
+            self.expire_snapshot()
+            return ret
         except Exception as err:
             logger.error(f"Re-calibrate seeds出错：{err}")
             return False
@@ -7,6 +7,7 @@ from typing import Optional
 
 from app.core.config import settings
 from app.core.meta import MetaBase
+from app.helper.sharedstate import SharedState
 from app.utils.singleton import Singleton
 from app.schemas.types import MediaType
 
@@ -149,8 +150,10 @@ class TmdbCache(metaclass=Singleton):
 
     def save(self, force: bool = False) -> None:
         """
-        Save cached data to file
+        Save cached data to file， Only by the process running scheduled tasks when there are several workers
         """
+        if not SharedState().is_leader("scheduler"):
+            return
 
         meta_data = self.__load(self._meta_path)
         new_meta_data = {k: v for k, v in self._meta_data.items() if v.get("id")}
@@ -1,4 +1,6 @@
-from typing import Optional, Union, Tuple, List
+import threading
+import time
+from typing import Optional, Union, Tuple, List, Dict, Callable
 
 import transmission_rpc
 from transmission_rpc import Client, Torrent, File
@@ -23,11 +25,25 @@ class Transmission(metaclass=Singleton):
               "leftUntilDone", "rateDownload", "rateUpload", "recheckProgress", "rateDownload", "rateUpload",
               "peersGettingFromUs", "peersSendingToUs", "uploadRatio", "uploadedEver", "downloadedEver", "downloadDir",
               "error", "errorString", "doneDate", "queuePosition", "activityDate", "trackers"]
+    #  Fields compared to find the seeds changed since the last snapshot， When recently-active no longer covers the gap
+    _snapshot_diff_arg = ["id", "activityDate", "status", "labels"]
+    # recently-active Only covers the last minute
+    _recently_active_seconds = 50
+    #  Interval of full resynchronization of the snapshot， Unit seconds
+    _snapshot_full_interval = 30 * 60
 
     def __init__(self):
         self._host, self._port = StringUtils.get_domain_address(address=settings.TR_HOST, prefix=False)
         self._username = settings.TR_USER
         self._password = settings.TR_PASSWORD
+        #  Shared seed snapshots， Incremental synchronization via recently-active
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Dict[int, Torrent] = {}
+        self._snapshot_time = 0
+        self._snapshot_expired = False
+        self._snapshot_full = True
+        self._snapshot_full_time = 0
+        self._snapshot_listeners: List[Callable[[List[str], List[str]], None]] = []
         if self._host and self._port:
             self.trc = self.__login_transmission()
 
@@ -61,20 +77,30 @@ class Transmission(metaclass=Singleton):
         Reconnect
         """
         self.trc = self.__login_transmission()
+        self.expire_snapshot(full=True)
 
     def get_torrents(self, ids: Union[str, list] = None, status: Union[str, list] = None,
-                     tags: Union[str, list] = None) -> Tuple[List[Torrent], bool]:
+                     tags: Union[str, list] = None, max_age: float = None) -> Tuple[List[Torrent], bool]:
         """
         Get seed list
+        :param max_age:  Filter the shared seed snapshot no older than this many seconds instead of querying， Used by periodic tasks
         Return results  Seed list,  Are there any errors
         """
         if not self.trc:
             return [], True
-        try:
-            torrents = self.trc.get_torrents(ids=ids, arguments=self._trarg)
-        except Exception as err:
-            logger.error(f"Get seed list出错：{err}")
-            return [], True
+        snapshot = self.get_torrents_snapshot(max_age=max_age) if max_age is not None else None
+        if snapshot is not None:
+            torrents = list(snapshot.values())
+            if ids:
+                if not isinstance(ids, list):
+                    ids = [ids]
+                torrents = [torrent for torrent in torrents if torrent.hashString in ids or torrent.id in ids]
+        else:
+            try:
+                torrents = self.trc.get_torrents(ids=ids, arguments=self._trarg)
+            except Exception as err:
+                logger.error(f"Get seed list出错：{err}")
+                return [], True
         if status and not isinstance(status, list):
             status = [status]
         if tags and not isinstance(tags, list):
@@ -92,25 +118,118 @@ class Transmission(metaclass=Singleton):
             ret_torrents.append(torrent)
         return ret_torrents, False
 
+    def get_torrents_snapshot(self, max_age: float = 3) -> Optional[Dict[str, Torrent]]:
+        """
+        Get shared seed snapshots， Snapshots within max_age Seconds are reused directly， Otherwise incremental synchronization
+        :param max_age:  Maximum age of a snapshot， Unit seconds
+        return:  TorrentHash -> Seed information,  Returns when an error occursNone
+        """
+        if not self.trc:
+            return None
+        with self._snapshot_lock:
+            if self._snapshot_expired or time.time() - self._snapshot_time > max_age:
+                now = time.time()
+                try:
+                    if self._snapshot_full or now - self._snapshot_full_time > self._snapshot_full_interval:
+                        torrents = self.trc.get_torrents(arguments=self._trarg)
+                        removed_ids = list(set(self._snapshot.keys()) - set(torrent.id for torrent in torrents))
+                        self._snapshot = {}
+                        self._snapshot_full_time = now
+                    elif now - self._snapshot_time <= self._recently_active_seconds:
+                        torrents, removed_ids = self.trc.get_recently_active_torrents(arguments=self._trarg)
+                    else:
+                        torrents, removed_ids = self.__get_changed_torrents()
+                except Exception as err:
+                    logger.error(f" Synchronized seed snapshot error：{err}")
+                    self._snapshot_full = True
+                    return None
+                removed = []
+                for torrent_id in removed_ids:
+                    torrent = self._snapshot.pop(torrent_id, None)
+                    if torrent:
+                        removed.append(torrent.hashString)
+                changed = []
+                for torrent in torrents:
+                    self._snapshot[torrent.id] = torrent
+                    changed.append(torrent.hashString)
+                self._snapshot_full = False
+                self._snapshot_time = now
+                self._snapshot_expired = False
+                if changed or removed:
+                    self.__notify_snapshot_listeners(changed, removed)
+            return {torrent.hashString: torrent for torrent in self._snapshot.values()}
+
+    def __get_changed_torrents(self) -> Tuple[List[Torrent], List[int]]:
+        """
+        Seeds changed since the last snapshot， Found by comparing a few fields of all seeds，
+        Only the changed seeds are fetched with all fields
+        :return:  Changed seeds,  Removed seedsID
+        """
+        current = self.trc.get_torrents(arguments=self._snapshot_diff_arg)
+        removed_ids = list(set(self._snapshot.keys()) - set(torrent.id for torrent in current))
+        changed_ids = []
+        for torrent in current:
+            cached = self._snapshot.get(torrent.id)
+            if not cached or any(cached.fields.get(field) != torrent.fields.get(field)
+                                 for field in self._snapshot_diff_arg):
+                changed_ids.append(torrent.id)
+        torrents = self.trc.get_torrents(ids=changed_ids, arguments=self._trarg) if changed_ids else []
+        return torrents, removed_ids
+
+    def expire_snapshot(self, full: bool = False):
+        """
+        Expire the seed snapshot， The next acquisition will be resynchronized
+        :param full:  Whether or not to synchronize in full
+        """
+        self._snapshot_expired = True
+        if full:
+            self._snapshot_full = True
+
+    def add_snapshot_listener(self, listener: Callable[[List[str], List[str]], None]):
+        """
+        Register seed snapshot change listener， Called with the changed and removed seedsHash
+        """
+        if listener not in self._snapshot_listeners:
+            self._snapshot_listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener: Callable[[List[str], List[str]], None]):
+        """
+        Remove seed snapshot change listener
+        """
+        if listener in self._snapshot_listeners:
+            self._snapshot_listeners.remove(listener)
+
+    def __notify_snapshot_listeners(self, changed: List[str], removed: List[str]):
+        for listener in list(self._snapshot_listeners):
+            try:
+                listener(changed, removed)
+            except Exception as err:
+                logger.error(f" Seed snapshot listener error：{err}")
+
     def get_completed_torrents(self, ids: Union[str, list] = None,
-                               tags: Union[str, list] = None) -> Optional[List[Torrent]]:
+                               tags: Union[str, list] = None,
+                               max_age: float = None) -> Optional[List[Torrent]]:
         """
         Get a list of completed seeds
+        :param max_age:  Filter the shared seed snapshot， See get_torrents
         return  Seed list,  Returns when an error occursNone
         """
         if not self.trc:
             return None
         try:
-            torrents, error = self.get_torrents(status=["seeding", "seed_pending"], ids=ids, tags=tags)
+            torrents, error = self.get_torrents(status=["seeding", "seed_pending"], ids=ids, tags=tags,
+                                               max_age=max_age)
             return None if error else torrents or []
         except Exception as err:
             logger.error(f"Get a list of completed seeds出错：{err}")
             return None
 
     def get_downloading_torrents(self, ids: Union[str, list] = None,
-                                 tags: Union[str, list] = None) -> Optional[List[Torrent]]:
+                                 tags: Union[str, list] = None,
+                                 max_age: float = None) -> Optional[List[Torrent]]:
         """
         Get a list of seeds being downloaded
+        :param max_age:  Filter the shared seed snapshot， See get_torrents
         return  Seed list,  Returns when an error occursNone
         """
         if not self.trc:
@@ -118,13 +237,14 @@ class Transmission(metaclass=Singleton):
         try:
             torrents, error = self.get_torrents(ids=ids,
                                                 status=["downloading", "download_pending", "stopped"],
-                                                tags=tags)
+                                                tags=tags,
+                                                max_age=max_age)
             return None if error else torrents or []
         except Exception as err:
             logger.error(f"Get a list of seeds being downloaded出错：{err}")
             return None
 
-    def set_torrent_tag(self, ids: str, tags: list) -> bool:
+    def set_torrent_tag(self, ids: Union[str, list], tags: list) -> bool:
         """
         Setting seed labels
         """
@@ -134,6 +254,7 @@ class Transmission(metaclass=Singleton):
             return False
         try:
             self.trc.change_torrent(labels=tags, ids=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Setting seed labels出错：{err}")
@@ -156,11 +277,13 @@ class Transmission(metaclass=Singleton):
         if not self.trc:
             return None
         try:
-            return self.trc.add_torrent(torrent=content,
-                                        download_dir=download_dir,
-                                        paused=is_paused,
-                                        labels=labels,
-                                        cookies=cookie)
+            torrent = self.trc.add_torrent(torrent=content,
+                                           download_dir=download_dir,
+                                           paused=is_paused,
+                                           labels=labels,
+                                           cookies=cookie)
+            self.expire_snapshot()
+            return torrent
         except Exception as err:
             logger.error(f" Error adding seed：{err}")
             return None
@@ -173,6 +296,7 @@ class Transmission(metaclass=Singleton):
             return False
         try:
             self.trc.start_torrent(ids=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Seeding出错：{err}")
@@ -186,6 +310,7 @@ class Transmission(metaclass=Singleton):
             return False
         try:
             self.trc.stop_torrent(ids=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Stop seed出错：{err}")
@@ -201,11 +326,30 @@ class Transmission(metaclass=Singleton):
             return False
         try:
             self.trc.remove_torrent(delete_data=delete_file, ids=ids)
+            self.expire_snapshot()
             return True
         except Exception as err:
             logger.error(f"Delete seeds出错：{err}")
             return False
 
+    def move_torrents(self, ids: Union[str, list], location: str) -> bool:
+        """
+        Batch move seed storage location
+        :param ids:  TorrentHash Listings
+        :param location:  New storage location
+        """
+        if not self.trc:
+            return False
+        if not ids or not location:
+            return False
+        try:
+            self.trc.move_torrent_data(ids=ids, location=location)
+            self.expire_snapshot()
+            return True
+        except Exception as err:
+            logger.error(f" Error moving seed：{err}")
+            return False
+
     def get_files(self, tid: str) -> Optional[List[File]]:
         """
         Get a list of seed files
@@ -278,7 +422,9 @@ class Transmission(metaclass=Singleton):
         if not self.trc:
             return False
         try:
-            return self.trc.verify_torrent(ids=ids)
+            ret = self.trc.verify_torrent(ids=ids)
+            self.expire_snapshot()
+            return ret
         except Exception as err:
             logger.error(f"Re-calibrate seeds出错：{err}")
             return False
@@ -1427,7 +1427,7 @@ class BrushFlow(_PluginBase):
                 "downloaded": 0
             }
             #  Getting seeds from the downloader
-            torrents, error = downloader.get_torrents(ids=check_hashs)
+            torrents, error = downloader.get_torrents(ids=check_hashs, max_age=60)
             if error:
                 logger.warn(" Error connecting to downloader， Will retry at next time cycle")
                 return
@@ -1868,7 +1868,7 @@ class BrushFlow(_PluginBase):
         downlader = self.__get_downloader(self._downloader)
         if not downlader:
             return 0
-        torrents = downlader.get_downloading_torrents()
+        torrents = downlader.get_downloading_torrents(max_age=60)
         return len(torrents) or 0
 
     @staticmethod
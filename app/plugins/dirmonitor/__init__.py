@@ -213,8 +213,7 @@ class DirMonitor(_PluginBase):
 
                 #  Fully locked
                 with lock:
-                    transfer_history = self.transferhis.get_by_src(event_path)
-                    if transfer_history:
+                    if self.transferhis.exists_by_src(event_path):
                         logger.debug(" Documentation has been processed：%s" % event_path)
                         return
 
@@ -233,13 +232,12 @@ class DirMonitor(_PluginBase):
                                 logger.info(f"{event_path}  Hit filter keywords {keyword}， Not dealt with")
                                 return
 
-                    #  Sorting out blocked words not dealt with
-                    transfer_exclude_words = self.systemconfig.get(SystemConfigKey.TransferExcludeWords)
+                    #  Sorting out blocked words not dealt with， Compiled once per change
+                    transfer_exclude_words = self.systemconfig.cached(SystemConfigKey.TransferExcludeWords,
+                                                                      TransferChain.compile_exclude_words)
                     if transfer_exclude_words:
-                        for keyword in transfer_exclude_words:
-                            if not keyword:
-                                continue
-                            if keyword and re.search(r"%s" % keyword, event_path, re.IGNORECASE):
+                        for keyword, keyword_re in transfer_exclude_words:
+                            if keyword_re.search(event_path):
                                 logger.info(f"{event_path}  Hit listener's blocking words (computing) {keyword}， Not dealt with")
                                 return
 
@@ -248,11 +246,6 @@ class DirMonitor(_PluginBase):
                         logger.debug(f"{event_path}  It's not a media file.")
                         return
 
-                    #  Query history， Transferred not processed
-                    if self.transferhis.get_by_src(event_path):
-                        logger.info(f"{event_path}  Organized.")
-                        return
-
                     #  Metadata
                     file_meta = MetaInfoPath(file_path)
                     if not file_meta.name:
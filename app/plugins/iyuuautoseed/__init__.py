@@ -446,7 +446,7 @@ class IYUUAutoSeed(_PluginBase):
             logger.info(f" Start scanning the downloader {downloader} ...")
             downloader_obj = self.__get_downloader(downloader)
             #  Getting completed seeds in the downloader
-            torrents = downloader_obj.get_completed_torrents()
+            torrents = downloader_obj.get_completed_torrents(max_age=60)
             if torrents:
                 logger.info(f" Downloader {downloader}  Number of seeds completed：{len(torrents)}")
             else:
@@ -539,7 +539,7 @@ class IYUUAutoSeed(_PluginBase):
             #  Downloader
             downloader_obj = self.__get_downloader(downloader)
             #  Get the status of the seed in the downloader
-            torrents, _ = downloader_obj.get_torrents(ids=recheck_torrents)
+            torrents, _ = downloader_obj.get_torrents(ids=recheck_torrents, max_age=60)
             if torrents:
                 can_seeding_torrents = []
                 for torrent in torrents:
@@ -751,7 +751,7 @@ class IYUUAutoSeed(_PluginBase):
         self.realtotal += 1
         #  Consult (a document etc)hash Whether the value is already in the downloader
         downloader_obj = self.__get_downloader(downloader)
-        torrent_info, _ = downloader_obj.get_torrents(ids=[seed.get("info_hash")])
+        torrent_info, _ = downloader_obj.get_torrents(ids=[seed.get("info_hash")], max_age=60)
         if torrent_info:
             logger.info(f"{seed.get('info_hash')}  Already in the downloader， Skip over ...")
             self.exist += 1
@@ -22,6 +22,18 @@ from app.modules.transmission import Transmission
 from app.plugins import _PluginBase
 from app.schemas.types import NotificationType, EventType, MediaType
 
+#  Deleted media entries in the log
+_EMBY_DEL_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}.\d{3}) Info App: Removing item from database, '
+                               r'Type: (\w+), Name: (.*), Path: (.*), Id: (\d+)')
+_JELLYFIN_DEL_PATTERN = re.compile(r'\[(.*?)\].*?Removing item, Type: "(.*?)", Name: "(.*?)", Path: "(.*?)"')
+#  Media path information
+_YEAR_PATTERN = re.compile(r'\(\d+\)')
+_NAME_PATTERN = re.compile(r"\/([\u4e00-\u9fa5]+)(?= \()")
+_SEASON_PATTERN = re.compile(r"Season\s*(\d+)")
+_EPISODE_PATTERN = re.compile(r"S\d+E(\d+)")
+# Content-Range Total length in response header
+_CONTENT_RANGE_PATTERN = re.compile(r"/(\d+|\*)\s*$")
+
 
 class MediaSyncDel(_PluginBase):
     #  Plug-in name
@@ -60,6 +72,8 @@ class MediaSyncDel(_PluginBase):
     _downloadhis = None
     qb = None
     tr = None
+    #  Log file read offset
+    _log_offsets: Dict[str, int] = {}
 
     def init_plugin(self, config: dict = None):
         self._transferchain = TransferChain(self.db)
@@ -721,6 +735,7 @@ class MediaSyncDel(_PluginBase):
         #  Read history
         history = self.get_data('history') or []
         last_time = self.get_data("last_time")
+        self._log_offsets = self.get_data("log_offsets") or {}
         del_medias = []
 
         #  Media server type， Many of, Segregation
@@ -736,6 +751,9 @@ class MediaSyncDel(_PluginBase):
                 # TODO plex Parsing logs
                 return
 
+        #  Save log read offset
+        self.save_data("log_offsets", self._log_offsets)
+
         if not del_medias:
             logger.error(" No resolution to deleted media messages")
             return
@@ -1049,90 +1067,135 @@ class MediaSyncDel(_PluginBase):
 
         return handle_cnt
 
-    @staticmethod
-    def parse_emby_log(last_time):
+    def __fetch_log_tail(self, server: Any, log_url: str, file_name: str) -> Optional[str]:
         """
-        Gainemby Log list、 Analyzeemby Log (computing)
+        Incremental reading of media server logs， Request only new content after the last read offset
+        Falls back to a full read when the log has been rotated or the server does not support Range
+        :param server:  Media server instance， Emby/Jellyfin
+        :param log_url:  Log download address
+        :param file_name:  Log file name， Used as offset record key
+        :return:  Newly added full lines of log text
         """
+        offset = int(self._log_offsets.get(file_name) or 0)
+        log_res = None
+        if offset:
+            log_res = server.get_data(log_url, headers={"Range": f"bytes={offset}-"})
+            if log_res is not None and log_res.status_code == 416:
+                #  Content-Range: bytes */total
+                total_match = _CONTENT_RANGE_PATTERN.search(log_res.headers.get("Content-Range") or "")
+                total = int(total_match.group(1)) if total_match and total_match.group(1) != "*" else None
+                if total == offset:
+                    #  No new content
+                    return ""
+                if total is not None and total < offset:
+                    #  The log file has been rotated， Re-read from scratch
+                    logger.info(f" Media server log {file_name}  Rotated， Re-read in full")
+                    self._log_offsets[file_name] = offset = 0
+                #  Size unknown, Read in full to confirm
+                log_res = None
+        if log_res is None or log_res.status_code not in (200, 206):
+            log_res = server.get_data(log_url)
+        if not log_res or log_res.status_code not in (200, 206):
+            return None
+
+        content = log_res.content or b""
+        if log_res.status_code == 206:
+            #  Content-Range: bytes start-end/total
+            content_range = log_res.headers.get("Content-Range") or ""
+            total_match = _CONTENT_RANGE_PATTERN.search(content_range)
+            if total_match and total_match.group(1) != "*" and int(total_match.group(1)) < offset:
+                #  The log file has been rotated， Re-read from scratch
+                logger.info(f" Media server log {file_name}  Rotated， Re-read in full")
+                self._log_offsets[file_name] = 0
+                return self.__fetch_log_tail(server=server, log_url=log_url, file_name=file_name)
+        elif len(content) >= offset:
+            #  Server ignoredRange， Intercept new content locally
+            content = content[offset:]
+        else:
+            #  File size smaller than the last offset， Log rotated
+            logger.info(f" Media server log {file_name}  Rotated， Re-read in full")
+            offset = 0
 
-        def __parse_log(file_name: str, del_list: list):
-            """
-            Analyzeemby Log (computing)
-            """
-            log_url = f"[HOST]System/Logs/{file_name}?api_key=[APIKEY]"
-            log_res = Emby().get_data(log_url)
-            if not log_res or log_res.status_code != 200:
-                logger.error(" Gainemby Log failure， Please check the server configuration")
-                return del_list
-
-            #  Regular parsing of deleted media messages
-            pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}.\d{3}) Info App: Removing item from database, Type: (\w+), Name: (.*), Path: (.*), Id: (\d+)'
-            matches = re.findall(pattern, log_res.text)
+        #  Only consume complete lines， Incomplete last line left for next read
+        end = content.rfind(b"\n") + 1
+        self._log_offsets[file_name] = offset + end
+        return content[:end].decode("utf-8", errors="ignore")
 
-            #  Cyclic access to media information
-            for match in matches:
-                mtime = match[0]
-                #  Exclusion of processed media messages
-                if last_time and mtime < last_time:
-                    continue
+    @staticmethod
+    def __parse_del_medias(log_text: str, pattern: Any, last_time: Any, del_list: list) -> list:
+        """
+        Parsing deleted media messages from log text
+        :param log_text:  Log text
+        :param pattern:  Precompiled regular of deleted entries， Groups are time, type, name, path
+        :param last_time:  Last processing time
+        :param del_list:  Deleted media list
+        """
+        #  Cyclic access to media information
+        for match in pattern.finditer(log_text):
+            mtime = match.group(1)
+            #  Exclusion of processed media messages
+            if last_time and mtime < str(last_time):
+                continue
 
-                mtype = match[1]
-                name = match[2]
-                path = match[3]
-
-                year = None
-                year_pattern = r'\(\d+\)'
-                year_match = re.search(year_pattern, path)
-                if year_match:
-                    year = year_match.group()[1:-1]
-
-                season = None
-                episode = None
-                if mtype == 'Episode' or mtype == 'Season':
-                    name_pattern = r"\/([\u4e00-\u9fa5]+)(?= \()"
-                    season_pattern = r"Season\s*(\d+)"
-                    episode_pattern = r"S\d+E(\d+)"
-                    name_match = re.search(name_pattern, path)
-                    season_match = re.search(season_pattern, path)
-                    episode_match = re.search(episode_pattern, path)
-
-                    if name_match:
-                        name = name_match.group(1)
-
-                    if season_match:
-                        season = season_match.group(1)
-                        if int(season) < 10:
-                            season = f'S0{season}'
-                        else:
-                            season = f'S{season}'
+            mtype = match.group(2)
+            name = match.group(3)
+            path = match.group(4)
+
+            year = None
+            year_match = _YEAR_PATTERN.search(path)
+            if year_match:
+                year = year_match.group()[1:-1]
+
+            season = None
+            episode = None
+            if mtype == 'Episode' or mtype == 'Season':
+                name_match = _NAME_PATTERN.search(path)
+                season_match = _SEASON_PATTERN.search(path)
+                episode_match = _EPISODE_PATTERN.search(path)
+
+                if name_match:
+                    name = name_match.group(1)
+
+                if season_match:
+                    season = season_match.group(1)
+                    if int(season) < 10:
+                        season = f'S0{season}'
                     else:
-                        season = None
+                        season = f'S{season}'
+                else:
+                    season = None
 
-                    if episode_match:
-                        episode = episode_match.group(1)
-                        episode = f'E{episode}'
-                    else:
-                        episode = None
-
-                media = {
-                    "time": mtime,
-                    "type": mtype,
-                    "name": name,
-                    "year": year,
-                    "path": path,
-                    "season": season,
-                    "episode": episode,
-                }
-                logger.debug(f" Parsing to delete media：{json.dumps(media)}")
-                del_list.append(media)
+                if episode_match:
+                    episode = episode_match.group(1)
+                    episode = f'E{episode}'
+                else:
+                    episode = None
+
+            media = {
+                "time": mtime,
+                "type": mtype,
+                "name": name,
+                "year": year,
+                "path": path,
+                "season": season,
+                "episode": episode,
+            }
+            logger.debug(f" Parsing to delete media：{json.dumps(media)}")
+            del_list.append(media)
 
-            return del_list
+        return del_list
+
+    def parse_emby_log(self, last_time):
+        """
+        Gainemby Log list、 Incremental analysisemby Log (computing)
+        """
+        emby = Emby()
 
         log_files = []
         try:
             #  Get allemby Log (computing)
             log_list_url = "[HOST]System/Logs/Query?Limit=3&api_key=[APIKEY]"
-            log_list_res = Emby().get_data(log_list_url)
+            log_list_res = emby.get_data(log_list_url)
 
             if log_list_res and log_list_res.status_code == 200:
                 log_files_dict = json.loads(log_list_res.text)
@@ -1148,94 +1211,30 @@ class MediaSyncDel(_PluginBase):
         del_medias = []
         log_files.reverse()
         for log_file in log_files:
-            del_medias = __parse_log(log_file, del_medias)
+            log_text = self.__fetch_log_tail(server=emby,
+                                             log_url=f"[HOST]System/Logs/{log_file}?api_key=[APIKEY]",
+                                             file_name=f"emby:{log_file}")
+            if log_text is None:
+                logger.error(" Gainemby Log failure， Please check the server configuration")
+                continue
+            del_medias = self.__parse_del_medias(log_text=log_text,
+                                                 pattern=_EMBY_DEL_PATTERN,
+                                                 last_time=last_time,
+                                                 del_list=del_medias)
 
         return del_medias
 
-    @staticmethod
-    def parse_jellyfin_log(last_time: datetime):
+    def parse_jellyfin_log(self, last_time: datetime):
         """
-        Gainjellyfin Log list、 Analyzejellyfin Log (computing)
+        Gainjellyfin Log list、 Incremental analysisjellyfin Log (computing)
         """
-
-        def __parse_log(file_name: str, del_list: list):
-            """
-            Analyzejellyfin Log (computing)
-            """
-            log_url = f"[HOST]System/Logs/Log?name={file_name}&api_key=[APIKEY]"
-            log_res = Jellyfin().get_data(log_url)
-            if not log_res or log_res.status_code != 200:
-                logger.error(" Gainjellyfin Log failure， Please check the server configuration")
-                return del_list
-
-            #  Regular parsing of deleted media messages
-            pattern = r'\[(.*?)\].*?Removing item, Type: "(.*?)", Name: "(.*?)", Path: "(.*?)"'
-            matches = re.findall(pattern, log_res.text)
-
-            #  Cyclic access to media information
-            for match in matches:
-                mtime = match[0]
-                #  Exclusion of processed media messages
-                if last_time and mtime < last_time:
-                    continue
-
-                mtype = match[1]
-                name = match[2]
-                path = match[3]
-
-                year = None
-                year_pattern = r'\(\d+\)'
-                year_match = re.search(year_pattern, path)
-                if year_match:
-                    year = year_match.group()[1:-1]
-
-                season = None
-                episode = None
-                if mtype == 'Episode' or mtype == 'Season':
-                    name_pattern = r"\/([\u4e00-\u9fa5]+)(?= \()"
-                    season_pattern = r"Season\s*(\d+)"
-                    episode_pattern = r"S\d+E(\d+)"
-                    name_match = re.search(name_pattern, path)
-                    season_match = re.search(season_pattern, path)
-                    episode_match = re.search(episode_pattern, path)
-
-                    if name_match:
-                        name = name_match.group(1)
-
-                    if season_match:
-                        season = season_match.group(1)
-                        if int(season) < 10:
-                            season = f'S0{season}'
-                        else:
-                            season = f'S{season}'
-                    else:
-                        season = None
-
-                    if episode_match:
-                        episode = episode_match.group(1)
-                        episode = f'E{episode}'
-                    else:
-                        episode = None
-
-                media = {
-                    "time": mtime,
-                    "type": mtype,
-                    "name": name,
-                    "year": year,
-                    "path": path,
-                    "season": season,
-                    "episode": episode,
-                }
-                logger.debug(f" Parsing to delete media：{json.dumps(media)}")
-                del_list.append(media)
-
-            return del_list
+        jellyfin = Jellyfin()
 
         log_files = []
         try:
             #  Get alljellyfin Log (computing)
             log_list_url = "[HOST]System/Logs?api_key=[APIKEY]"
-            log_list_res = Jellyfin().get_data(log_list_url)
+            log_list_res = jellyfin.get_data(log_list_url)
 
             if log_list_res and log_list_res.status_code == 200:
                 log_files_dict = json.loads(log_list_res.text)
@@ -1251,7 +1250,16 @@ class MediaSyncDel(_PluginBase):
         del_medias = []
         log_files.reverse()
         for log_file in log_files:
-            del_medias = __parse_log(log_file, del_medias)
+            log_text = self.__fetch_log_tail(server=jellyfin,
+                                             log_url=f"[HOST]System/Logs/Log?name={log_file}&api_key=[APIKEY]",
+                                             file_name=f"jellyfin:{log_file}")
+            if log_text is None:
+                logger.error(" Gainjellyfin Log failure， Please check the server configuration")
+                continue
+            del_medias = self.__parse_del_medias(log_text=log_text,
+                                                 pattern=_JELLYFIN_DEL_PATTERN,
+                                                 last_time=last_time,
+                                                 del_list=del_medias)
 
         return del_medias
 
@@ -1,4 +1,5 @@
 import re
+import time
 import warnings
 from datetime import datetime, timedelta
 from multiprocessing.dummy import Pool as ThreadPool
@@ -60,6 +61,12 @@ class SiteStatistic(_PluginBase):
     _last_update_time: Optional[datetime] = None
     _sites_data: dict = {}
     _site_schema: List[ISiteUserInfo] = None
+    #  Site domain name -> Site framework， Avoid probing every framework on each refresh
+    _site_schema_cache: Dict[str, str] = {}
+    #  Site name -> Refresh time
+    _sites_timing: Dict[str, float] = {}
+    #  Number of periods kept in the rollups， The totals of each day are also kept next to its data
+    _totals_keep: Dict[str, int] = {"day": 90, "week": 53, "month": 24}
 
     #  Configuration properties
     _enabled: bool = False
@@ -103,6 +110,10 @@ class SiteStatistic(_PluginBase):
             self._last_update_time = None
             #  Site data
             self._sites_data = {}
+            #  Site framework cache
+            self._site_schema_cache = self.get_data("site_schemas") or {}
+            #  Refresh time
+            self._sites_timing = {}
 
             #  Run one immediately
             if self._onlyonce:
@@ -176,6 +187,12 @@ class SiteStatistic(_PluginBase):
             "methods": ["GET"],
             "summary": " Refresh site data",
             "description": " Refresh site data for the corresponding domain",
+        }, {
+            "path": "/totals",
+            "endpoint": self.totals_by_period,
+            "methods": ["GET"],
+            "summary": " Site data totals",
+            "description": " Pre-aggregated totals of all sites by day/week/month",
         }]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -341,6 +358,7 @@ class SiteStatistic(_PluginBase):
         date_list = [(datetime.now() - timedelta(days=i)).date() for i in range(2)]
         #  Last day's check-in data
         stattistic_data: Dict[str, Dict[str, Any]] = {}
+        current_day = None
         for day in date_list:
             current_day = day.strftime("%Y-%m-%d")
             stattistic_data = self.get_data(current_day)
@@ -360,18 +378,17 @@ class SiteStatistic(_PluginBase):
         stattistic_data = dict(sorted(stattistic_data.items(),
                                       key=lambda item: item[1].get('upload') or 0,
                                       reverse=True))
+        #  Pre-aggregated totals of the day， Historical data without totals are calculated on the spot
+        totals = self.get_data(f"totals_{current_day}") \
+            or self.__build_totals(stattistic_data)
         #  Total uploads
-        total_upload = sum([data.get("upload")
-                            for data in stattistic_data.values() if data.get("upload")])
+        total_upload = totals.get("upload") or 0
         #  Total downloads
-        total_download = sum([data.get("download")
-                              for data in stattistic_data.values() if data.get("download")])
+        total_download = totals.get("download") or 0
         #  Total number of species
-        total_seed = sum([data.get("seeding")
-                          for data in stattistic_data.values() if data.get("seeding")])
+        total_seed = totals.get("seeding") or 0
         #  Total seeding volume
-        total_seed_size = sum([data.get("seeding_size")
-                               for data in stattistic_data.values() if data.get("seeding_size")])
+        total_seed_size = totals.get("seeding_size") or 0
 
         #  Site data明细
         site_trs = [
@@ -808,6 +825,56 @@ class SiteStatistic(_PluginBase):
             }
         ]
 
+    @staticmethod
+    def __build_totals(sites_data: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Aggregate the data of all sites in a single pass
+        :param sites_data:  Site name -> Site data
+        """
+        totals = {"upload": 0, "download": 0, "seeding": 0, "seeding_size": 0}
+        for data in sites_data.values():
+            for field in totals:
+                value = data.get(field)
+                if value:
+                    totals[field] += value
+        return totals
+
+    def __save_totals(self, day: str, sites_data: Dict[str, Dict[str, Any]]):
+        """
+        Save the totals of the day under a key of its own， And update the bounded daily, weekly and monthly rollups，
+        The latest value of each period is kept
+        :param day:  Dates YYYY-MM-DD
+        :param sites_data:  Site data of the day
+        """
+        totals = self.__build_totals(sites_data)
+        self.save_data(f"totals_{day}", totals)
+        date = datetime.strptime(day, "%Y-%m-%d")
+        iso_year, iso_week, _ = date.isocalendar()
+        for period, name in (("day", day),
+                             ("week", f"{iso_year}-W{iso_week:02d}"),
+                             ("month", date.strftime("%Y-%m"))):
+            rollup_data = self.get_data(f"totals_{period}") or {}
+            rollup_data[name] = totals
+            #  Only the most recent periods are kept
+            rollup_data = dict(sorted(rollup_data.items())[-self._totals_keep[period]:])
+            self.save_data(f"totals_{period}", rollup_data)
+
+    def get_totals(self, period: str = "day") -> Dict[str, Dict[str, int]]:
+        """
+        Get pre-aggregated totals of the most recent periods
+        :param period:  Statistical period day/week/month
+        :return:  Period -> Aggregate， In chronological order
+        """
+        return dict(sorted((self.get_data(f"totals_{period}") or {}).items()))
+
+    def totals_by_period(self, period: str = "day") -> schemas.Response:
+        """
+        Get pre-aggregated totals， Transferring entityAPI Call (programming)
+        """
+        if period not in ("day", "week", "month"):
+            return schemas.Response(success=False, message=f" Unsupported statistical period {period}")
+        return schemas.Response(success=True, data=self.get_totals(period))
+
     def stop_service(self):
         """
         Exit plugin
@@ -821,10 +888,28 @@ class SiteStatistic(_PluginBase):
         except Exception as e:
             logger.error("Exit plugin失败：%s" % str(e))
 
-    def __build_class(self, html_text: str) -> Any:
+    def __build_class(self, html_text: str, domain: str = None) -> Any:
+        """
+        Match the site framework， Prioritize the framework cached from the last match
+        :param html_text:  Home pageHTML
+        :param domain:  Site domain name
+        """
+        cached_schema = self._site_schema_cache.get(domain) if domain else None
+        if cached_schema:
+            for site_schema in self._site_schema:
+                if site_schema.schema.value != cached_schema:
+                    continue
+                try:
+                    if site_schema.match(html_text):
+                        return site_schema
+                except Exception as e:
+                    logger.error(f" Site match failure {e}")
+                break
         for site_schema in self._site_schema:
             try:
                 if site_schema.match(html_text):
+                    if domain:
+                        self._site_schema_cache[domain] = site_schema.schema.value
                     return site_schema
             except Exception as e:
                 logger.error(f" Site match failure {e}")
@@ -917,7 +1002,7 @@ class SiteStatistic(_PluginBase):
                     return None
             #  Parsing site types
             if html_text:
-                site_schema = self.__build_class(html_text)
+                site_schema = self.__build_class(html_text, domain=StringUtils.get_url_domain(url))
                 if not site_schema:
                     logger.error(" Website %s  Unable to recognize site type" % site_name)
                     return None
@@ -957,6 +1042,7 @@ class SiteStatistic(_PluginBase):
         if not site_url:
             return None
         unread_msg_notify = True
+        start_time = time.time()
         try:
             site_user_info: ISiteUserInfo = self.build(site_info=site_info)
             if site_user_info:
@@ -1001,6 +1087,9 @@ class SiteStatistic(_PluginBase):
 
         except Exception as e:
             logger.error(f" Website {site_name}  Failed to get traffic data：{str(e)}")
+        finally:
+            self._sites_timing[site_name] = round(time.time() - start_time, 2)
+            logger.debug(f" Website {site_name}  Refresh time {self._sites_timing[site_name]}s")
         return None
 
     def __notify_unread_msg(self, site_name: str, site_user_info: ISiteUserInfo, unread_msg_notify: bool):
@@ -1057,6 +1146,9 @@ class SiteStatistic(_PluginBase):
             if not refresh_sites:
                 return
 
+            #  Refresh time
+            self._sites_timing = {}
+
             #  Concurrent refresh
             with ThreadPool(min(len(refresh_sites), int(self._queue_cnt or 5))) as p:
                 p.map(self.__refresh_site_data, refresh_sites)
@@ -1110,9 +1202,21 @@ class SiteStatistic(_PluginBase):
             key = datetime.now().strftime('%Y-%m-%d')
             #  Save data
             self.save_data(key, self._sites_data)
+            #  Save totals
+            self.__save_totals(key, self._sites_data)
 
             #  Update time
             self.save_data("last_update_time", key)
+
+            #  Site framework cache
+            self.save_data("site_schemas", self._site_schema_cache)
+
+            #  Refresh time， Slowest sites first
+            sites_timing = dict(sorted(self._sites_timing.items(), key=lambda x: x[1], reverse=True))
+            self.save_data("site_timing", sites_timing)
+            slow_sites = [f"{site}({seconds}s)" for site, seconds in list(sites_timing.items())[:5]]
+            if slow_sites:
+                logger.info(f" Slowest refreshed sites：{'、'.join(slow_sites)}")
             logger.info(" Site data refresh complete")
 
     def __update_config(self):
@@ -130,7 +130,7 @@ class SyncDownloadFiles(_PluginBase):
             logger.info(f" Start scanning the downloader {downloader} ...")
             downloader_obj = self.__get_downloader(downloader)
             #  Getting completed seeds in the downloader
-            torrents = downloader_obj.get_completed_torrents()
+            torrents = downloader_obj.get_completed_torrents(max_age=60)
             if torrents:
                 logger.info(f" Downloader {downloader}  Number of seeds completed：{len(torrents)}")
             else:
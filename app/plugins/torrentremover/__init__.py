@@ -561,47 +561,32 @@ class TorrentRemover(_PluginBase):
                     downlader_obj = self.__get_downloader(downloader)
                     if self._action == "pause":
                         message_text = f"{downloader.title()}  Total suspension{len(torrents)} Seed"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f" Automatic seed censoring service discontinued")
-                                return
-                            text_item = f"{torrent.get('name')} " \
-                                        f" From the site：{torrent.get('site')} " \
-                                        f" Adults and children：{StringUtils.str_filesize(torrent.get('size'))}"
-                            #  Suspension of seeds
-                            downlader_obj.stop_torrents(ids=[torrent.get("id")])
-                            logger.info(f" Auto-deletion of seed tasks  Suspension of seeds：{text_item}")
-                            message_text = f"{message_text}\n{text_item}"
+                        log_text = " Suspension of seeds"
                     elif self._action == "delete":
                         message_text = f"{downloader.title()}  Total deleted{len(torrents)} Seed"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f" Automatic seed censoring service discontinued")
-                                return
-                            text_item = f"{torrent.get('name')} " \
-                                        f" From the site：{torrent.get('site')} " \
-                                        f" Adults and children：{StringUtils.str_filesize(torrent.get('size'))}"
-                            #  Delete seeds
-                            downlader_obj.delete_torrents(delete_file=False,
-                                                          ids=[torrent.get("id")])
-                            logger.info(f" Auto-deletion of seed tasks  Delete seeds：{text_item}")
-                            message_text = f"{message_text}\n{text_item}"
+                        log_text = " Delete seeds"
                     elif self._action == "deletefile":
                         message_text = f"{downloader.title()}  Total deleted{len(torrents)} Seeds and documents"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f" Automatic seed censoring service discontinued")
-                                return
-                            text_item = f"{torrent.get('name')} " \
-                                        f" From the site：{torrent.get('site')} " \
-                                        f" Adults and children：{StringUtils.str_filesize(torrent.get('size'))}"
-                            #  Delete seeds
-                            downlader_obj.delete_torrents(delete_file=True,
-                                                          ids=[torrent.get("id")])
-                            logger.info(f" Auto-deletion of seed tasks  Deleting seeds and files：{text_item}")
-                            message_text = f"{message_text}\n{text_item}"
+                        log_text = " Deleting seeds and files"
                     else:
                         continue
+                    if self._event.is_set():
+                        logger.info(f" Automatic seed censoring service discontinued")
+                        return
+                    if torrents:
+                        #  Batch processing， One request per downloader
+                        ids = [torrent.get("id") for torrent in torrents]
+                        if self._action == "pause":
+                            downlader_obj.stop_torrents(ids=ids)
+                        else:
+                            downlader_obj.delete_torrents(delete_file=self._action == "deletefile",
+                                                          ids=ids)
+                    for torrent in torrents:
+                        text_item = f"{torrent.get('name')} " \
+                                    f" From the site：{torrent.get('site')} " \
+                                    f" Adults and children：{StringUtils.str_filesize(torrent.get('size'))}"
+                        logger.info(f" Auto-deletion of seed tasks {log_text}：{text_item}")
+                        message_text = f"{message_text}\n{text_item}"
                     if torrents and message_text and self._notify:
                         self.post_message(
                             mtype=NotificationType.SiteMessage,
@@ -717,7 +702,7 @@ class TorrentRemover(_PluginBase):
         if self._mponly:
             tags.extend(settings.TORRENT_TAG)
         #  Inquiry seeds
-        torrents, error_flag = downloader_obj.get_torrents(tags=tags or None)
+        torrents, error_flag = downloader_obj.get_torrents(tags=tags or None, max_age=60)
         if error_flag:
             return []
         #  Seed treatment
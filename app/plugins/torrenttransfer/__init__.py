@@ -492,7 +492,7 @@ class TorrentTransfer(_PluginBase):
 
         #  Getting completed seeds in the downloader
         downloader_obj = self.__get_downloader(downloader)
-        torrents = downloader_obj.get_completed_torrents()
+        torrents = downloader_obj.get_completed_torrents(max_age=60)
         if torrents:
             logger.info(f" Downloader {downloader}  Number of seeds completed：{len(torrents)}")
         else:
@@ -708,7 +708,7 @@ class TorrentTransfer(_PluginBase):
 
         #  Obtaining mandates
         downloader_obj = self.__get_downloader(downloader)
-        torrents, _ = downloader_obj.get_torrents(ids=recheck_torrents)
+        torrents, _ = downloader_obj.get_torrents(ids=recheck_torrents, max_age=60)
         if torrents:
             #  Seed that can be used for planting
             can_seeding_torrents = []
@@ -15,6 +15,7 @@ from app.chain.tmdb import TmdbChain
 from app.chain.transfer import TransferChain
 from app.core.config import settings
 from app.db import SessionFactory
+from app.helper.sharedstate import SharedState
 from app.log import logger
 from app.utils.singleton import Singleton
 from app.utils.timer import TimerUtils
@@ -34,6 +35,8 @@ class Scheduler(metaclass=Singleton):
     """
     Scheduled task management
     """
+    #  Role of the process running scheduled tasks
+    role = "scheduler"
     #  Time service
     _scheduler = BackgroundScheduler(timezone=settings.TZ,
                                      executors={
@@ -75,6 +78,13 @@ class Scheduler(metaclass=Singleton):
         if settings.DEV:
             return
 
+        #  Only the elected process runs scheduled tasks
+        SharedState().elect(self.role, self.__start_service, self.__stop_service)
+
+    def __start_service(self):
+        """
+        Add scheduled tasks and start the timing service
+        """
         # CookieCloud Timing synchronization
         if settings.COOKIECLOUD_INTERVAL:
             self._scheduler.add_job(
@@ -203,7 +213,14 @@ class Scheduler(metaclass=Singleton):
         logger.debug(self._scheduler.print_jobs())
 
         #  Start timing service
-        self._scheduler.start()
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    def __stop_service(self):
+        """
+        Remove scheduled tasks after another process is elected
+        """
+        self._scheduler.remove_all_jobs()
 
     def start(self, job_id: str, *args, **kwargs):
         """
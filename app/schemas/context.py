@@ -220,3 +220,29 @@ class Context(BaseModel):
     media_info: Optional[MediaInfo] = None
     #  Seed information
     torrent_info: Optional[TorrentInfo] = None
+
+
+class RecognizeItem(BaseModel):
+    """
+    Item of batch recognition， Title or file path
+    """
+    #  Caption
+    title: Optional[str] = None
+    #  Subheading
+    subtitle: Optional[str] = None
+    #  File path
+    path: Optional[str] = None
+
+
+class RecognizeResult(BaseModel):
+    """
+    Result of batch recognition
+    """
+    #  (textual) context
+    context: Optional[Context] = None
+    #  From the recognition cache
+    cached: Optional[bool] = False
+    #  Shares the recognition of an earlier item of the batch， Its time does not include the recognition
+    deduplicated: Optional[bool] = False
+    #  Time spent， Unit milliseconds
+    time: Optional[float] = 0
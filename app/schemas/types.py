@@ -46,8 +46,6 @@ class EventType(Enum):
 class SystemConfigKey(Enum):
     #  User-installed plug-ins
     UserInstalledPlugins = "UserInstalledPlugins"
-    #  Search results
-    SearchResults = "SearchResults"
     #  Search site scope
     IndexerSites = "IndexerSites"
     #  Subscription site coverage
@@ -3,6 +3,7 @@ import datetime
 import hashlib
 import random
 import re
+from functools import lru_cache
 from typing import Union, Tuple, Optional, Any, List, Generator
 from urllib import parse
 
@@ -13,6 +14,15 @@ import dateutil.parser
 from app.schemas.types import MediaType
 
 
+#  Special characters to be ignored
+_convert_empty_pattern = re.compile(r"[、.。,，·:：;；!！'’\"“”()（）\[\]【】「」\-——\+\|\\_/&#～~]", flags=re.IGNORECASE)
+_zero_width_pattern = re.compile(r"[\u200B-\u200D\uFEFF]")
+_space_pattern = re.compile(r"\s+")
+_chinese_pattern = re.compile(r'[\u4e00-\u9fff]')
+_japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF]')
+_korean_pattern = re.compile(r'[\uAC00-\uD7FF]')
+
+
 class StringUtils:
 
     @staticmethod
@@ -72,19 +82,19 @@ class StringUtils:
             return False
         if isinstance(word, list):
             word = " ".join(word)
-        chn = re.compile(r'[\u4e00-\u9fff]')
-        if chn.search(word):
-            return True
-        else:
-            return False
+        return StringUtils.__is_chinese(word)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def __is_chinese(word: str) -> bool:
+        return True if _chinese_pattern.search(word) else False
 
     @staticmethod
     def is_japanese(word: str) -> bool:
         """
         Determine whether it contains japanese
         """
-        jap = re.compile(r'[\u3040-\u309F\u30A0-\u30FF]')
-        if jap.search(word):
+        if _japanese_pattern.search(word):
             return True
         else:
             return False
@@ -94,8 +104,7 @@ class StringUtils:
         """
         Determine if korean is included
         """
-        kor = re.compile(r'[\uAC00-\uD7FF]')
-        if kor.search(word):
+        if _korean_pattern.search(word):
             return True
         else:
             return False
@@ -155,26 +164,27 @@ class StringUtils:
         """
         Ignore special characters
         """
-        #  Special characters to be ignored
-        CONVERT_EMPTY_CHARS = r"[、.。,，·:：;；!！'’\"“”()（）\[\]【】「」\-——\+\|\\_/&#～~]"
         if not text:
             return text
         if not isinstance(text, list):
-            text = re.sub(r"[\u200B-\u200D\uFEFF]",
-                          "",
-                          re.sub(r"%s" % CONVERT_EMPTY_CHARS, replace_word, text),
-                          flags=re.IGNORECASE)
-            if not allow_space:
-                return re.sub(r"\s+", "", text)
-            else:
-                return re.sub(r"\s+", " ", text).strip()
+            return StringUtils.__clear(text, replace_word, allow_space)
         else:
             return [StringUtils.clear(x) for x in text]
 
     @staticmethod
+    @lru_cache(maxsize=4096)
+    def __clear(text: str, replace_word: str, allow_space: bool) -> str:
+        text = _zero_width_pattern.sub("", _convert_empty_pattern.sub(replace_word, text))
+        if not allow_space:
+            return _space_pattern.sub("", text)
+        else:
+            return _space_pattern.sub(" ", text).strip()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
     def clear_upper(text: str) -> str:
         """
-        Remove special characters， Capitalize
+        Remove special characters， Capitalize， Results are cached
         """
         if not text:
             return ""
@@ -234,9 +244,10 @@ class StringUtils:
         return addr.scheme, addr.netloc
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def get_url_domain(url: str) -> str:
         """
-        GainURL Domain name section， Retain only the last two levels
+        GainURL Domain name section， Retain only the last two levels， Results are cached
         """
         if not url:
             return ""
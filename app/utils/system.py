@@ -6,7 +6,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Union, Tuple
+from typing import List, Union, Tuple, Callable, Optional
 
 import docker
 import psutil
@@ -65,32 +65,110 @@ class SystemUtils:
         return True if platform.system() == 'Darwin' else False
 
     @staticmethod
-    def copy(src: Path, dest: Path) -> Tuple[int, str]:
+    def copy(src: Path, dest: Path,
+             callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, str]:
         """
         Make a copy of
+        :param callback:  Progress callback( Bytes copied,  Total bytes)
         """
         try:
-            shutil.copy2(src, dest)
+            SystemUtils.copy_file(src, dest, callback=callback)
             return 0, ""
         except Exception as err:
             print(str(err))
             return -1, str(err)
 
     @staticmethod
-    def move(src: Path, dest: Path) -> Tuple[int, str]:
+    def move(src: Path, dest: Path,
+             callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, str]:
         """
         Mobility
+        :param callback:  Progress callback when moving across devices( Bytes copied,  Total bytes)
         """
         try:
             #  Rename the current directory
             temp = src.replace(src.parent / dest.name)
-            # Mobility到目标目录
-            shutil.move(temp, dest)
+            # Mobility到目标目录， Copy when across devices
+            shutil.move(temp, dest,
+                        copy_function=lambda s, d: SystemUtils.copy_file(Path(s), Path(d), callback=callback))
             return 0, ""
         except Exception as err:
             print(str(err))
             return -1, str(err)
 
+    @staticmethod
+    def copy_file(src: Path, dest: Path,
+                  callback: Optional[Callable[[int, int], None]] = None,
+                  chunk_size: int = 64 * 1024 * 1024):
+        """
+        Copy a file， Prefer reflink、copy_file_range、sendfile Zero-copy， Otherwise read and write in blocks，
+        Write to a .part File first， After interruption the next copy continues from the copied size
+        :param callback:  Progress callback( Bytes copied,  Total bytes)
+        :param chunk_size:  Block size
+        """
+        src_stat = src.stat()
+        total = src_stat.st_size
+        part = dest.with_name(dest.name + ".part")
+        offset = 0
+        if part.exists():
+            part_stat = part.stat()
+            #  Source file has not changed since the partial copy
+            if part_stat.st_size <= total and part_stat.st_mtime >= src_stat.st_mtime:
+                offset = part_stat.st_size
+            else:
+                part.unlink()
+        with open(src, "rb", buffering=0) as fsrc, open(part, "r+b" if offset else "wb", buffering=0) as fdst:
+            if not offset and total and SystemUtils.__reflink(fsrc.fileno(), fdst.fileno()):
+                offset = total
+            #  Available copy methods， Fall back to the next when not supported
+            methods = ["copy_file_range", "sendfile", "readwrite"]
+            if not hasattr(os, "copy_file_range"):
+                methods.remove("copy_file_range")
+            if not hasattr(os, "sendfile") or SystemUtils.is_windows():
+                methods.remove("sendfile")
+            while offset < total:
+                count = min(chunk_size, total - offset)
+                try:
+                    if methods[0] == "copy_file_range":
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), count, offset, offset)
+                    elif methods[0] == "sendfile":
+                        os.lseek(fdst.fileno(), offset, os.SEEK_SET)
+                        copied = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, count)
+                    else:
+                        fsrc.seek(offset)
+                        fdst.seek(offset)
+                        copied = fdst.write(fsrc.read(min(count, 8 * 1024 * 1024)))
+                except OSError:
+                    if len(methods) == 1:
+                        raise
+                    methods.pop(0)
+                    continue
+                if not copied:
+                    if len(methods) == 1:
+                        raise IOError(f"{src}  Unexpected end of file")
+                    methods.pop(0)
+                    continue
+                offset += copied
+                if callback:
+                    callback(offset, total)
+        shutil.copystat(src, part)
+        part.replace(dest)
+
+    @staticmethod
+    def __reflink(src_fd: int, dest_fd: int) -> bool:
+        """
+        Clone file blocks on file systems that support it（Btrfs、XFS etc）
+        """
+        if SystemUtils.is_windows() or SystemUtils.is_macos():
+            return False
+        try:
+            import fcntl
+            # FICLONE
+            fcntl.ioctl(dest_fd, 0x40049409, src_fd)
+            return True
+        except (ImportError, OSError):
+            return False
+
     @staticmethod
     def link(src: Path, dest: Path) -> Tuple[int, str]:
         """
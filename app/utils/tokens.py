@@ -1,6 +1,10 @@
 import re
 
 
+#  Separators of tokens
+_token_separators = re.compile(r"\.|\s+|\(|\)|\[|]|-|\+|【|】|/|～|;|&|\||#|_|「|」|~")
+
+
 class Tokens:
     _text: str = ""
     _index: int = 0
@@ -12,10 +16,7 @@ class Tokens:
         self.load_text(text)
 
     def load_text(self, text):
-        splitted_text = re.split(r"\.|\s+|\(|\)|\[|]|-|\+|【|】|/|～|;|&|\||#|_|「|」|~", text)
-        for sub_text in splitted_text:
-            if sub_text:
-                self._tokens.append(sub_text)
+        self._tokens.extend(sub_text for sub_text in _token_separators.split(text) if sub_text)
 
     def cur(self):
         if self._index >= len(self._tokens):
@@ -0,0 +1,27 @@
+"""1_0_10
+
+Revision ID: 6f3c2b8d41a7
+Revises: a521fbc28b18
+Create Date: 2023-10-08 10:12:40.118203
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3c2b8d41a7'
+down_revision = 'a521fbc28b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    #  Search results are no longer kept in the configuration table
+    try:
+        op.execute("DELETE FROM systemconfig WHERE key = 'SearchResults'")
+    except Exception as e:
+        pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import copy
+import gc
+import pickle
+import time
+import tracemalloc
+from dataclasses import make_dataclass, field, fields
+
+from app.core.context import Context, MediaInfo, TorrentInfo
+from app.core.metainfo import MetaInfo
+from app.helper.torrent import TorrentHelper
+from app.schemas.types import MediaType
+from tests.cases.meta import meta_cases
+
+#  Seed and context records without slots， As they were before
+LegacyTorrentInfo = make_dataclass("LegacyTorrentInfo",
+                                   [(f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+                                    for f in fields(TorrentInfo)])
+LegacyContext = make_dataclass("LegacyContext", [("meta_info", object, None),
+                                                 ("media_info", object, None),
+                                                 ("torrent_info", object, None)])
+LegacyTorrentInfo.__module__ = LegacyContext.__module__ = __name__
+
+
+def build_cache(total: int = 10000, sites: int = 20, medias: int = 500) -> dict:
+    """
+    Seed cache of a given size， Seeds spread evenly over sites， Media shared by several seeds
+    """
+    metas = []
+    for info in meta_cases:
+        if not info.get("title"):
+            continue
+        #  Titles the parser fails on are left out
+        try:
+            metas.append((info.get("title"), MetaInfo(title=info.get("title"))))
+        except Exception as err:
+            print(f" Skipped {info.get('title')}：{err}")
+    cache = {}
+    for i in range(total):
+        title, meta = metas[i % len(metas)]
+        mediainfo = MediaInfo(type=MediaType.TV if i % 2 else MediaType.MOVIE,
+                              title=f"Media {i % medias}", year="2023", tmdb_id=i % medias,
+                              vote_average=7, poster_path=f"https://image.tmdb.org/t/p/original/{i % medias}.jpg")
+        mediainfo.clear()
+        torrent = TorrentInfo(site=i % sites, site_name=f"Site {i % sites}", title=f"{title}.{i}",
+                              description=f"Description {i}", enclosure=f"https://site{i % sites}.org/download/{i}",
+                              page_url=f"https://site{i % sites}.org/details/{i}", size=1024 ** 3 + i,
+                              seeders=i % 100, peers=i % 10, pubdate="2023-10-01 12:00:00",
+                              uploadvolumefactor=1.0, downloadvolumefactor=0.0)
+        cache.setdefault(f"site{i % sites}.org", []).append(
+            Context(meta_info=copy.deepcopy(meta), media_info=mediainfo, torrent_info=torrent))
+    return cache
+
+
+def legacy_cache(cache: dict) -> dict:
+    """
+    The same cache with seeds and contexts without slots
+    """
+    return {domain: [LegacyContext(meta_info=context.meta_info, media_info=context.media_info,
+                                   torrent_info=LegacyTorrentInfo(**{f.name: getattr(context.torrent_info, f.name)
+                                                                     for f in fields(TorrentInfo)}))
+                     for context in contexts]
+            for domain, contexts in cache.items()}
+
+
+def measure_memory(build) -> int:
+    """
+    Memory allocated by a build function and kept by its result
+    """
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def measure_pickle(data, load=None) -> tuple:
+    """
+    Pickle size and load time
+    """
+    content = pickle.dumps(data)
+    gc.collect()
+    gc.disable()
+    start_time = time.perf_counter()
+    data = pickle.loads(content)
+    if load:
+        load(data)
+    cost = time.perf_counter() - start_time
+    gc.enable()
+    return len(content), cost
+
+
+if __name__ == '__main__':
+    cache = build_cache()
+    torrents = [context.torrent_info for contexts in cache.values() for context in contexts]
+    legacy_memory = measure_memory(lambda: [LegacyTorrentInfo(**{f.name: getattr(torrent, f.name)
+                                                                 for f in fields(TorrentInfo)})
+                                            for torrent in torrents])
+    slots_memory = measure_memory(lambda: [TorrentInfo(**{f.name: getattr(torrent, f.name)
+                                                          for f in fields(TorrentInfo)})
+                                           for torrent in torrents])
+    print(f" Seed records：{len(torrents)}")
+    print(f" Memory without slots：{legacy_memory / 1024:.0f} KB， With slots：{slots_memory / 1024:.0f} KB")
+    legacy_size, legacy_time = measure_pickle(legacy_cache(cache))
+    packed_size, packed_time = measure_pickle(TorrentHelper.pack_cache(cache), TorrentHelper.unpack_cache)
+    print(f" Cache file before：{legacy_size / 1024:.0f} KB， Load {legacy_time * 1000:.0f} ms")
+    print(f" Cache file compact：{packed_size / 1024:.0f} KB， Load {packed_time * 1000:.0f} ms")
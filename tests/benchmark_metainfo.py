@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import time
+
+from app.core.metainfo import MetaInfo, _parse_meta
+from tests.cases.meta import meta_cases
+
+
+def benchmark(rounds: int = 50, cached: bool = False) -> float:
+    """
+    Title recognition throughput
+    :param rounds:  Number of passes over the test cases
+    :param cached:  Whether to keep the parse cache between passes
+    :return:  Titles per second
+    """
+    titles = []
+    for info in meta_cases:
+        if not info.get("title"):
+            continue
+        #  Titles the parser fails on are left out
+        try:
+            MetaInfo(title=info.get("title"), subtitle=info.get("subtitle"))
+        except Exception as err:
+            print(f" Skipped {info.get('title')}：{err}")
+            continue
+        titles.append((info.get("title"), info.get("subtitle")))
+    _parse_meta.cache_clear()
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        if not cached:
+            _parse_meta.cache_clear()
+        for title, subtitle in titles:
+            MetaInfo(title=title, subtitle=subtitle)
+    return len(titles) * rounds / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    print(f" Uncached：{benchmark(cached=False):.0f}  Titles per second")
+    print(f" Cached：{benchmark(cached=True):.0f}  Titles per second")
@@ -3,7 +3,9 @@ import unittest
 from tests.test_cookiecloud import CookieCloudTest
 from tests.test_filter import FilterTest
 from tests.test_metainfo import MetaInfoTest
+from tests.test_module import ModuleTest
 from tests.test_recognize import RecognizeTest
+from tests.test_sharedstate import SharedStateTest
 from tests.test_transfer import TransferTest
 
 if __name__ == '__main__':
@@ -19,6 +21,11 @@ if __name__ == '__main__':
     suite.addTest(CookieCloudTest('test_cookiecloud'))
     #  Test file transfer
     suite.addTest(TransferTest('test_transfer'))
+    #  Test module method dispatch
+    suite.addTest(ModuleTest('test_dispatch_staticmethod'))
+    #  Test leader election of worker processes
+    suite.addTest(SharedStateTest('test_lease_takeover'))
+    suite.addTest(SharedStateTest('test_leader_failover'))
 
     #  Operational test
     runner = unittest.TextTestRunner()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import threading
+from unittest import TestCase
+
+from app.core.module import ModuleManager
+
+
+class _StaticModule:
+    @staticmethod
+    def message_parser(body: str) -> str:
+        return f"static:{body}"
+
+    def stop(self):
+        pass
+
+
+class ModuleTest(TestCase):
+    def test_dispatch_staticmethod(self):
+        #  Not the singleton， No modules are loaded
+        manager = ModuleManager.__new__(ModuleManager)
+        manager._dispatch_lock = threading.Lock()
+        manager._running_modules = {"StaticModule": _StaticModule()}
+        manager.build_dispatch()
+        handlers = manager.get_handlers("message_parser")
+        self.assertEqual(len(handlers), 1)
+        self.assertEqual(handlers[0][1]("body"), "static:body")
+        #  Unimplemented methods are left out
+        self.assertEqual(manager.get_handlers("stop"), [])
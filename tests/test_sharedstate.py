@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from app.helper.sharedstate import SharedState, SqliteStateBackend
+
+
+class SharedStateTest(TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self._path = Path(self._tempdir.name) / "state.db"
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def __worker(self, owner: str) -> SharedState:
+        """
+        Shared state of a worker process， Not the singleton of this process
+        """
+        state = type.__call__(SharedState)
+        state.backend = SqliteStateBackend(self._path)
+        state.owner = owner
+        state._lease_ttl = 0.6
+        state._poll_interval = 0.05
+        return state
+
+    def test_lease_takeover(self):
+        first = SqliteStateBackend(self._path)
+        second = SqliteStateBackend(self._path)
+        self.assertTrue(first.acquire("role.scheduler", "first", 0.5))
+        #  Renewed by its owner， Refused to others while valid
+        self.assertTrue(first.acquire("role.scheduler", "first", 0.5))
+        self.assertFalse(second.acquire("role.scheduler", "second", 0.5))
+        #  Taken over after expiry
+        time.sleep(0.6)
+        self.assertTrue(second.acquire("role.scheduler", "second", 0.5))
+        self.assertFalse(first.acquire("role.scheduler", "first", 0.5))
+        #  Available at once after release
+        second.release("role.scheduler", "second")
+        self.assertTrue(first.acquire("role.scheduler", "first", 0.5))
+        first.close()
+        second.close()
+
+    @staticmethod
+    def __wait(condition, timeout: float = 5) -> bool:
+        """
+        Wait for role callbacks and polling， Both run in other threads
+        """
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.05)
+        return condition()
+
+    def test_leader_failover(self):
+        events = []
+        first = self.__worker("first")
+        second = self.__worker("second")
+        try:
+            for state in (first, second):
+                #  Several components follow one role
+                for component in ("scheduler", "plugin"):
+                    state.elect("scheduler",
+                                lambda s=state, c=component: events.append((s.owner, c, "elected")),
+                                lambda s=state, c=component: events.append((s.owner, c, "lost")))
+            self.assertTrue(first.is_leader("scheduler"))
+            self.assertFalse(second.is_leader("scheduler"))
+            self.assertTrue(self.__wait(lambda: len(events) == 2))
+            self.assertEqual(events, [("first", "scheduler", "elected"), ("first", "plugin", "elected")])
+            #  The leader stops renewing without releasing， As if the process died
+            first._event.set()
+            first._thread.join()
+            first._lease_thread.join()
+            self.assertTrue(self.__wait(lambda: second.is_leader("scheduler")))
+            self.assertTrue(self.__wait(lambda: ("second", "plugin", "elected") in events))
+            #  The old leader learns it lost the role on its next renewal
+            first._SharedState__campaign()
+            self.assertFalse(first.is_leader("scheduler"))
+            self.assertTrue(self.__wait(lambda: ("first", "plugin", "lost") in events))
+        finally:
+            first.stop()
+            second.stop()
+
+    def test_replay_without_leader(self):
+        received = []
+        first = self.__worker("first")
+        second = self.__worker("second")
+        try:
+            for state in (first, second):
+                state.listen("event", lambda channel, data, s=state: received.append((s.owner, data)),
+                             role="scheduler")
+                state.elect("scheduler", lambda: None)
+            second.publish("event", "before")
+            self.assertTrue(self.__wait(lambda: ("first", "before") in received))
+            #  The leader dies， Messages sent meanwhile wait for the next leader， Also those of the new leader itself
+            first._event.set()
+            first._thread.join()
+            first._lease_thread.join()
+            first.backend.release("role.scheduler", "first")
+            second.publish("event", "meanwhile")
+            self.assertTrue(self.__wait(lambda: ("second", "meanwhile") in received))
+            self.assertNotIn(("second", "before"), received)
+            self.assertEqual(len(received), 2)
+        finally:
+            first.stop()
+            second.stop()